@@ -0,0 +1,176 @@
+"""
+Notion 내보내기 요청 수 / 시간 벤치마크
+
+로컬 HTTP 스텁(Notion API의 pages.create, blocks.children.append만 흉내)에 NotionService를 연결하고
+합성 프로젝트(에픽 N개 × 스토리 M개)를 내보낼 때의 요청 수와 소요 시간을 측정합니다.
+
+- embedded: 현재 방식 - pages.create에 첫 100개 블록 포함, 나머지만 blocks.children.append
+- legacy:   이전 방식 - 빈 페이지 생성 후 모든 블록을 blocks.children.append
+
+사용법:
+    python bench/notion_bench.py                          # 에픽 5개 × 스토리 6개, 요청당 지연 50ms
+    python bench/notion_bench.py --epics 10 --stories 20 --latency-ms 100
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+TEST_DIR = os.path.join(ROOT_DIR, "test")
+RESULTS_DIR = os.path.join(ROOT_DIR, "bench", "results")
+sys.path.insert(0, SRC_DIR)
+sys.path.insert(0, TEST_DIR)  # 합성 결과 팩토리(conftest.build_result)를 테스트와 공유
+
+os.environ.setdefault("NOTION_TOKEN", "bench")
+os.environ.setdefault("NOTION_DATABASE_ID", "bench-database")
+os.environ.setdefault("TRACE_FILE", "")
+os.environ.setdefault("NOTION_SYNC_DB_PATH", "")  # 매번 새 페이지를 만드는 경로를 측정
+
+from conftest import build_result  # noqa: E402
+from notion_service.client import InstrumentedClient, NotionService  # noqa: E402
+from notion_service.ratelimit import TokenBucket  # noqa: E402
+
+
+class NotionStubServer(ThreadingHTTPServer):
+    """요청 수를 세고 요청마다 latency만큼 지연 후 페이지/블록 응답을 돌려주는 스텁"""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.latency = latency
+        self.requests: Counter = Counter()
+        self.blocks = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def reset(self):
+        with self.lock:
+            self.requests.clear()
+            self.blocks = 0
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        endpoint = "pages.create" if self.path.rstrip("/").endswith("/pages") else "blocks.children.append"
+        with self.server.lock:
+            self.server.requests[endpoint] += 1
+            self.server.blocks += len(body.get("children") or [])
+        time.sleep(self.server.latency)
+
+        payload = json.dumps({"object": "page", "id": str(uuid.uuid4()), "results": []}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_POST = _handle
+    do_PATCH = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LegacyNotionService(NotionService):
+    """비교 기준 - 빈 페이지 생성 후 모든 블록을 별도 요청으로 추가하던 이전 방식"""
+
+    def _create_page(self, properties: Dict[str, Any], children: Iterable[Dict[str, Any]]) -> str:
+        page = self.client.pages.create(parent={"database_id": self.database_id}, properties=properties)
+        self._append_blocks(page["id"], list(children))
+        return page["id"]
+
+
+def run_export(service: NotionService, project: Dict[str, Any]) -> None:
+    """프로젝트 페이지 + 단계별(에픽/스토리/포인트) 페이지 생성"""
+    epics = [result["epic"] for result in project["epic_results"]]
+    stories = [story for result in project["epic_results"] for story in result["stories"]]
+    story_points = [point for result in project["epic_results"] for point in result["story_points"]]
+    service.create_project_page(project)
+    service.create_step_by_step_pages({"epics": epics}, "epic")
+    service.create_step_by_step_pages({"stories": stories}, "story")
+    service.create_step_by_step_pages({"stories": stories, "story_points": story_points}, "point")
+
+
+def measure(service_class, server: NotionStubServer, project: Dict[str, Any], args) -> Dict[str, Any]:
+    service = service_class()
+    service.max_concurrency = args.concurrency
+    service.client = InstrumentedClient(
+        auth="bench", base_url=server.base_url,
+        rate_limiter=TokenBucket(rate=args.rate, burst=args.burst) if args.rate > 0 else None
+    )
+    server.reset()
+    start = time.perf_counter()
+    run_export(service, project)
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": sum(server.requests.values()),
+        "by_endpoint": dict(server.requests),
+        "blocks": server.blocks,
+        "seconds": round(elapsed, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Notion 내보내기 요청 수 벤치마크 (로컬 스텁)")
+    parser.add_argument("--epics", type=int, default=5)
+    parser.add_argument("--stories", type=int, default=6, help="에픽당 스토리 수")
+    parser.add_argument("--latency-ms", type=float, default=50, help="스텁의 요청당 지연 (ms)")
+    parser.add_argument("--concurrency", type=int, default=4, help="단계별 페이지 동시 생성 수")
+    parser.add_argument("--rate", type=float, default=0, help="토큰 버킷 초당 요청 수 (0이면 제한 없음)")
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: bench/results/notion-<시간>.json)")
+    args = parser.parse_args()
+    # 페이지 생성 로그가 결과 출력을 가리지 않도록
+    logging.disable(logging.INFO)
+
+    project = build_result(args.epics, args.stories, acceptance_criteria=[f"기준 {i}" for i in range(3)],
+                           domain="backend")
+    server = NotionStubServer(args.latency_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        results = {
+            "legacy": measure(LegacyNotionService, server, project, args),
+            "embedded": measure(NotionService, server, project, args),
+        }
+    finally:
+        server.shutdown()
+
+    print(f"에픽 {args.epics}개 × 스토리 {args.stories}개, 요청당 지연 {args.latency_ms:.0f}ms\n")
+    print(f"{'mode':<10} {'requests':>9} {'create':>8} {'append':>8} {'blocks':>8} {'seconds':>9}")
+    for mode, result in results.items():
+        print(f"{mode:<10} {result['requests']:>9} {result['by_endpoint'].get('pages.create', 0):>8} "
+              f"{result['by_endpoint'].get('blocks.children.append', 0):>8} {result['blocks']:>8} "
+              f"{result['seconds']:>9.2f}")
+    reduction = 1 - results["embedded"]["requests"] / results["legacy"]["requests"]
+    print(f"\n요청 수 감소: {reduction:.0%}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"notion-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "created_at": datetime.now().isoformat(),
+            "params": vars(args),
+            "results": results,
+            "request_reduction": round(reduction, 3),
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
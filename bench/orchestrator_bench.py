@@ -0,0 +1,334 @@
+"""
+오케스트레이터 파이프라인 End-to-End 벤치마크
+
+오프라인 LLM 백엔드(LLM_BACKEND=fake)로 ProjectManagementOrchestrator.execute 와
+/orchestrator/execute 라우트를 구동하여 파이프라인 자체의 오버헤드와 동시성 특성을 측정합니다.
+
+사용법:
+    python bench/orchestrator_bench.py                       # 기본 스윕 실행
+    python bench/orchestrator_bench.py --quick               # 작은 스윕
+    python bench/orchestrator_bench.py --compare a.json b.json  # 두 결과 비교
+"""
+import argparse
+import itertools
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+RESULTS_DIR = os.path.join(ROOT_DIR, "bench", "results")
+
+DEFAULT_SIZES = ["1x3", "3x3", "5x5"]
+DEFAULT_CONCURRENCY = [1, 4, 16]
+DEFAULT_REFERENCE_SIZES = [0, 200, 2000]
+
+DOMAINS = ["frontend", "backend", "devops", "data"]
+
+# 어드미션 제어가 과부하 시 돌려주는 상태 코드 - 오류가 아니라 거절로 집계
+REJECTION_STATUS_CODES = {429, 503}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """선형 보간 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def peak_rss_mb() -> float:
+    """프로세스 최대 RSS (MB)"""
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return maxrss / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def write_reference_csv(path: str, size: int) -> None:
+    """참고 스토리 저장소(CSV)를 size 개 행으로 생성"""
+    import pandas as pd
+
+    columns = [
+        'story_title', 'description', 'domain', 'story_type', 'tags',
+        'acceptance_criteria', 'estimated_point', 'estimation_method',
+        'reasoning', 'complexity_factors', 'similar_stories',
+        'confidence_level', 'assumptions', 'risks',
+        'epic_title', 'epic_description', 'epic_business_value',
+        'epic_priority', 'created_at'
+    ]
+    rows = [
+        {
+            'story_title': f"참고 스토리 {i}",
+            'description': f"참고 스토리 {i} 설명",
+            'domain': DOMAINS[i % len(DOMAINS)],
+            'story_type': 'feature',
+            'tags': "['bench']",
+            'acceptance_criteria': "['기준']",
+            'estimated_point': [1, 2, 3, 5, 8][i % 5],
+            'estimation_method': 'same_area',
+            'reasoning': '벤치마크용 참고 데이터',
+            'complexity_factors': "['bench']",
+            'similar_stories': "[]",
+            'confidence_level': 'medium',
+            'assumptions': "[]",
+            'risks': "[]",
+            'epic_title': '참고 에픽',
+            'epic_description': '',
+            'epic_business_value': '',
+            'epic_priority': 'Medium',
+            'created_at': datetime.now().isoformat()
+        }
+        for i in range(size)
+    ]
+    pd.DataFrame(rows, columns=columns).to_csv(path, index=False)
+
+
+def _setup_pipeline(scenario: Dict[str, Any], workdir: str):
+    """오프라인 백엔드와 임시 참고 데이터로 오케스트레이터 구성"""
+    os.chdir(workdir)  # logs/, data/ 가 저장소를 오염시키지 않도록
+    sys.path.insert(0, SRC_DIR)
+
+    from llm.factory import configure_llm_backend
+    from llm.fake import FakeLLMConfig
+
+    epics, stories = (int(v) for v in scenario["size"].split("x"))
+    configure_llm_backend("fake", FakeLLMConfig(
+        epics=epics,
+        stories_per_epic=stories,
+        latency=scenario["latency"],
+        latency_ms=scenario["latency_ms"],
+        seed=scenario["seed"],
+    ))
+
+    csv_path = os.path.join(workdir, "reference_stories.csv")
+    write_reference_csv(csv_path, scenario["reference_size"])
+
+    from orchestrator import agent_nodes
+    from orchestrator.orchestrator import ProjectManagementOrchestrator
+    from story_point.services import StoryPointEstimationAgent
+
+    agent_nodes._story_point_agent = StoryPointEstimationAgent(openai_api_key="fake", csv_file_path=csv_path)
+    return ProjectManagementOrchestrator()
+
+
+def _make_runner(scenario: Dict[str, Any], orchestrator):
+    """target(direct|route)에 맞는 단일 요청 실행 함수"""
+    if scenario["target"] == "route":
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from orchestrator.routes import router
+
+        app = FastAPI()
+        app.include_router(router)
+        # 서버 예외도 500 응답으로 받아 오류로 집계
+        client = TestClient(app, raise_server_exceptions=False)
+
+        def run(i: int) -> Dict[str, Any]:
+            response = client.post("/orchestrator/execute", json={
+                "user_input": f"벤치마크 프로젝트 {i}",
+                "project_info": "웹 애플리케이션"
+            })
+            if not response.is_success:
+                # 429/503(어드미션 거절) 등 비-2xx 응답은 시나리오를 중단하지 않고 집계
+                return {"status": "http_error", "http_status": response.status_code}
+            return response.json()
+        return run
+
+    def run(i: int) -> Dict[str, Any]:
+        return orchestrator.execute(user_input=f"벤치마크 프로젝트 {i}", project_info="웹 애플리케이션")
+    return run
+
+
+def run_scenario(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """단일 시나리오 실행 (격리된 프로세스 안에서 호출)"""
+    with tempfile.TemporaryDirectory() as workdir:
+        orchestrator = _setup_pipeline(scenario, workdir)
+        run = _make_runner(scenario, orchestrator)
+
+        # 워밍업 (임포트/그래프 컴파일 비용 제외)
+        run(-1)
+
+        concurrency = scenario["concurrency"]
+        total_requests = max(scenario["requests"], concurrency)
+        latencies: List[float] = []
+        node_times: Dict[str, List[float]] = {}
+        errors = 0
+        rejected = 0
+
+        def timed(i: int):
+            start = time.perf_counter()
+            result = run(i)
+            return time.perf_counter() - start, result
+
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for latency, result in executor.map(timed, range(total_requests)):
+                if result.get("http_status") in REJECTION_STATUS_CODES:
+                    # 거절 응답은 즉시 반환되므로 지연 분포에서 제외하고 거절률로 따로 보고
+                    rejected += 1
+                    continue
+                latencies.append(latency)
+                if result.get("status") not in ("completed", "completed_with_errors"):
+                    errors += 1
+                for node, seconds in result.get("step_times", {}).items():
+                    node_times.setdefault(node, []).append(seconds)
+        wall_time = time.perf_counter() - wall_start
+
+        # 할당량은 별도 1회 실행에서 측정 (tracemalloc이 지연 측정을 왜곡하지 않도록)
+        tracemalloc.start()
+        run(total_requests)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "scenario": scenario,
+        "requests": total_requests,
+        "errors": errors,
+        "rejected": rejected,
+        "rejection_rate": round(rejected / total_requests, 4),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "mean": round(statistics.mean(latencies) * 1000, 3) if latencies else 0.0,
+        },
+        "throughput_rps": round(total_requests / wall_time, 3) if wall_time else 0.0,
+        "node_time_ms": {
+            node: round(statistics.mean(values) * 1000, 3) for node, values in sorted(node_times.items())
+        },
+        "peak_rss_mb": round(peak_rss_mb(), 2),
+        "alloc_peak_mb": round(peak / 1024 / 1024, 3),
+        "alloc_retained_mb": round(current / 1024 / 1024, 3),
+    }
+
+
+def _scenario_id(scenario: Dict[str, Any]) -> str:
+    return (f"{scenario['target']}-{scenario['size']}-c{scenario['concurrency']}"
+            f"-ref{scenario['reference_size']}")
+
+
+def run_isolated(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """시나리오를 별도 프로세스로 실행 - RSS/할당 측정을 시나리오별로 분리"""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--single", json.dumps(scenario)],
+        capture_output=True, text=True, env={**os.environ, "LLM_BACKEND": "fake"}
+    )
+    if completed.returncode != 0:
+        return {"scenario": scenario, "failed": True, "stderr": completed.stderr[-2000:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True
+        ).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def compare(base_path: str, head_path: str) -> None:
+    """두 벤치마크 결과의 p50/p95/처리량 비교 출력"""
+    with open(base_path, encoding="utf-8") as f:
+        base = {r["id"]: r for r in json.load(f)["results"]}
+    with open(head_path, encoding="utf-8") as f:
+        head = {r["id"]: r for r in json.load(f)["results"]}
+
+    print(f"{'scenario':<36} {'p50 ms':>18} {'p95 ms':>18} {'rps':>16} {'rejected':>18}")
+    for scenario_id in sorted(set(base) & set(head)):
+        b, h = base[scenario_id], head[scenario_id]
+        if b.get("failed") or h.get("failed"):
+            continue
+
+        def fmt(old, new):
+            delta = ((new - old) / old * 100) if old else 0.0
+            return f"{new:>8.1f} ({delta:+5.1f}%)"
+
+        print(f"{scenario_id:<36} {fmt(b['latency_ms']['p50'], h['latency_ms']['p50']):>18} "
+              f"{fmt(b['latency_ms']['p95'], h['latency_ms']['p95']):>18} "
+              f"{fmt(b['throughput_rps'], h['throughput_rps']):>16} "
+              f"{b.get('rejection_rate', 0.0):>7.1%} -> {h.get('rejection_rate', 0.0):>7.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오케스트레이터 E2E 벤치마크")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="에픽x에픽당스토리 (예: 3x5)")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--reference-sizes", nargs="+", type=int, default=DEFAULT_REFERENCE_SIZES)
+    parser.add_argument("--targets", nargs="+", default=["direct", "route"], choices=["direct", "route"])
+    parser.add_argument("--requests", type=int, default=16, help="시나리오당 요청 수")
+    parser.add_argument("--latency", default="none", choices=["none", "fixed", "lognormal", "replay"])
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fake LLM 지연 (ms)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--quick", action="store_true", help="작은 스윕 (1x3, c1/c4, ref0)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: bench/results/<시간>-<커밋>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="두 결과 파일 비교")
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_scenario(json.loads(args.single)), ensure_ascii=False))
+        return
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if args.quick:
+        args.sizes, args.concurrency, args.reference_sizes = ["1x3"], [1, 4], [0]
+
+    results = []
+    for target, size, concurrency, reference_size in itertools.product(
+        args.targets, args.sizes, args.concurrency, args.reference_sizes
+    ):
+        scenario = {
+            "target": target,
+            "size": size,
+            "concurrency": concurrency,
+            "reference_size": reference_size,
+            "requests": args.requests,
+            "latency": args.latency,
+            "latency_ms": args.latency_ms,
+            "seed": args.seed,
+        }
+        result = {"id": _scenario_id(scenario), **run_isolated(scenario)}
+        results.append(result)
+
+        if result.get("failed"):
+            print(f"{result['id']:<36} FAILED\n{result['stderr']}", file=sys.stderr)
+        else:
+            latency = result["latency_ms"]
+            print(f"{result['id']:<36} p50={latency['p50']:>9.1f}ms p95={latency['p95']:>9.1f}ms "
+                  f"p99={latency['p99']:>9.1f}ms rejected={result['rejection_rate']:>6.1%} "
+                  f"errors={result['errors']:>3} rps={result['throughput_rps']:>8.2f} "
+                  f"rss={result['peak_rss_mb']:>7.1f}MB alloc={result['alloc_peak_mb']:>7.2f}MB")
+
+    revision = _git_revision()
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{revision}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "revision": revision,
+            "created_at": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "results": results,
+        }, f, ensure_ascii=False, indent=2, sort_keys=True)
+    print(f"결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
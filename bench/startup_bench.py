@@ -0,0 +1,165 @@
+"""
+서버 기동(import) 시간 벤치마크
+
+새 프로세스에서 `import main`을 `python -X importtime`으로 실행하여 모듈별 import 시간을 집계하고,
+선택적으로 lifespan warm-up(에이전트/그래프/참고 데이터/Slack 초기화) 단계별 시간을 측정합니다.
+
+사용법:
+    python bench/startup_bench.py                  # import 시간 (상위 20개 모듈)
+    python bench/startup_bench.py --top 40 --warmup
+    python bench/startup_bench.py --runs 5         # 여러 번 실행 후 중앙값
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+RESULTS_DIR = os.path.join(ROOT_DIR, "bench", "results")
+
+# 프로젝트 패키지 (src/ 하위) - 리포트에서 구분 표시
+PROJECT_PACKAGES = {
+    name for name in os.listdir(SRC_DIR)
+    if os.path.isdir(os.path.join(SRC_DIR, name)) or name.endswith(".py")
+} if os.path.isdir(SRC_DIR) else set()
+
+WARMUP_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import main
+import_seconds = time.perf_counter() - start
+timings = main.warm_up()
+print("WARMUP " + json.dumps({"import": round(import_seconds, 3), **timings}))
+"""
+
+
+def _child_env(workdir: str) -> Dict[str, str]:
+    # 기동 시간만 측정하도록 외부 호출/파일 출력 최소화
+    return {
+        **os.environ,
+        "PYTHONPATH": SRC_DIR,
+        "LLM_BACKEND": "fake",
+        "WARMUP_ON_STARTUP": "false",
+        "PYTHONDONTWRITEBYTECODE": "1",
+        "TRACE_FILE": "",
+    }
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """`-X importtime` 출력 파싱 (self/cumulative 단위: us)"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        raw_name = parts[2]
+        modules.append({
+            "module": raw_name.strip(),
+            "depth": (len(raw_name) - len(raw_name.lstrip(" ")) - 1) // 2,
+            "self_ms": int(parts[0]) / 1000,
+            "cumulative_ms": int(parts[1]) / 1000,
+        })
+    return modules
+
+
+def measure_import(workdir: str) -> Dict[str, Any]:
+    """새 프로세스에서 main import 1회"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=workdir, capture_output=True, text=True, env=_child_env(workdir)
+    )
+    modules = parse_importtime(completed.stderr)
+    if completed.returncode != 0 or not modules:
+        raise RuntimeError(f"main import 실패:\n{completed.stderr[-2000:]}")
+    main_entry = next(m for m in modules if m["module"] == "main")
+    return {"total_ms": main_entry["cumulative_ms"], "modules": modules}
+
+
+def measure_warmup(workdir: str) -> Dict[str, float]:
+    """main import 후 warm_up() 단계별 시간 (초)"""
+    completed = subprocess.run(
+        [sys.executable, "-c", WARMUP_SNIPPET],
+        cwd=workdir, capture_output=True, text=True, env=_child_env(workdir)
+    )
+    for line in completed.stdout.splitlines():
+        if line.startswith("WARMUP "):
+            return json.loads(line[len("WARMUP "):])
+    raise RuntimeError(f"warm-up 측정 실패:\n{completed.stderr[-2000:]}")
+
+
+def summarize(runs: List[Dict[str, Any]], top: int) -> Dict[str, Any]:
+    """여러 실행의 모듈별 중앙값 - 최상위 패키지 단위 cumulative 및 self 상위 모듈"""
+    per_module: Dict[str, List[float]] = {}
+    per_package: Dict[str, List[float]] = {}
+    for run in runs:
+        package_totals: Dict[str, float] = {}
+        for module in run["modules"]:
+            per_module.setdefault(module["module"], []).append(module["self_ms"])
+            package = module["module"].split(".")[0]
+            package_totals[package] = package_totals.get(package, 0.0) + module["self_ms"]
+        for package, total in package_totals.items():
+            per_package.setdefault(package, []).append(total)
+
+    packages = sorted(
+        ({"package": name, "ms": round(statistics.median(values), 2), "project": name in PROJECT_PACKAGES}
+         for name, values in per_package.items()),
+        key=lambda item: item["ms"], reverse=True
+    )
+    modules = sorted(
+        ({"module": name, "self_ms": round(statistics.median(values), 2)} for name, values in per_module.items()),
+        key=lambda item: item["self_ms"], reverse=True
+    )
+    return {
+        "total_ms": round(statistics.median(run["total_ms"] for run in runs), 2),
+        "packages": packages[:top],
+        "modules": modules[:top],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 기동(import) 시간 벤치마크")
+    parser.add_argument("--runs", type=int, default=3, help="반복 횟수 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=20, help="출력할 상위 패키지/모듈 수")
+    parser.add_argument("--warmup", action="store_true", help="lifespan warm-up 단계별 시간도 측정")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: bench/results/startup-<시간>.json)")
+    args = parser.parse_args()
+
+    # src/ 에 로그/데이터 파일이 생기지 않도록 임시 디렉토리에서 실행
+    with tempfile.TemporaryDirectory() as workdir:
+        runs = [measure_import(workdir) for _ in range(args.runs)]
+        summary = summarize(runs, args.top)
+        warmup = measure_warmup(workdir) if args.warmup else None
+
+    print(f"import main: {summary['total_ms']:.1f} ms (median of {args.runs})\n")
+    print(f"{'package':<32} {'ms':>10}")
+    for item in summary["packages"]:
+        marker = " *" if item["project"] else ""
+        print(f"{item['package'] + marker:<32} {item['ms']:>10.1f}")
+    print(f"\n{'module (self)':<48} {'ms':>10}")
+    for item in summary["modules"]:
+        print(f"{item['module']:<48} {item['self_ms']:>10.1f}")
+    if warmup:
+        print("\nwarm-up (s): " + ", ".join(f"{name}={value}" for name, value in warmup.items()))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"startup-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "created_at": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "import": summary,
+            "warmup": warmup,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
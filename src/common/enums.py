@@ -29,4 +29,11 @@ class WorkflowStatus(str, Enum):
     PAUSED = "paused"          # 일시 중지
     COMPLETED = "completed"    # 완료
     FAILED = "failed"          # 실패
-    CANCELLED = "cancelled"    # 취소
\ No newline at end of file
+    CANCELLED = "cancelled"    # 취소
+
+class JobStatus(str, Enum):
+    """비동기 작업 상태"""
+    QUEUED = "queued"          # 대기 중
+    RUNNING = "running"        # 실행 중
+    COMPLETED = "completed"    # 완료
+    FAILED = "failed"          # 실패
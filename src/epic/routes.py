@@ -3,17 +3,22 @@ from datetime import datetime
 import os
 
 from utils.logger import get_logger
-from epic.services import EpicGeneratorAgent
 from epic.models import EpicRequest, EpicResponse
 
 router = APIRouter(prefix="/epic", tags=["Epic"])
 
 logger = get_logger(__name__)
 
-# EpicGeneratorService 인스턴스 생성
-epic_service = EpicGeneratorAgent(
-    openai_api_key=os.getenv("OPENAI_API_KEY")
-)
+# EpicGeneratorAgent 인스턴스 (첫 요청 시 생성 - langchain import 지연)
+_epic_service = None
+
+
+def get_epic_service():
+    global _epic_service
+    if _epic_service is None:
+        from epic.services import EpicGeneratorAgent
+        _epic_service = EpicGeneratorAgent(openai_api_key=os.getenv("OPENAI_API_KEY"))
+    return _epic_service
 
 
 @router.post("/generate-epics", response_model=EpicResponse)
@@ -22,7 +27,7 @@ def generate_epics(request: EpicRequest):
     try:
         start_time = datetime.now()
         
-        epics = epic_service.generate_epics(request)
+        epics = get_epic_service().generate_epics(request)
         
         end_time = datetime.now()
         generation_time = (end_time - start_time).total_seconds()
@@ -44,7 +49,7 @@ def convert_task_to_epics(request: EpicRequest):
     try:
         start_time = datetime.now()
         
-        epics = epic_service.convert_tasks_to_epics(request)
+        epics = get_epic_service().convert_tasks_to_epics(request)
         
         end_time = datetime.now()
         generation_time = (end_time - start_time).total_seconds()
@@ -1,12 +1,16 @@
 import json
 import logging
+import time
 from typing import List
 
-from langchain_community.chat_models import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 
 from epic.prompts import EPIC_GENERATOR_PROMPT, TASK_TO_EPIC_CONVERTER_PROMPT
 from epic.models import Epic, EpicRequest
+from llm.router import RoutedChatModels, select_model
+from llm.usage import record_llm_usage
+from utils.metrics import LLM_FALLBACKS, LLM_PARSE_FAILURES
+from utils.tracing import start_span
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,12 +19,10 @@ logger = logging.getLogger(__name__)
 class EpicGeneratorAgent:
     """에픽 생성 서비스 - LangChain Agent 형태"""
 
-    def __init__(self, openai_api_key: str):
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.3,
-            api_key=openai_api_key
-        )
+    def __init__(self, openai_api_key: str, model_name: str = "gpt-4o-mini"):
+        self.model_name = model_name
+        self.llms = RoutedChatModels("epic", temperature=0.3, api_key=openai_api_key)
+        self.llm = self.llms.get(model_name)
     
     def _generate_epics_with_llm(self, prompt: ChatPromptTemplate, user_input: str, project_info: str, max_epics: int) -> str:
         """LLM을 사용하여 에픽 생성"""
@@ -33,7 +35,13 @@ class EpicGeneratorAgent:
                 max_epics=max_epics
             )
             
-            response = self.llm.invoke(prompt)
+            # 라우팅 정책에 따라 모델 선택 (긴 project_info는 상위 모델)
+            model, route = select_model("epic", default=self.model_name, project_info=project_info)
+
+            call_start = time.perf_counter()
+            with start_span("llm.call", node="epic", model=model, route=route):
+                response = self.llms.get(model).invoke(prompt)
+            record_llm_usage(response, model=model, latency=time.perf_counter() - call_start, route=route)
             logger.info("에픽 생성 완료")
             return response.content
             
@@ -74,6 +82,8 @@ class EpicGeneratorAgent:
             except json.JSONDecodeError as je:
                 logger.error(f"JSON 파싱 오류: {str(je)}")
                 logger.error(f"원본 응답: {raw_response}")
+                LLM_PARSE_FAILURES.inc(node="epic")
+                LLM_FALLBACKS.inc(node="epic")
                 # 파싱 실패시 기본 에픽 반환
                 return [Epic(
                     title="기본 에픽",
@@ -124,6 +134,8 @@ class EpicGeneratorAgent:
             except json.JSONDecodeError as je:
                 logger.error(f"JSON 파싱 오류: {str(je)}")
                 logger.error(f"원본 응답: {raw_response}")
+                LLM_PARSE_FAILURES.inc(node="epic")
+                LLM_FALLBACKS.inc(node="epic")
                 # 파싱 실패시 기본 에픽 반환
                 return [Epic(
                     title="기본 에픽 (Task 변환)",
@@ -0,0 +1,15 @@
+"""
+LLM 공통 모듈
+
+에이전트들의 LLM 생성(백엔드 선택)과 호출 사용량(토큰/비용) 집계를 제공합니다.
+"""
+
+from .factory import configure_llm_backend, create_chat_model, get_llm_backend
+from .fake import FakeChatModel, FakeLLMConfig, FakeLLMError
+from .usage import record_llm_usage, track_node_usage, track_usage, summarize_workflow_usage
+
+__all__ = [
+    'configure_llm_backend', 'create_chat_model', 'get_llm_backend',
+    'FakeChatModel', 'FakeLLMConfig', 'FakeLLMError',
+    'record_llm_usage', 'track_node_usage', 'track_usage', 'summarize_workflow_usage'
+]
@@ -0,0 +1,53 @@
+# llm/factory.py
+import logging
+import os
+from typing import Any, Optional
+
+from .fake import FakeChatModel, FakeLLMConfig, RecordingChatModel
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 런타임 오버라이드 (벤치마크/테스트에서 환경 변수 대신 사용)
+_backend_override: Optional[str] = None
+_fake_config_override: Optional[FakeLLMConfig] = None
+
+
+def configure_llm_backend(backend: Optional[str] = None, fake_config: Optional[FakeLLMConfig] = None) -> None:
+    """LLM 백엔드 설정 (None이면 LLM_BACKEND 환경 변수 사용)
+
+    이미 생성된 에이전트에는 적용되지 않으므로 에이전트 생성 전에 호출해야 한다.
+    """
+    global _backend_override, _fake_config_override
+    _backend_override = backend
+    _fake_config_override = fake_config
+
+
+def get_llm_backend() -> str:
+    """현재 LLM 백엔드 이름 (openai | fake)"""
+    return (_backend_override or os.getenv("LLM_BACKEND") or "openai").lower()
+
+
+def create_chat_model(node: str, model: str = "gpt-4o-mini", temperature: float = 0.2,
+                      api_key: Optional[str] = None) -> Any:
+    """노드용 채팅 모델 생성 - 설정에 따라 OpenAI 또는 오프라인 백엔드 선택"""
+    backend = get_llm_backend()
+
+    if backend == "fake":
+        return FakeChatModel(node=node, model_name=model, config=_fake_config_override or FakeLLMConfig.from_env())
+
+    if backend != "openai":
+        logger.warning(f"알 수 없는 LLM_BACKEND: {backend}, openai를 사용합니다")
+
+    from langchain_community.chat_models import ChatOpenAI
+
+    llm = ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=api_key or os.getenv("OPENAI_API_KEY")
+    )
+
+    record_file = os.getenv("LLM_RECORD_FILE")
+    if record_file:
+        return RecordingChatModel(llm, node=node, record_file=record_file)
+    return llm
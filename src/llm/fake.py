@@ -0,0 +1,271 @@
+# llm/fake.py
+import asyncio
+import glob
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import re
+import time
+from typing import Any, Dict, List, Literal, Optional
+
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel, Field
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FakeLLMError(RuntimeError):
+    """오프라인 LLM 백엔드에서 주입된 오류"""
+
+
+class FakeLLMConfig(BaseModel):
+    """오프라인(Fake) LLM 백엔드 설정"""
+    mode: Literal["synthesize", "replay"] = Field("synthesize", description="응답 생성 방식")
+    replay_file: Optional[str] = Field(None, description="녹화된 응답 JSONL 경로 (replay 모드)")
+    latency: Literal["none", "fixed", "lognormal", "replay"] = Field("none", description="지연 분포")
+    latency_ms: float = Field(0.0, ge=0, description="고정 지연 / lognormal 중앙값 (ms)")
+    latency_sigma: float = Field(0.5, ge=0, description="lognormal 분산 파라미터")
+    latency_log_glob: str = Field("logs/*.txt", description="지연 재생에 사용할 로그 파일 패턴 (llm_usage 라인)")
+    error_rate: float = Field(0.0, ge=0, le=1, description="호출 실패 주입 비율")
+    malformed_rate: float = Field(0.0, ge=0, le=1, description="JSON이 아닌 응답 주입 비율")
+    low_confidence_rate: float = Field(0.0, ge=0, le=1, description="신뢰도 low 추정 비율")
+    epics: int = Field(3, ge=1, description="생성할 에픽 수")
+    stories_per_epic: int = Field(3, ge=1, description="에픽당 생성할 스토리 수")
+    seed: int = Field(42, description="결정적 동작을 위한 시드")
+
+    @classmethod
+    def from_env(cls) -> "FakeLLMConfig":
+        """FAKE_LLM_* 환경 변수에서 설정 로드"""
+        env_map = {
+            "mode": "FAKE_LLM_MODE",
+            "replay_file": "FAKE_LLM_REPLAY_FILE",
+            "latency": "FAKE_LLM_LATENCY",
+            "latency_ms": "FAKE_LLM_LATENCY_MS",
+            "latency_sigma": "FAKE_LLM_LATENCY_SIGMA",
+            "latency_log_glob": "FAKE_LLM_LATENCY_LOG",
+            "error_rate": "FAKE_LLM_ERROR_RATE",
+            "malformed_rate": "FAKE_LLM_MALFORMED_RATE",
+            "low_confidence_rate": "FAKE_LLM_LOW_CONFIDENCE_RATE",
+            "epics": "FAKE_LLM_EPICS",
+            "stories_per_epic": "FAKE_LLM_STORIES_PER_EPIC",
+            "seed": "FAKE_LLM_SEED",
+        }
+        values = {field: os.environ[env] for field, env in env_map.items() if os.environ.get(env)}
+        return cls(**values)
+
+
+def _extract_title(prompt: str, marker: str) -> Optional[str]:
+    """프롬프트에 포함된 pydantic repr에서 title 추출"""
+    match = re.search(marker + r".*?title='((?:[^'\\]|\\.)*)'", prompt, re.DOTALL)
+    return match.group(1) if match else None
+
+
+def _load_replay_records(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """녹화 파일을 노드별로 로드"""
+    records: Dict[str, List[Dict[str, Any]]] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            records.setdefault(record.get("node") or "unknown", []).append(record)
+    return records
+
+
+def _load_logged_latencies(pattern: str) -> Dict[str, List[float]]:
+    """llm_usage 로그 라인에서 노드별 호출 지연 수집"""
+    latencies: Dict[str, List[float]] = {}
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                idx = line.find("llm_usage {")
+                if idx < 0:
+                    continue
+                try:
+                    call = json.loads(line[idx + len("llm_usage "):])
+                except json.JSONDecodeError:
+                    continue
+                if call.get("latency"):
+                    latencies.setdefault(call.get("node") or "unknown", []).append(float(call["latency"]))
+    return latencies
+
+
+class FakeChatModel:
+    """실제 API를 호출하지 않는 결정적 LLM 백엔드 (벤치마크/부하 테스트용)"""
+
+    def __init__(self, node: str, model_name: str = "fake", config: Optional[FakeLLMConfig] = None):
+        self.node = node
+        self.model_name = model_name
+        self.config = config or FakeLLMConfig()
+        self._replay_records = (
+            _load_replay_records(self.config.replay_file)
+            if self.config.mode == "replay" and self.config.replay_file else {}
+        )
+        self._logged_latencies = (
+            _load_logged_latencies(self.config.latency_log_glob) if self.config.latency == "replay" else {}
+        )
+
+    def _rng(self, prompt: str) -> random.Random:
+        # 동시 실행 순서와 무관하게 같은 프롬프트는 같은 결과를 내도록 프롬프트 기반 시드 사용
+        digest = hashlib.sha256(f"{self.config.seed}:{self.node}:{prompt}".encode()).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    def _sample_latency(self, rng: random.Random) -> float:
+        """설정된 분포에서 지연(초) 샘플링"""
+        config = self.config
+        if config.latency == "fixed":
+            return config.latency_ms / 1000
+        if config.latency == "lognormal":
+            median = max(config.latency_ms, 1e-3)
+            return rng.lognormvariate(math.log(median), config.latency_sigma) / 1000
+        if config.latency == "replay":
+            samples = self._logged_latencies.get(self.node) or [
+                latency for values in self._logged_latencies.values() for latency in values
+            ]
+            if samples:
+                return rng.choice(samples)
+            return config.latency_ms / 1000
+        return 0.0
+
+    def _prepare(self, prompt: Any):
+        prompt_text = prompt if isinstance(prompt, str) else str(prompt)
+        rng = self._rng(prompt_text)
+        latency = self._sample_latency(rng)
+        return prompt_text, rng, latency
+
+    def _respond(self, prompt_text: str, rng: random.Random) -> AIMessage:
+        if rng.random() < self.config.error_rate:
+            raise FakeLLMError(f"주입된 LLM 오류 (node={self.node})")
+
+        token_usage = None
+        if rng.random() < self.config.malformed_rate:
+            content = "죄송합니다. 요청을 처리할 수 없습니다."
+        elif self._replay_records:
+            content, token_usage = self._replay(prompt_text, rng)
+        else:
+            content = json.dumps(self._synthesize(prompt_text, rng), ensure_ascii=False)
+
+        if token_usage is None:
+            prompt_tokens = len(prompt_text) // 4
+            completion_tokens = len(content) // 4
+            token_usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            }
+
+        return AIMessage(
+            content=content,
+            response_metadata={"model_name": self.model_name, "token_usage": token_usage},
+        )
+
+    def invoke(self, prompt: Any, *args, **kwargs) -> AIMessage:
+        prompt_text, rng, latency = self._prepare(prompt)
+        if latency:
+            time.sleep(latency)
+        return self._respond(prompt_text, rng)
+
+    async def ainvoke(self, prompt: Any, *args, **kwargs) -> AIMessage:
+        prompt_text, rng, latency = self._prepare(prompt)
+        if latency:
+            await asyncio.sleep(latency)
+        return self._respond(prompt_text, rng)
+
+    def _replay(self, prompt_text: str, rng: random.Random):
+        """녹화된 응답 재생 - 동일 프롬프트가 있으면 우선 사용"""
+        records = self._replay_records.get(self.node) or [
+            record for values in self._replay_records.values() for record in values
+        ]
+        prompt_sha = hashlib.sha256(prompt_text.encode()).hexdigest()
+        record = next((r for r in records if r.get("prompt_sha") == prompt_sha), None) or rng.choice(records)
+        return record["content"], record.get("token_usage")
+
+    def _synthesize(self, prompt_text: str, rng: random.Random) -> Any:
+        """노드별 스키마에 맞는 JSON 응답 생성"""
+        if self.node == "analyze":
+            return {
+                "workflow_type": "full_pipeline",
+                "reasoning": "전체 파이프라인 분석 (fake)",
+                "required_steps": ["epic", "story", "point"],
+            }
+
+        if self.node == "epic":
+            return [
+                {
+                    "title": f"에픽 {i}",
+                    "description": f"가상 에픽 {i} 설명",
+                    "business_value": "가상 비즈니스 가치",
+                    "priority": rng.choice(["High", "Medium", "Low"]),
+                    "acceptance_criteria": [f"에픽 {i} 수용 기준 {j}" for j in range(1, 4)],
+                    "included_tasks": [f"에픽 {i} 작업 {j}" for j in range(1, 3)],
+                }
+                for i in range(1, self.config.epics + 1)
+            ]
+
+        if self.node == "story":
+            epic_title = _extract_title(prompt_text, r"\[Context\]") or "에픽"
+            return [
+                {
+                    "title": f"{epic_title} - 스토리 {i}",
+                    "description": f"{epic_title}의 가상 스토리 {i}",
+                    "acceptance_criteria": [f"수락 기준 {j}" for j in range(1, 4)],
+                    "domain": rng.choice(["frontend", "backend", "devops", "data"]),
+                    "story_type": "feature",
+                    "tags": ["fake", "benchmark"],
+                }
+                for i in range(1, self.config.stories_per_epic + 1)
+            ]
+
+        if self.node == "point":
+            story_title = _extract_title(prompt_text, r"story info :") or "스토리"
+            low_confidence = rng.random() < self.config.low_confidence_rate
+            return [
+                {
+                    "story_title": story_title,
+                    "estimated_point": rng.choice([1, 2, 3, 5, 8]),
+                    "domain": "fullstack",
+                    "estimation_method": "cross_area",
+                    "reasoning": "가상 추정 근거",
+                    "complexity_factors": ["fake"],
+                    "similar_stories": [],
+                    "confidence_level": "low" if low_confidence else rng.choice(["high", "medium"]),
+                    "assumptions": [],
+                    "risks": [],
+                }
+            ]
+
+        return {"content": "fake"}
+
+
+class RecordingChatModel:
+    """실제 LLM 응답을 replay용 JSONL로 녹화하는 래퍼"""
+
+    def __init__(self, llm: Any, node: str, record_file: str):
+        self.llm = llm
+        self.node = node
+        self.record_file = record_file
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def invoke(self, prompt: Any, *args, **kwargs):
+        response = self.llm.invoke(prompt, *args, **kwargs)
+        prompt_text = prompt if isinstance(prompt, str) else str(prompt)
+        record = {
+            "node": self.node,
+            "model": getattr(self.llm, "model_name", ""),
+            "prompt_sha": hashlib.sha256(prompt_text.encode()).hexdigest(),
+            "content": response.content,
+            "token_usage": (getattr(response, "response_metadata", None) or {}).get("token_usage"),
+        }
+        try:
+            with open(self.record_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning(f"LLM 응답 녹화 실패: {str(e)}")
+        return response
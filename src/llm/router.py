@@ -0,0 +1,133 @@
+# llm/router.py
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from .factory import create_chat_model
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ModelRoutingPolicy(BaseModel):
+    """노드별 모델 라우팅 정책"""
+    node_models: Dict[str, str] = Field(
+        default_factory=lambda: {"analyze": "gpt-4.1-nano"},
+        description="노드별 기본 모델 (없으면 에이전트 기본 모델 사용)"
+    )
+    long_context_models: Dict[str, str] = Field(
+        default_factory=lambda: {"epic": "gpt-4o"},
+        description="입력(project_info)이 긴 경우 사용할 노드별 모델"
+    )
+    long_context_threshold: int = Field(4000, ge=0, description="긴 입력 기준 (문자 수)")
+    escalation_models: Dict[str, str] = Field(
+        default_factory=lambda: {"point": "gpt-4o"},
+        description="신뢰도가 낮은 결과를 재시도할 노드별 상위 모델"
+    )
+    escalation_confidence_levels: List[str] = Field(
+        default_factory=lambda: ["low"],
+        description="상위 모델 재시도 대상 신뢰도"
+    )
+
+
+_policy: Optional[ModelRoutingPolicy] = None
+_policy_lock = threading.Lock()
+# 기본값을 공유 dict로 두면 한 곳의 변경이 모든 컨텍스트에 보이므로 None (= 지정 없음) 사용
+_model_overrides: ContextVar[Optional[Dict[str, str]]] = ContextVar("llm_model_overrides", default=None)
+
+
+def _load_policy_from_env() -> ModelRoutingPolicy:
+    """LLM_ROUTING_POLICY (JSON 문자열 또는 JSON 파일 경로)에서 정책 로드"""
+    raw = os.getenv("LLM_ROUTING_POLICY")
+    if not raw:
+        return ModelRoutingPolicy()
+    try:
+        if os.path.exists(raw):
+            with open(raw, encoding="utf-8") as f:
+                return ModelRoutingPolicy(**json.load(f))
+        return ModelRoutingPolicy(**json.loads(raw))
+    except Exception as e:
+        logger.error(f"모델 라우팅 정책 로드 실패, 기본 정책 사용: {str(e)}")
+        return ModelRoutingPolicy()
+
+
+def get_routing_policy() -> ModelRoutingPolicy:
+    """현재 라우팅 정책 반환"""
+    global _policy
+    if _policy is None:
+        with _policy_lock:
+            if _policy is None:
+                _policy = _load_policy_from_env()
+    return _policy
+
+
+def set_routing_policy(policy: ModelRoutingPolicy) -> None:
+    """런타임에 라우팅 정책 교체 (현재 프로세스에만 적용 - 다른 워커 프로세스는 LLM_ROUTING_POLICY 유지)"""
+    global _policy
+    with _policy_lock:
+        _policy = policy
+    logger.info(f"모델 라우팅 정책 변경: {policy.model_dump()}")
+
+
+@contextmanager
+def use_model_overrides(overrides: Optional[Dict[str, str]]):
+    """요청 단위 노드별 모델 강제 지정"""
+    token = _model_overrides.set(dict(overrides) if overrides else None)
+    try:
+        yield
+    finally:
+        _model_overrides.reset(token)
+
+
+def select_model(node: str, default: str, project_info: str = "", escalate: bool = False) -> Tuple[str, str]:
+    """노드와 요청 특성에 맞는 모델 선택 - (모델명, 선택 사유) 반환"""
+    overrides = _model_overrides.get() or {}
+    if node in overrides:
+        return overrides[node], "request_override"
+
+    policy = get_routing_policy()
+    if escalate and node in policy.escalation_models:
+        return policy.escalation_models[node], "low_confidence_escalation"
+
+    if node in policy.long_context_models and len(project_info or "") >= policy.long_context_threshold:
+        return policy.long_context_models[node], "long_context"
+
+    if node in policy.node_models:
+        return policy.node_models[node], "policy"
+
+    return default, "default"
+
+
+def needs_escalation(node: str, confidence_levels: List[str]) -> bool:
+    """결과 신뢰도가 정책의 재시도 대상인지 확인"""
+    policy = get_routing_policy()
+    if node not in policy.escalation_models:
+        return False
+    return any(level in policy.escalation_confidence_levels for level in confidence_levels)
+
+
+class RoutedChatModels:
+    """에이전트가 사용하는 모델별 LLM 인스턴스 캐시"""
+
+    def __init__(self, node: str, temperature: float = 0.2, api_key: Optional[str] = None):
+        self.node = node
+        self.temperature = temperature
+        self.api_key = api_key
+        self._llms: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: str) -> Any:
+        llm = self._llms.get(model)
+        if llm is None:
+            with self._lock:
+                llm = self._llms.get(model)
+                if llm is None:
+                    llm = create_chat_model(self.node, model=model, temperature=self.temperature, api_key=self.api_key)
+                    self._llms[model] = llm
+        return llm
@@ -0,0 +1,176 @@
+# llm/usage.py
+import functools
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from utils.metrics import LLM_CALL_DURATION
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 모델별 단가 (USD / 1M tokens): (input, cached_input, output)
+MODEL_PRICING = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+}
+
+USAGE_FIELDS = ["calls", "prompt_tokens", "completion_tokens", "cached_tokens", "total_tokens"]
+
+_current_recorder: ContextVar[Optional["UsageRecorder"]] = ContextVar("llm_usage_recorder", default=None)
+
+
+def _resolve_pricing(model: str) -> Optional[tuple]:
+    """모델명(버전 suffix 포함)에 맞는 단가 찾기 - 가장 긴 prefix 우선"""
+    if not model:
+        return None
+    for name in sorted(MODEL_PRICING, key=len, reverse=True):
+        if model.startswith(name):
+            return MODEL_PRICING[name]
+    return None
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    """토큰 수로 비용(USD) 추정. 단가를 모르는 모델은 0으로 계산"""
+    pricing = _resolve_pricing(model)
+    if pricing is None:
+        return 0.0
+    input_price, cached_price, output_price = pricing
+    uncached = max(prompt_tokens - cached_tokens, 0)
+    return (uncached * input_price + cached_tokens * cached_price + completion_tokens * output_price) / 1_000_000
+
+
+def extract_token_usage(response: Any) -> Dict[str, int]:
+    """LangChain 응답 메시지에서 토큰 사용량 추출"""
+    metadata = getattr(response, "response_metadata", None) or {}
+    token_usage = metadata.get("token_usage") or {}
+
+    prompt_tokens = token_usage.get("prompt_tokens", 0) or 0
+    completion_tokens = token_usage.get("completion_tokens", 0) or 0
+    details = token_usage.get("prompt_tokens_details") or {}
+    cached_tokens = details.get("cached_tokens", 0) or 0
+
+    # usage_metadata만 있는 응답 (langchain-openai 등)
+    usage_metadata = getattr(response, "usage_metadata", None)
+    if not token_usage and usage_metadata:
+        prompt_tokens = usage_metadata.get("input_tokens", 0)
+        completion_tokens = usage_metadata.get("output_tokens", 0)
+        cached_tokens = (usage_metadata.get("input_token_details") or {}).get("cache_read", 0) or 0
+
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cached_tokens": cached_tokens,
+        "total_tokens": token_usage.get("total_tokens") or prompt_tokens + completion_tokens,
+    }
+
+
+def _empty_summary() -> Dict[str, Any]:
+    summary: Dict[str, Any] = {field: 0 for field in USAGE_FIELDS}
+    summary["cost_usd"] = 0.0
+    summary["models"] = {}
+    summary["routes"] = {}
+    return summary
+
+
+def _add_to_summary(summary: Dict[str, Any], other: Dict[str, Any]) -> None:
+    for field in USAGE_FIELDS:
+        summary[field] += other.get(field, 0)
+    summary["cost_usd"] = round(summary["cost_usd"] + other.get("cost_usd", 0.0), 8)
+    for model, count in other.get("models", {}).items():
+        summary["models"][model] = summary["models"].get(model, 0) + count
+    for route, count in other.get("routes", {}).items():
+        summary["routes"][route] = summary["routes"].get(route, 0) + count
+
+
+class UsageRecorder:
+    """한 노드 실행 동안 발생한 LLM 호출의 토큰 사용량 기록"""
+
+    def __init__(self, node: str):
+        self.node = node
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, call: Dict[str, Any]) -> None:
+        with self._lock:
+            self.calls.append(call)
+
+    def summary(self) -> Dict[str, Any]:
+        """노드 단위 집계 결과"""
+        summary = _empty_summary()
+        with self._lock:
+            calls = list(self.calls)
+        for call in calls:
+            _add_to_summary(summary, {
+                **call,
+                "calls": 1,
+                "models": {call["model"]: 1},
+                "routes": {f"{call['model']}:{call['route']}": 1} if call.get("route") else {},
+            })
+        return summary
+
+
+@contextmanager
+def track_usage(node: str):
+    """컨텍스트 내 LLM 호출 사용량을 node 이름으로 수집"""
+    recorder = UsageRecorder(node)
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+
+
+def record_llm_usage(response: Any, model: str = "", latency: float = 0.0, route: Optional[str] = None) -> Dict[str, Any]:
+    """LLM 호출 1건의 사용량(및 모델 선택 사유)을 현재 노드에 기록하고 JSON 로그로 남김"""
+    usage = extract_token_usage(response)
+    metadata = getattr(response, "response_metadata", None) or {}
+    model_name = metadata.get("model_name") or model or "unknown"
+
+    recorder = _current_recorder.get()
+    call = {
+        "node": recorder.node if recorder else None,
+        "model": model_name,
+        "route": route,
+        **usage,
+        "cost_usd": round(estimate_cost(model_name, usage["prompt_tokens"], usage["completion_tokens"], usage["cached_tokens"]), 8),
+        "latency": round(latency, 4),
+    }
+
+    if recorder is not None:
+        recorder.record(call)
+    LLM_CALL_DURATION.observe(latency, node=call["node"] or "unknown", model=model_name)
+
+    logger.info(f"llm_usage {json.dumps(call, ensure_ascii=False)}")
+    return call
+
+
+def track_node_usage(node: str):
+    """노드 함수의 LLM 사용량을 state["token_usage"][node]에 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(state, *args, **kwargs):
+            with track_usage(node) as recorder:
+                new_state = func(state, *args, **kwargs)
+            token_usage = dict(new_state.get("token_usage") or state.get("token_usage") or {})
+            token_usage[node] = recorder.summary()
+            return {**new_state, "token_usage": token_usage}
+        return wrapper
+    return decorator
+
+
+def summarize_workflow_usage(token_usage: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """노드별 사용량을 워크플로우 전체 합계와 함께 반환"""
+    total = _empty_summary()
+    for node_usage in token_usage.values():
+        _add_to_summary(total, node_usage)
+    return {
+        "nodes": token_usage,
+        "total": total,
+    }
@@ -1,20 +1,95 @@
-from fastapi import FastAPI
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 
 from dotenv import load_dotenv
 
-from epic.routes import router as epic_generator_route
-from story.routes import router as story_generator_route
-from story_point.routes import router as story_point_estimator_route
-from orchestrator.routes import router as orchestrator_route
-from slack_bot.routes import router as slack_route
+# 라우터/유틸 모듈이 import 시점에 환경 변수를 읽으므로 가장 먼저 로드
 load_dotenv()
 
+from epic.routes import router as epic_generator_route  # noqa: E402
+from story.routes import router as story_generator_route  # noqa: E402
+from story_point.routes import router as story_point_estimator_route  # noqa: E402
+from orchestrator.routes import router as orchestrator_route  # noqa: E402
+from slack_bot.routes import close_slack_client, start_notion_outbox, router as slack_route  # noqa: E402
+from utils.logger import get_logger  # noqa: E402
+from utils.metrics import REGISTRY  # noqa: E402
+from utils.tracing import parse_traceparent, start_trace  # noqa: E402
+
+logger = get_logger(__name__)
+
+
+def warm_up() -> dict:
+    """무거운 초기화(에이전트, 그래프, 참고 데이터, Slack App)를 미리 수행 - 단계별 소요 시간(초) 반환"""
+    def init_orchestrator():
+        from orchestrator.orchestrator import get_orchestrator
+        get_orchestrator()
+
+    def init_agents():
+        from orchestrator import agent_nodes
+        agent_nodes._get_epic_agent()
+        agent_nodes._get_story_agent()
+        agent_nodes._get_story_point_agent()
+
+    def load_reference_data():
+        from orchestrator import agent_nodes
+        agent_nodes._get_story_point_agent().load_reference_data()
+
+    def init_slack():
+        from slack_bot.routes import get_slack_handler
+        get_slack_handler()
+
+    timings = {}
+    for name, step in [("orchestrator", init_orchestrator), ("agents", init_agents),
+                       ("reference_data", load_reference_data), ("slack", init_slack)]:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.error(f"warm-up 실패 ({name}): {str(e)}")
+        timings[name] = round(time.perf_counter() - start, 3)
+    logger.info(f"warm-up 완료: {timings}")
+    return timings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """기동은 즉시 완료하고 warm-up은 백그라운드 스레드에서 수행 (WARMUP_ON_STARTUP=false면 첫 사용 시 초기화)"""
+    app.state.warmup = None
+    # 멀티 워커(METRICS_MULTIPROC_DIR)면 워커별 스냅샷 기록 시작 (이전 실행의 스냅샷 정리 포함)
+    REGISTRY.start_flusher()
+    if os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true":
+        app.state.warmup = asyncio.create_task(asyncio.to_thread(warm_up))
+    # 남아 있는 Notion 저장 작업 처리 (NOTION_OUTBOX_ON_STARTUP=false면 첫 Slack 요청 시 시작)
+    if os.getenv("NOTION_OUTBOX_ON_STARTUP", "true").lower() == "true":
+        app.state.notion_outbox = asyncio.create_task(start_notion_outbox())
+    yield
+    await close_slack_client()
+
+
 app = FastAPI(
     title="Project Management Agent API",
     description="AI Agent for classifying tasks into epics and stories",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """요청마다 루트 span 생성 - trace id는 X-Trace-Id 응답 헤더로 반환 (traceparent 헤더가 있으면 이어받음)"""
+    trace_id = parse_traceparent(request.headers.get("traceparent"))
+    with start_trace(f"http {request.method} {request.url.path}", trace_id=trace_id) as span:
+        response = await call_next(request)
+        span.set_attribute("status_code", response.status_code)
+    response.headers["X-Trace-Id"] = span.trace_id
+    return response
+
+
 app.include_router(slack_route)
 app.include_router(orchestrator_route)
 app.include_router(epic_generator_route, prefix="/epic_generator")
@@ -23,19 +98,26 @@ app.include_router(story_point_estimator_route, prefix="/story_point_estimator")
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """
-    health check   
+    health check
     """
-    return {"status": "healthy"}
+    warmup = getattr(request.app.state, "warmup", None)
+    return {"status": "healthy", "warm": warmup is None or warmup.done()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus 메트릭 (멀티 워커 시 METRICS_MULTIPROC_DIR의 워커별 스냅샷 합산)"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
-        "main:app", 
-        host="0.0.0.0", 
-        port=8000, 
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
         reload=True,
         reload_dirs=["src"]
-    )
\ No newline at end of file
+    )
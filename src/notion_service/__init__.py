@@ -5,5 +5,7 @@ Notion API 서비스 모듈
 """
 
 from .client import NotionService, get_notion_service
+from .async_client import AsyncNotionService, close_async_notion_service, get_async_notion_service
 
-__all__ = ['NotionService', 'get_notion_service']
\ No newline at end of file
+__all__ = ['NotionService', 'get_notion_service', 'AsyncNotionService', 'get_async_notion_service',
+           'close_async_notion_service']
\ No newline at end of file
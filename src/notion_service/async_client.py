@@ -0,0 +1,288 @@
+# notion_service/async_client.py
+"""비동기 Notion 서비스
+
+NotionService와 같은 페이지 속성/블록/증분 동기화 규칙을 notion_client.AsyncClient로 실행한다.
+HTTP 응답을 기다리는 동안 이벤트 루프를 양보하므로 내보내기가 워커 스레드를 점유하지 않고 요청 처리와 함께 진행된다.
+연결은 httpx.AsyncClient 풀(최대 NOTION_MAX_CONCURRENCY개)을 재사용하고, 요청 속도는 동기 서비스와 같은 토큰 버킷으로 제한한다.
+"""
+import asyncio
+import os
+import threading
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import httpx
+from notion_client import AsyncClient
+from notion_client.errors import APIResponseError, HTTPResponseError
+
+from utils.logger import get_logger
+from utils.metrics import NOTION_API_DURATION, NOTION_RATE_LIMITED, NOTION_SYNC
+from utils.tracing import start_span
+from .client import (MAX_CHILDREN, NotionService, _backfill_block_ids, _chunked, _endpoint_label, _hashed,
+                     _is_missing_page, _is_unchanged, _next_cursor, _page_changes, _plan_block_sync, _result_ids,
+                     _stable_properties, _with_block_ids, get_notion_service)
+from .ratelimit import TokenBucket, retry_after_seconds
+
+logger = get_logger(__name__)
+
+
+class AsyncInstrumentedClient(AsyncClient):
+    """InstrumentedClient의 비동기 버전 - span/지연 시간 기록, 토큰 버킷 대기, 429 Retry-After 재시도"""
+
+    def __init__(self, *args, rate_limiter: Optional[TokenBucket] = None, max_retries: int = 3, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+
+    async def request(self, path: str, method: str, *args, **kwargs):
+        endpoint = _endpoint_label(path)
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            try:
+                with start_span("notion.request", method=method, endpoint=endpoint), \
+                        NOTION_API_DURATION.time(method=method, endpoint=endpoint):
+                    return await super().request(path, method, *args, **kwargs)
+            except HTTPResponseError as e:
+                retry_after = retry_after_seconds(e)
+                if retry_after is None or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                NOTION_RATE_LIMITED.inc(endpoint=endpoint)
+                logger.warning(f"Notion rate limited ({method} {endpoint}) - retry {attempt} after {retry_after}s")
+                if self.rate_limiter is not None:
+                    self.rate_limiter.pause(retry_after)
+                else:
+                    await asyncio.sleep(retry_after)
+
+
+class AsyncNotionService(NotionService):
+    """노션 API 서비스 (비동기) - 내보내기 메서드는 NotionService와 같은 이름의 코루틴"""
+
+    def _build_client(self) -> AsyncInstrumentedClient:
+        pool_size = max(1, self.max_concurrency)
+        return AsyncInstrumentedClient(
+            auth=os.environ.get("NOTION_TOKEN"),
+            client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+            ),
+            rate_limiter=self.rate_limiter,
+            max_retries=int(os.getenv("NOTION_MAX_RETRIES", "3"))
+        )
+
+    async def aclose(self) -> None:
+        """커넥션 풀 종료"""
+        await self.client.aclose()
+
+    async def create_project_page(self, project_data: Dict[str, Any]) -> str:
+        """프로젝트 페이지 생성 (run_id가 있으면 같은 실행의 기존 페이지를 변경분만 갱신)"""
+        try:
+            key = f"project:{project_data['run_id']}" if project_data.get("run_id") else None
+            # 생성일은 처음 만든 시각으로 고정 (다시 저장해도 내용 변경으로 보지 않도록)
+            synced = await asyncio.to_thread(self.sync_store.get, key) if key and self.sync_store else None
+            if synced:
+                project_data = {**project_data, "created_at": datetime.fromtimestamp(synced["created_at"])}
+
+            page_id = await self._upsert_page(
+                key,
+                children=self._project_blocks(project_data),
+                properties=self._project_properties(project_data)
+            )
+            logger.info(f"Created project page: {page_id}")
+            return page_id
+
+        except Exception as e:
+            logger.error(f"Failed to create project page: {str(e)}")
+            raise
+
+    async def create_epic_page(self, epic_data: Dict[str, Any]) -> str:
+        """에픽 페이지 생성"""
+        try:
+            page_id = await self._upsert_page(
+                f"epic:{epic_data['id']}" if epic_data.get("id") else None,
+                children=self._epic_blocks(epic_data),
+                properties=self._epic_properties(epic_data)
+            )
+            logger.info(f"Created epic page: {page_id}")
+            return page_id
+
+        except Exception as e:
+            logger.error(f"Failed to create epic page: {str(e)}")
+            raise
+
+    async def create_story_page(self, story_data: Dict[str, Any]) -> str:
+        """스토리 페이지 생성"""
+        try:
+            page_id = await self._upsert_page(
+                f"story:{story_data['id']}" if story_data.get("id") else None,
+                children=self._story_blocks(story_data),
+                properties=self._story_properties(story_data)
+            )
+            logger.info(f"Created story page: {page_id}")
+            return page_id
+
+        except Exception as e:
+            logger.error(f"Failed to create story page: {str(e)}")
+            raise
+
+    async def create_step_by_step_pages(self, workflow_data: Dict[str, Any], step: str) -> List[str]:
+        """단계별로 노션 페이지 생성"""
+        try:
+            items = self._step_items(workflow_data, step)
+            create = self.create_epic_page if step == "epic" else self.create_story_page
+            page_ids = await self._create_pages(create, items)
+
+            logger.info(f"단계별 페이지 생성 완료: {step}, 생성된 페이지 수: {len(page_ids)}")
+            return page_ids
+
+        except Exception as e:
+            logger.error(f"단계별 페이지 생성 오류: {str(e)}")
+            raise
+
+    async def _create_pages(self, create: Callable[[Dict[str, Any]], Awaitable[str]],
+                            items: List[Dict[str, Any]]) -> List[str]:
+        """페이지 여러 개를 최대 max_concurrency개씩 동시에 생성 - 입력 순서대로 id 반환"""
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def run(item: Dict[str, Any]) -> str:
+            async with semaphore:
+                return await create(item)
+
+        return list(await asyncio.gather(*(run(item) for item in items)))
+
+    async def update_workflow_progress(self, project_page_id: str, completed_steps: List[str],
+                                       step_results: Dict[str, Any]) -> None:
+        """워크플로우 진행 상황을 프로젝트 페이지에 업데이트"""
+        try:
+            await self._append_blocks(project_page_id, self._progress_blocks(completed_steps, step_results))
+            logger.info(f"워크플로우 진행 상황 업데이트 완료: {project_page_id}")
+
+        except Exception as e:
+            logger.error(f"워크플로우 진행 상황 업데이트 오류: {str(e)}")
+            raise
+
+    async def _create_page(self, properties: Dict[str, Any], children: Iterable[Dict[str, Any]]) -> str:
+        """데이터베이스에 페이지 생성 - 첫 MAX_CHILDREN개 블록은 pages.create에 함께 보내고 나머지는 묶음별로 이어 붙임"""
+        chunks = _chunked(children, MAX_CHILDREN)
+        page = await self.client.pages.create(
+            parent={"database_id": self.database_id},
+            properties=properties,
+            children=next(chunks, [])
+        )
+        for chunk in chunks:
+            await self.client.blocks.children.append(block_id=page["id"], children=chunk)
+        return page["id"]
+
+    async def _append_blocks(self, block_id: str, blocks: List[Dict[str, Any]],
+                             after: Optional[str] = None) -> List[str]:
+        """블록 추가 (MAX_CHILDREN개씩) - 추가된 블록 id 반환, after가 있으면 해당 블록 바로 뒤에 삽입"""
+        block_ids = []
+        for i in range(0, len(blocks), MAX_CHILDREN):
+            kwargs = {"after": after} if after else {}
+            response = await self.client.blocks.children.append(
+                block_id=block_id,
+                children=blocks[i:i + MAX_CHILDREN],
+                **kwargs
+            )
+            block_ids.extend(_result_ids(response))
+            if after and block_ids:
+                after = block_ids[-1]
+        return block_ids
+
+    async def _upsert_page(self, key: Optional[str], properties: Dict[str, Any],
+                           children: Iterable[Dict[str, Any]]) -> str:
+        """엔티티 키로 동기화 - 처음이면 생성, 이미 만든 페이지면 바뀐 속성/블록만 갱신"""
+        if key is None or self.sync_store is None:
+            return await self._create_page(properties, children)
+
+        stable_properties, properties_hash = _stable_properties(properties)
+
+        synced = await asyncio.to_thread(self.sync_store.get, key)
+        if synced is None:
+            blocks = []
+            page_id = await self._create_page(properties, _hashed(children, blocks))
+            await asyncio.to_thread(self.sync_store.put, key, page_id, properties_hash, blocks)
+            NOTION_SYNC.inc(action="created")
+            return page_id
+
+        properties_changed, children, blocks = _page_changes(synced, properties_hash, children)
+        page_id = synced["page_id"]
+        if _is_unchanged(synced, properties_changed, blocks):
+            NOTION_SYNC.inc(action="unchanged")
+            return page_id
+
+        try:
+            if properties_changed:
+                await self.client.pages.update(page_id, properties=stable_properties)
+            blocks = await self._sync_blocks(page_id, synced["blocks"], children, blocks)
+        except APIResponseError as e:
+            if not _is_missing_page(e):
+                raise
+            logger.warning(f"Synced Notion page {page_id} for {key} not found - recreating")
+            await asyncio.to_thread(self.sync_store.delete, key)
+            return await self._upsert_page(key, properties, children)
+
+        await asyncio.to_thread(self.sync_store.put, key, page_id, properties_hash, blocks)
+        NOTION_SYNC.inc(action="updated")
+        return page_id
+
+    async def _sync_blocks(self, page_id: str, old: List[Dict[str, Any]], children: List[Dict[str, Any]],
+                           new: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """바뀐 블록만 수정 또는 교체 (_plan_block_sync) - 새 블록 목록(id 포함) 반환"""
+        if any(block["id"] is None for block in old):
+            block_ids = await self._list_block_ids(page_id)
+            old = _backfill_block_ids(old, block_ids)
+            if old is None:
+                # Notion에서 직접 편집된 페이지 - 내용 전체를 다시 작성
+                for block_id in block_ids:
+                    await self.client.blocks.delete(block_id)
+                return _with_block_ids(new, await self._append_blocks(page_id, children))
+
+        operations, result = _plan_block_sync(old, new, children)
+        for operation in operations:
+            if operation[0] == "update":
+                _, block_id, block_type, content = operation
+                await self.client.blocks.update(block_id, **{block_type: content})
+            elif operation[0] == "delete":
+                await self.client.blocks.delete(operation[1])
+            else:
+                _, start, end, after = operation
+                result[start:end] = _with_block_ids(result[start:end],
+                                                    await self._append_blocks(page_id, children[start:end], after=after))
+        return result
+
+    async def _list_block_ids(self, page_id: str) -> List[str]:
+        """페이지 최상위 블록 id 목록 (페이지네이션)"""
+        block_ids = []
+        cursor = None
+        while True:
+            kwargs = {"start_cursor": cursor} if cursor else {}
+            response = await self.client.blocks.children.list(page_id, page_size=MAX_CHILDREN, **kwargs)
+            block_ids.extend(_result_ids(response))
+            cursor = _next_cursor(response)
+            if cursor is None:
+                return block_ids
+
+
+# 싱글톤 인스턴스
+_async_notion_service = None
+_async_notion_service_lock = threading.Lock()
+
+
+def get_async_notion_service() -> AsyncNotionService:
+    """비동기 노션 서비스 싱글톤 인스턴스 반환 (동기 서비스와 토큰 버킷 공유)"""
+    global _async_notion_service
+    if _async_notion_service is None:
+        with _async_notion_service_lock:
+            if _async_notion_service is None:
+                _async_notion_service = AsyncNotionService(rate_limiter=get_notion_service().rate_limiter)
+    return _async_notion_service
+
+
+async def close_async_notion_service() -> None:
+    """커넥션 풀 종료 (생성되지 않았으면 생략)"""
+    global _async_notion_service
+    if _async_notion_service is not None:
+        await _async_notion_service.aclose()
+        _async_notion_service = None
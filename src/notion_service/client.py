@@ -1,19 +1,200 @@
+import contextvars
 import os
-from typing import Dict, List, Any
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from notion_client import Client
+from notion_client.errors import APIErrorCode, APIResponseError, HTTPResponseError
 from datetime import datetime
 
+from story_point.models import StoryPointIndex
 from utils.logger import get_logger
+from utils.metrics import NOTION_API_DURATION, NOTION_RATE_LIMITED, NOTION_SYNC
+from utils.tracing import start_span
+from .ratelimit import TokenBucket, retry_after_seconds
+from .sync import DEFAULT_SYNC_DB_PATH, NotionSyncStore, content_hash
 
 logger = get_logger(__name__)
 
+_NOTION_ID_PATTERN = re.compile(r"^[0-9a-fA-F-]{32,36}$")
+
+# 요청 1회에 보낼 수 있는 children 블록 수 (Notion API 제한)
+MAX_CHILDREN = 100
+
+# 저장할 때마다 바뀌는 속성 - 증분 동기화 비교/갱신에서 제외 (처음 생성 시에만 기록)
+VOLATILE_PROPERTIES = {"날짜"}
+
+
+def _endpoint_label(path: str) -> str:
+    """메트릭 라벨용 엔드포인트 (페이지/블록 id는 {id}로 치환)"""
+    return "/".join("{id}" if _NOTION_ID_PATTERN.match(part) else part for part in path.strip("/").split("/"))
+
+
+def _chunked(items: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """size개씩 묶어 생성 (입력은 한 번만 순회)"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _hashed(children: Iterable[Dict[str, Any]], blocks: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """블록을 그대로 넘기면서 동기화 매핑용 해시({"id", "type", "hash"})를 blocks에 기록"""
+    for block in children:
+        blocks.append({"id": None, "type": block["type"], "hash": content_hash(block)})
+        yield block
+
+
+def _plan_block_sync(old: List[Dict[str, Any]], new: List[Dict[str, Any]],
+                     children: List[Dict[str, Any]]) -> Tuple[List[tuple], List[Dict[str, Any]]]:
+    """최상위 블록을 위치 기준으로 비교해 필요한 API 작업 목록과 새 블록 목록(유지/수정한 블록 id 포함) 반환
+
+    같은 타입이고 하위 블록이 없으면 내용만 수정하고, 그 외에는 연속된 변경 구간을 삭제 후 앞 블록 뒤에 삽입한다.
+    늘어난 블록은 끝에 추가하고 줄어든 블록은 삭제한다. 작업은 순서대로 실행해야 한다.
+    - ("update", block_id, block_type, content)
+    - ("delete", block_id)
+    - ("insert", start, end, after) - children[start:end]를 after 블록 뒤(None이면 끝)에 추가, 결과 id는 new[start:end]
+    """
+    operations = []
+    result = [dict(block) for block in new]
+    common = min(len(old), len(new))
+    i = 0
+    while i < common:
+        if old[i]["hash"] == new[i]["hash"]:
+            result[i]["id"] = old[i]["id"]
+            i += 1
+            continue
+        block_type = new[i]["type"]
+        if old[i]["type"] == block_type and "children" not in children[i][block_type]:
+            operations.append(("update", old[i]["id"], block_type, children[i][block_type]))
+            result[i]["id"] = old[i]["id"]
+            i += 1
+            continue
+
+        # 교체할 연속 구간 [i, j) - 구간 앞 블록은 항상 유지/수정한 기존 블록
+        j = i + 1
+        while j < common and old[j]["hash"] != new[j]["hash"]:
+            j += 1
+        if i == 0:
+            # 맨 앞에는 삽입할 수 없으므로 첫 블록부터 다시 작성
+            j = common
+        operations.extend(("delete", block["id"]) for block in old[i:j])
+        operations.append(("insert", i, j, result[i - 1]["id"] if i else None))
+        if i == 0 and len(old) > common:
+            operations.extend(("delete", block["id"]) for block in old[common:])
+            old = old[:common]
+        i = j
+
+    if len(new) > len(old):
+        operations.append(("insert", len(old), len(new), None))
+    operations.extend(("delete", block["id"]) for block in old[len(new):])
+    return operations, result
+
+
+def _stable_properties(properties: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+    """증분 동기화에 쓰는 (속성, 속성 해시) - 저장할 때마다 바뀌는 속성은 제외"""
+    stable = {name: value for name, value in properties.items() if name not in VOLATILE_PROPERTIES}
+    return stable, content_hash(stable)
+
+
+def _page_changes(synced: Dict[str, Any], properties_hash: str,
+                  children: Iterable[Dict[str, Any]]) -> Tuple[bool, List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """동기화된 페이지와 비교 - (속성 변경 여부, 블록 목록, 새 블록 해시 목록) 반환
+
+    변경분 비교는 위치로 블록에 접근하므로 children을 목록으로 만든다.
+    """
+    children = list(children)
+    blocks = [{"id": None, "type": block["type"], "hash": content_hash(block)} for block in children]
+    return synced["properties_hash"] != properties_hash, children, blocks
+
+
+def _is_unchanged(synced: Dict[str, Any], properties_changed: bool, blocks: List[Dict[str, Any]]) -> bool:
+    """속성과 블록 해시 목록이 모두 같으면 갱신할 것이 없음"""
+    return not properties_changed and [block["hash"] for block in synced["blocks"]] == [block["hash"] for block in blocks]
+
+
+def _is_missing_page(error: APIResponseError) -> bool:
+    """Notion에서 페이지가 삭제됨 - 매핑을 지우고 새로 생성해야 함"""
+    return error.code == APIErrorCode.ObjectNotFound
+
+
+def _with_block_ids(blocks: List[Dict[str, Any]], block_ids: List[str]) -> List[Dict[str, Any]]:
+    """블록 매핑에 순서대로 id 기록 (응답에 없는 블록은 기존 id 유지 - None이면 다음 동기화 때 조회)"""
+    return [{**block, "id": block_ids[i]} if i < len(block_ids) else block for i, block in enumerate(blocks)]
+
+
+def _result_ids(response: Optional[Dict[str, Any]]) -> List[str]:
+    """블록 추가/조회 응답의 블록 id 목록"""
+    return [block["id"] for block in (response or {}).get("results", [])]
+
+
+def _next_cursor(response: Dict[str, Any]) -> Optional[str]:
+    """블록 목록 다음 페이지 커서 (마지막 페이지면 None)"""
+    return response.get("next_cursor") if response.get("has_more") else None
+
+
+def _backfill_block_ids(old: List[Dict[str, Any]], block_ids: List[str]) -> Optional[List[Dict[str, Any]]]:
+    """조회한 블록 id를 매핑에 채움 - 블록 수가 다르면 Notion에서 직접 편집된 페이지이므로 None (전체 다시 작성)"""
+    if len(block_ids) != len(old):
+        return None
+    return _with_block_ids(old, block_ids)
+
+
+class InstrumentedClient(Client):
+    """모든 Notion API 호출을 span으로 기록하고 지연 시간을 notion_api_duration_seconds에 기록하는 클라이언트
+
+    rate_limiter가 있으면 요청마다 토큰을 얻은 뒤 호출하고, 429 응답은 Retry-After 동안 모든 요청을 멈춘 뒤
+    최대 max_retries번 다시 시도한다.
+    """
+
+    def __init__(self, *args, rate_limiter: Optional[TokenBucket] = None, max_retries: int = 3, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+
+    def request(self, path: str, method: str, *args, **kwargs):
+        endpoint = _endpoint_label(path)
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                with start_span("notion.request", method=method, endpoint=endpoint), \
+                        NOTION_API_DURATION.time(method=method, endpoint=endpoint):
+                    return super().request(path, method, *args, **kwargs)
+            except HTTPResponseError as e:
+                retry_after = retry_after_seconds(e)
+                if retry_after is None or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                NOTION_RATE_LIMITED.inc(endpoint=endpoint)
+                logger.warning(f"Notion rate limited ({method} {endpoint}) - retry {attempt} after {retry_after}s")
+                if self.rate_limiter is not None:
+                    self.rate_limiter.pause(retry_after)
+                else:
+                    time.sleep(retry_after)
+
 
 class NotionService:
     """노션 API 서비스"""
 
-    def __init__(self):
-        self.client = Client(auth=os.environ.get("NOTION_TOKEN"))
+    def __init__(self, rate_limiter: Optional[TokenBucket] = None):
+        # 같은 토큰을 쓰는 모든 요청이 하나의 토큰 버킷을 공유 (Notion 평균 약 3 req/s + burst)
+        self.rate_limiter = rate_limiter or TokenBucket(
+            rate=float(os.getenv("NOTION_RATE_LIMIT", "3")),
+            burst=int(os.getenv("NOTION_RATE_BURST", "5"))
+        )
         self.database_id = os.environ.get("NOTION_DATABASE_ID")
+        # 에픽/스토리 페이지 동시 생성 수
+        self.max_concurrency = int(os.getenv("NOTION_MAX_CONCURRENCY", "4"))
+        self.client = self._build_client()
+        # 증분 동기화 매핑 (빈 값이면 저장할 때마다 새 페이지 생성)
+        sync_db_path = os.getenv("NOTION_SYNC_DB_PATH", DEFAULT_SYNC_DB_PATH)
+        self.sync_store = NotionSyncStore(sync_db_path) if sync_db_path else None
 
         # 노션 데이터베이스 속성 매핑
         self.property_mapping = {
@@ -34,68 +215,82 @@ class NotionService:
             "중분류": "rich_text"
         }
     
+    def _build_client(self) -> InstrumentedClient:
+        return InstrumentedClient(
+            auth=os.environ.get("NOTION_TOKEN"),
+            rate_limiter=self.rate_limiter,
+            max_retries=int(os.getenv("NOTION_MAX_RETRIES", "3"))
+        )
+
     def create_project_page(self, project_data: Dict[str, Any]) -> str:
-        """프로젝트 페이지 생성"""
+        """프로젝트 페이지 생성 (run_id가 있으면 같은 실행의 기존 페이지를 변경분만 갱신)"""
         try:
-            # 프로젝트 메인 페이지 생성
-            main_page = self.client.pages.create(
-                parent={"database_id": self.database_id},
-                properties={
-                    "Name": {
-                        "title": [
-                            {
-                                "text": {
-                                    "content": f"프로젝트: {project_data.get('project_name', '새 프로젝트')}"
-                                }
-                            }
-                        ]
-                    },
-                    "상태": {
-                        "status": {
-                            "name": "Planning"
-                        }
-                    },
-                    "타입": {
-                        "select": {
-                            "name": "Project"
-                        }
-                    },
-                    "날짜": {
-                        "date": {
-                            "start": datetime.now().isoformat()
-                        }
-                    },
-                    "대분류": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": "프로젝트"
-                                }
-                            }
-                        ]
-                    },
-                    "우선순위": {
-                        "select": {
-                            "name": "Medium"
-                        }
-                    }
-                }
+            key = f"project:{project_data['run_id']}" if project_data.get("run_id") else None
+            # 생성일은 처음 만든 시각으로 고정 (다시 저장해도 내용 변경으로 보지 않도록)
+            synced = self.sync_store.get(key) if key and self.sync_store else None
+            if synced:
+                project_data = {**project_data, "created_at": datetime.fromtimestamp(synced["created_at"])}
+
+            # 프로젝트 메인 페이지 생성 (내용 블록 포함)
+            page_id = self._upsert_page(
+                key,
+                children=self._project_blocks(project_data),
+                properties=self._project_properties(project_data)
             )
             
-            page_id = main_page["id"]
             logger.info(f"Created project page: {page_id}")
             
-            # 페이지 내용 추가
-            self._add_project_content(page_id, project_data)
-            
             return page_id
             
         except Exception as e:
             logger.error(f"Failed to create project page: {str(e)}")
             raise
     
-    def _add_project_content(self, page_id: str, project_data: Dict[str, Any]):
-        """프로젝트 페이지 내용 추가"""
+    def _project_properties(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
+        """프로젝트 페이지 속성"""
+        return {
+            "Name": {
+                "title": [
+                    {
+                        "text": {
+                            "content": f"프로젝트: {project_data.get('project_name', '새 프로젝트')}"
+                        }
+                    }
+                ]
+            },
+            "상태": {
+                "status": {
+                    "name": "Planning"
+                }
+            },
+            "타입": {
+                "select": {
+                    "name": "Project"
+                }
+            },
+            "날짜": {
+                "date": {
+                    "start": datetime.now().isoformat()
+                }
+            },
+            "대분류": {
+                "rich_text": [
+                    {
+                        "text": {
+                            "content": "프로젝트"
+                        }
+                    }
+                ]
+            },
+            "우선순위": {
+                "select": {
+                    "name": "Medium"
+                }
+            }
+        }
+
+    def _project_blocks(self, project_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """프로젝트 페이지 내용 블록 - 개요, 에픽, 스토리 순으로 하나씩 생성 (전체 목록을 메모리에 만들지 않음)"""
         
         epic_results = project_data.get("epic_results", [])
         
@@ -103,64 +298,64 @@ class NotionService:
         all_unique_story_points = set()
         for result in epic_results:
             for sp in result["story_points"]:
-                all_unique_story_points.add((sp.story_title, sp.estimated_point))
+                all_unique_story_points.add((sp.story_id or sp.story_title, sp.estimated_point))
         
         total_points = sum(point for _, point in all_unique_story_points)
+
+        # 스토리 → 포인트 조인 인덱스 (에픽 전체에서 한 번 생성)
+        point_index = StoryPointIndex(sp for result in epic_results for sp in result["story_points"])
         
         # 페이지 블록 구성
-        blocks = [
-            {
-                "object": "block",
-                "type": "heading_1",
-                "heading_1": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": "프로젝트 개요"
-                            }
+        yield {
+            "object": "block",
+            "type": "heading_1",
+            "heading_1": {
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {
+                            "content": "프로젝트 개요"
                         }
-                    ]
-                }
-            },
-            {
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": f"📊 총 {len(epic_results)}개 에픽, {project_data.get('total_stories', 0)}개 스토리, {total_points}개 스토리 포인트"
-                            }
+                    }
+                ]
+            }
+        }
+        yield {
+            "object": "block",
+            "type": "paragraph",
+            "paragraph": {
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {
+                            "content": f"📊 총 {len(epic_results)}개 에픽, {project_data.get('total_stories', 0)}개 스토리, {total_points}개 스토리 포인트"
                         }
-                    ]
-                }
-            },
-            {
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": f"🕒 생성일: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                            }
+                    }
+                ]
+            }
+        }
+        yield {
+            "object": "block",
+            "type": "paragraph",
+            "paragraph": {
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {
+                            "content": f"🕒 생성일: {(project_data.get('created_at') or datetime.now()).strftime('%Y-%m-%d %H:%M:%S')}"
                         }
-                    ]
-                }
+                    }
+                ]
             }
-        ]
+        }
         
         # 에픽별로 내용 추가
         for i, epic_result in enumerate(epic_results, 1):
             epic = epic_result["epic"]
             stories = epic_result["stories"]
-            story_points = epic_result["story_points"]
             
             # 에픽 헤더
-            blocks.append({
+            yield {
                 "object": "block",
                 "type": "heading_2",
                 "heading_2": {
@@ -173,10 +368,10 @@ class NotionService:
                         }
                     ]
                 }
-            })
+            }
             
             # 에픽 설명
-            blocks.append({
+            yield {
                 "object": "block",
                 "type": "paragraph",
                 "paragraph": {
@@ -189,10 +384,10 @@ class NotionService:
                         }
                     ]
                 }
-            })
+            }
             
             # 에픽 정보
-            blocks.extend([
+            yield from [
                 {
                     "object": "block",
                     "type": "bulleted_list_item",
@@ -221,11 +416,11 @@ class NotionService:
                         ]
                     }
                 }
-            ])
+            ]
             
             # 수용 기준
             if epic.acceptance_criteria:
-                blocks.append({
+                yield {
                     "object": "block",
                     "type": "paragraph",
                     "paragraph": {
@@ -241,10 +436,10 @@ class NotionService:
                             }
                         ]
                     }
-                })
+                }
                 
                 for criterion in epic.acceptance_criteria:
-                    blocks.append({
+                    yield {
                         "object": "block",
                         "type": "bulleted_list_item",
                         "bulleted_list_item": {
@@ -257,11 +452,11 @@ class NotionService:
                                 }
                             ]
                         }
-                    })
+                    }
             
             # 스토리 섹션
             if stories:
-                blocks.append({
+                yield {
                     "object": "block",
                     "type": "heading_3",
                     "heading_3": {
@@ -274,26 +469,22 @@ class NotionService:
                             }
                         ]
                     }
-                })
+                }
                 
                 # 중복 방지를 위해 이미 처리된 스토리 추적
                 processed_stories = set()
                 
                 for story in stories:
-                    # 중복 스토리 건너뛰기
-                    if story.title in processed_stories:
+                    # 중복 스토리 건너뛰기 (제목이 같아도 다른 스토리면 모두 표시)
+                    if story.id in processed_stories:
                         continue
-                    processed_stories.add(story.title)
+                    processed_stories.add(story.id)
                     
-                    # 스토리 포인트 찾기 (첫 번째 매칭만)
-                    story_point = next(
-                        (sp for sp in story_points if sp.story_title == story.title),
-                        None
-                    )
+                    story_point = point_index.get(story)
                     
                     point_text = f" - {story_point.estimated_point}pt" if story_point else ""
                     
-                    blocks.append({
+                    yield {
                         "object": "block",
                         "type": "toggle",
                         "toggle": {
@@ -339,86 +530,26 @@ class NotionService:
                                 }
                             ]
                         }
-                    })
+                    }
             
             # 구분선
-            blocks.append({
+            yield {
                 "object": "block",
                 "type": "divider",
                 "divider": {}
-            })
-        
-        # 블록 추가 (API 제한으로 인해 100개씩 나누어 추가)
-        chunk_size = 100
-        for i in range(0, len(blocks), chunk_size):
-            chunk = blocks[i:i + chunk_size]
-            self.client.blocks.children.append(
-                block_id=page_id,
-                children=chunk
-            )
+            }
     
     def create_epic_page(self, epic_data: Dict[str, Any]) -> str:
         """에픽 페이지 생성"""
         try:
-            epic_page = self.client.pages.create(
-                parent={"database_id": self.database_id},
-                properties={
-                    "Name": {
-                        "title": [
-                            {
-                                "text": {
-                                    "content": epic_data.get('title', '새 에픽')
-                                }
-                            }
-                        ]
-                    },
-                    "상태": {
-                        "status": {
-                            "name": "To Do"
-                        }
-                    },
-                    "타입": {
-                        "select": {
-                            "name": "Epic"
-                        }
-                    },
-                    "대분류": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": "Epic"
-                                }
-                            }
-                        ]
-                    },
-                    "우선순위": {
-                        "select": {
-                            "name": epic_data.get('priority', 'Medium')
-                        }
-                    },
-                    "비고": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": epic_data.get('business_value', '')
-                                }
-                            }
-                        ]
-                    },
-                    "날짜": {
-                        "date": {
-                            "start": datetime.now().isoformat()
-                        }
-                    }
-                }
+            page_id = self._upsert_page(
+                f"epic:{epic_data['id']}" if epic_data.get("id") else None,
+                children=self._epic_blocks(epic_data),
+                properties=self._epic_properties(epic_data)
             )
 
-            page_id = epic_page["id"]
             logger.info(f"Created epic page: {page_id}")
 
-            # 에픽 상세 내용 추가
-            self._add_epic_content(page_id, epic_data)
-
             return page_id
 
         except Exception as e:
@@ -428,93 +559,269 @@ class NotionService:
     def create_story_page(self, story_data: Dict[str, Any]) -> str:
         """스토리 페이지 생성"""
         try:
-            # 스토리 포인트 정보
-            story_point = story_data.get('story_point', {})
-            estimated_point = story_point.get('estimated_point', 0) if story_point else 0
-
-            story_page = self.client.pages.create(
-                parent={"database_id": self.database_id},
-                properties={
-                    "Name": {
-                        "title": [
-                            {
-                                "text": {
-                                    "content": story_data.get('title', '새 스토리')
-                                }
-                            }
-                        ]
-                    },
-                    "상태": {
-                        "status": {
-                            "name": "To Do"
+            page_id = self._upsert_page(
+                f"story:{story_data['id']}" if story_data.get("id") else None,
+                children=self._story_blocks(story_data),
+                properties=self._story_properties(story_data)
+            )
+
+            logger.info(f"Created story page: {page_id}")
+
+            return page_id
+
+        except Exception as e:
+            logger.error(f"Failed to create story page: {str(e)}")
+            raise
+
+    def _epic_properties(self, epic_data: Dict[str, Any]) -> Dict[str, Any]:
+        """에픽 페이지 속성"""
+        return {
+            "Name": {
+                "title": [
+                    {
+                        "text": {
+                            "content": epic_data.get('title', '새 에픽')
                         }
-                    },
-                    "타입": {
-                        "select": {
-                            "name": "Story"
+                    }
+                ]
+            },
+            "상태": {
+                "status": {
+                    "name": "To Do"
+                }
+            },
+            "타입": {
+                "select": {
+                    "name": "Epic"
+                }
+            },
+            "대분류": {
+                "rich_text": [
+                    {
+                        "text": {
+                            "content": "Epic"
                         }
-                    },
-                    "대분류": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": "Story"
-                                }
-                            }
-                        ]
-                    },
-                    "중분류": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": story_data.get('domain', '')
-                                }
-                            }
-                        ]
-                    },
-                    "소분류": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": story_data.get('story_type', '')
-                                }
-                            }
-                        ]
-                    },
-                    "SP": {
-                        "number": estimated_point
-                    },
-                    "티켓 ID": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": f"STORY-{story_data.get('id', '')}"
-                                }
-                            }
-                        ]
-                    },
-                    "날짜": {
-                        "date": {
-                            "start": datetime.now().isoformat()
+                    }
+                ]
+            },
+            "우선순위": {
+                "select": {
+                    "name": epic_data.get('priority', 'Medium')
+                }
+            },
+            "비고": {
+                "rich_text": [
+                    {
+                        "text": {
+                            "content": epic_data.get('business_value', '')
                         }
                     }
+                ]
+            },
+            "날짜": {
+                "date": {
+                    "start": datetime.now().isoformat()
                 }
+            }
+        }
+
+    def _story_properties(self, story_data: Dict[str, Any]) -> Dict[str, Any]:
+        """스토리 페이지 속성"""
+        # 스토리 포인트 정보
+        story_point = story_data.get('story_point', {})
+        estimated_point = story_point.get('estimated_point', 0) if story_point else 0
+
+        return {
+            "Name": {
+                "title": [
+                    {
+                        "text": {
+                            "content": story_data.get('title', '새 스토리')
+                        }
+                    }
+                ]
+            },
+            "상태": {
+                "status": {
+                    "name": "To Do"
+                }
+            },
+            "타입": {
+                "select": {
+                    "name": "Story"
+                }
+            },
+            "대분류": {
+                "rich_text": [
+                    {
+                        "text": {
+                            "content": "Story"
+                        }
+                    }
+                ]
+            },
+            "중분류": {
+                "rich_text": [
+                    {
+                        "text": {
+                            "content": story_data.get('domain', '')
+                        }
+                    }
+                ]
+            },
+            "소분류": {
+                "rich_text": [
+                    {
+                        "text": {
+                            "content": story_data.get('story_type', '')
+                        }
+                    }
+                ]
+            },
+            "SP": {
+                "number": estimated_point
+            },
+            "티켓 ID": {
+                "rich_text": [
+                    {
+                        "text": {
+                            "content": f"STORY-{story_data.get('id', '')}"
+                        }
+                    }
+                ]
+            },
+            "날짜": {
+                "date": {
+                    "start": datetime.now().isoformat()
+                }
+            }
+        }
+
+    def _create_page(self, properties: Dict[str, Any], children: Iterable[Dict[str, Any]]) -> str:
+        """데이터베이스에 페이지 생성 - 첫 MAX_CHILDREN개 블록은 pages.create에 함께 보내고 나머지만 이어 붙임
+
+        children은 생성기여도 된다. 첫 묶음이 차는 즉시 페이지를 만들고, 이후 묶음은 업로드와 생성을 겹쳐 진행한다.
+        """
+        chunks = _chunked(children, MAX_CHILDREN)
+        page = self.client.pages.create(
+            parent={"database_id": self.database_id},
+            properties=properties,
+            children=next(chunks, [])
+        )
+        self._append_chunks(page["id"], chunks)
+        return page["id"]
+
+    def _append_chunks(self, block_id: str, chunks: Iterator[List[Dict[str, Any]]]) -> None:
+        """블록 묶음을 순서대로 이어 붙임 - 한 묶음을 업로드하는 동안 다음 묶음을 만든다 (메모리에는 최대 두 묶음)"""
+        chunk = next(chunks, None)
+        if chunk is None:
+            return
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="notion-append") as pool:
+            while chunk is not None:
+                # trace 등 contextvars를 업로드 스레드로 전달
+                pending = pool.submit(contextvars.copy_context().run, self.client.blocks.children.append,
+                                      block_id=block_id, children=chunk)
+                chunk = next(chunks, None)
+                # 같은 페이지에 이어 붙이므로 순서를 지키기 위해 이전 묶음 완료 후 다음 묶음 전송
+                pending.result()
+
+    def _append_blocks(self, block_id: str, blocks: List[Dict[str, Any]], after: Optional[str] = None) -> List[str]:
+        """블록 추가 (API 제한으로 인해 MAX_CHILDREN개씩 나누어 추가) - 추가된 블록 id 반환
+
+        after가 있으면 해당 블록 바로 뒤에 삽입한다.
+        """
+        block_ids = []
+        for i in range(0, len(blocks), MAX_CHILDREN):
+            kwargs = {"after": after} if after else {}
+            response = self.client.blocks.children.append(
+                block_id=block_id,
+                children=blocks[i:i + MAX_CHILDREN],
+                **kwargs
             )
+            block_ids.extend(_result_ids(response))
+            if after and block_ids:
+                after = block_ids[-1]
+        return block_ids
 
-            page_id = story_page["id"]
-            logger.info(f"Created story page: {page_id}")
+    def _upsert_page(self, key: Optional[str], properties: Dict[str, Any], children: Iterable[Dict[str, Any]]) -> str:
+        """엔티티 키로 동기화 - 처음이면 생성, 이미 만든 페이지면 바뀐 속성/블록만 갱신"""
+        if key is None or self.sync_store is None:
+            return self._create_page(properties, children)
 
-            # 스토리 상세 내용 추가
-            self._add_story_content(page_id, story_data)
+        stable_properties, properties_hash = _stable_properties(properties)
 
+        synced = self.sync_store.get(key)
+        if synced is None:
+            # 처음 만드는 페이지는 블록을 업로드하면서 해시만 기록 (블록 목록을 메모리에 만들지 않음)
+            blocks = []
+            page_id = self._create_page(properties, _hashed(children, blocks))
+            self.sync_store.put(key, page_id, properties_hash, blocks)
+            NOTION_SYNC.inc(action="created")
             return page_id
 
-        except Exception as e:
-            logger.error(f"Failed to create story page: {str(e)}")
-            raise
+        properties_changed, children, blocks = _page_changes(synced, properties_hash, children)
+        page_id = synced["page_id"]
+        if _is_unchanged(synced, properties_changed, blocks):
+            NOTION_SYNC.inc(action="unchanged")
+            return page_id
+
+        try:
+            if properties_changed:
+                self.client.pages.update(page_id, properties=stable_properties)
+            blocks = self._sync_blocks(page_id, synced["blocks"], children, blocks)
+        except APIResponseError as e:
+            if not _is_missing_page(e):
+                raise
+            logger.warning(f"Synced Notion page {page_id} for {key} not found - recreating")
+            self.sync_store.delete(key)
+            return self._upsert_page(key, properties, children)
+
+        self.sync_store.put(key, page_id, properties_hash, blocks)
+        NOTION_SYNC.inc(action="updated")
+        return page_id
+
+    def _sync_blocks(self, page_id: str, old: List[Dict[str, Any]], children: List[Dict[str, Any]],
+                     new: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """최상위 블록을 비교해 바뀐 블록만 수정 또는 교체 (_plan_block_sync) - 새 블록 목록(id 포함) 반환
 
-    def _add_epic_content(self, page_id: str, epic_data: Dict[str, Any]):
-        """에픽 페이지 내용 추가"""
+        블록 id를 모르면 한 번 조회해 채운다.
+        """
+        if any(block["id"] is None for block in old):
+            block_ids = self._list_block_ids(page_id)
+            old = _backfill_block_ids(old, block_ids)
+            if old is None:
+                # Notion에서 직접 편집된 페이지 - 내용 전체를 다시 작성
+                for block_id in block_ids:
+                    self.client.blocks.delete(block_id)
+                return _with_block_ids(new, self._append_blocks(page_id, children))
+
+        operations, result = _plan_block_sync(old, new, children)
+        for operation in operations:
+            if operation[0] == "update":
+                _, block_id, block_type, content = operation
+                self.client.blocks.update(block_id, **{block_type: content})
+            elif operation[0] == "delete":
+                self.client.blocks.delete(operation[1])
+            else:
+                _, start, end, after = operation
+                result[start:end] = _with_block_ids(result[start:end],
+                                                    self._append_blocks(page_id, children[start:end], after=after))
+        return result
+
+    def _list_block_ids(self, page_id: str) -> List[str]:
+        """페이지 최상위 블록 id 목록 (페이지네이션)"""
+        block_ids = []
+        cursor = None
+        while True:
+            kwargs = {"start_cursor": cursor} if cursor else {}
+            response = self.client.blocks.children.list(page_id, page_size=MAX_CHILDREN, **kwargs)
+            block_ids.extend(_result_ids(response))
+            cursor = _next_cursor(response)
+            if cursor is None:
+                return block_ids
+
+    def _epic_blocks(self, epic_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """에픽 페이지 내용 블록"""
         blocks = [
             {
                 "object": "block",
@@ -579,13 +886,10 @@ class NotionService:
                     }
                 })
 
-        self.client.blocks.children.append(
-            block_id=page_id,
-            children=blocks
-        )
+        return blocks
 
-    def _add_story_content(self, page_id: str, story_data: Dict[str, Any]):
-        """스토리 페이지 내용 추가"""
+    def _story_blocks(self, story_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """스토리 페이지 내용 블록"""
         blocks = [
             {
                 "object": "block",
@@ -712,72 +1016,14 @@ class NotionService:
                 }
             ])
 
-        self.client.blocks.children.append(
-            block_id=page_id,
-            children=blocks
-        )
+        return blocks
 
     def create_step_by_step_pages(self, workflow_data: Dict[str, Any], step: str) -> List[str]:
         """단계별로 노션 페이지 생성"""
-        page_ids = []
-
         try:
-            if step == "epic" and workflow_data.get("epics"):
-                # 에픽 페이지들 생성
-                for epic in workflow_data["epics"]:
-                    epic_data = {
-                        "title": getattr(epic, 'title', ''),
-                        "description": getattr(epic, 'description', ''),
-                        "business_value": getattr(epic, 'business_value', ''),
-                        "priority": getattr(epic, 'priority', 'Medium'),
-                        "acceptance_criteria": getattr(epic, 'acceptance_criteria', [])
-                    }
-                    page_id = self.create_epic_page(epic_data)
-                    page_ids.append(page_id)
-
-            elif step == "story" and workflow_data.get("stories"):
-                # 스토리 페이지들 생성
-                for story in workflow_data["stories"]:
-                    story_data = {
-                        "title": getattr(story, 'title', ''),
-                        "description": getattr(story, 'description', ''),
-                        "domain": getattr(story, 'domain', ''),
-                        "story_type": getattr(story, 'story_type', ''),
-                        "acceptance_criteria": getattr(story, 'acceptance_criteria', []),
-                        "id": getattr(story, 'id', '')
-                    }
-                    page_id = self.create_story_page(story_data)
-                    page_ids.append(page_id)
-
-            elif step == "point" and workflow_data.get("story_points"):
-                # 스토리 포인트가 추가된 스토리 페이지들 업데이트
-                stories = workflow_data.get("stories", [])
-                story_points = workflow_data.get("story_points", [])
-
-                # 스토리와 스토리 포인트 매핑
-                for story in stories:
-                    # 해당 스토리의 포인트 찾기
-                    story_point = next(
-                        (sp for sp in story_points if sp.story_title == story.title),
-                        None
-                    )
-
-                    story_data = {
-                        "title": getattr(story, 'title', ''),
-                        "description": getattr(story, 'description', ''),
-                        "domain": getattr(story, 'domain', ''),
-                        "story_type": getattr(story, 'story_type', ''),
-                        "acceptance_criteria": getattr(story, 'acceptance_criteria', []),
-                        "id": getattr(story, 'id', ''),
-                        "story_point": {
-                            "estimated_point": getattr(story_point, 'estimated_point', 0),
-                            "estimation_method": getattr(story_point, 'estimation_method', ''),
-                            "reasoning": getattr(story_point, 'reasoning', '')
-                        } if story_point else None
-                    }
-
-                    page_id = self.create_story_page(story_data)
-                    page_ids.append(page_id)
+            items = self._step_items(workflow_data, step)
+            create = self.create_epic_page if step == "epic" else self.create_story_page
+            page_ids = self._create_pages(create, items)
 
             logger.info(f"단계별 페이지 생성 완료: {step}, 생성된 페이지 수: {len(page_ids)}")
             return page_ids
@@ -786,88 +1032,163 @@ class NotionService:
             logger.error(f"단계별 페이지 생성 오류: {str(e)}")
             raise
 
+    def _step_items(self, workflow_data: Dict[str, Any], step: str) -> List[Dict[str, Any]]:
+        """단계별 페이지 생성에 쓸 에픽/스토리 데이터 (해당 단계 데이터가 없으면 빈 목록)"""
+        if step == "epic" and workflow_data.get("epics"):
+            # 에픽 페이지들 생성
+            epic_items = [
+                {
+                    "title": getattr(epic, 'title', ''),
+                    "description": getattr(epic, 'description', ''),
+                    "business_value": getattr(epic, 'business_value', ''),
+                    "priority": getattr(epic, 'priority', 'Medium'),
+                    "acceptance_criteria": getattr(epic, 'acceptance_criteria', []),
+                    "id": getattr(epic, 'id', '')
+                }
+                for epic in workflow_data["epics"]
+            ]
+            return epic_items
+
+        if step == "story" and workflow_data.get("stories"):
+            # 스토리 페이지들 생성
+            story_items = [
+                {
+                    "title": getattr(story, 'title', ''),
+                    "description": getattr(story, 'description', ''),
+                    "domain": getattr(story, 'domain', ''),
+                    "story_type": getattr(story, 'story_type', ''),
+                    "acceptance_criteria": getattr(story, 'acceptance_criteria', []),
+                    "id": getattr(story, 'id', '')
+                }
+                for story in workflow_data["stories"]
+            ]
+            return story_items
+
+        if step == "point" and workflow_data.get("story_points"):
+            # 스토리 포인트가 추가된 스토리 페이지들
+            stories = workflow_data.get("stories", [])
+            story_points = workflow_data.get("story_points", [])
+
+            # 스토리와 스토리 포인트 매핑
+            point_index = StoryPointIndex(story_points)
+            story_items = []
+            for story in stories:
+                story_point = point_index.get(story)
+
+                story_data = {
+                    "title": getattr(story, 'title', ''),
+                    "description": getattr(story, 'description', ''),
+                    "domain": getattr(story, 'domain', ''),
+                    "story_type": getattr(story, 'story_type', ''),
+                    "acceptance_criteria": getattr(story, 'acceptance_criteria', []),
+                    "id": getattr(story, 'id', ''),
+                    "story_point": {
+                        "estimated_point": getattr(story_point, 'estimated_point', 0),
+                        "estimation_method": getattr(story_point, 'estimation_method', ''),
+                        "reasoning": getattr(story_point, 'reasoning', '')
+                    } if story_point else None
+                }
+                story_items.append(story_data)
+
+            return story_items
+
+        return []
+
+    def _create_pages(self, create: Callable[[Dict[str, Any]], str], items: List[Dict[str, Any]]) -> List[str]:
+        """페이지 여러 개를 max_concurrency개씩 동시에 생성 (요청 속도는 공용 토큰 버킷이 제한) - 입력 순서대로 id 반환"""
+        if len(items) <= 1 or self.max_concurrency <= 1:
+            return [create(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items)),
+                                thread_name_prefix="notion-export") as pool:
+            # trace 등 contextvars를 작업마다 복사해 전달
+            futures = [pool.submit(contextvars.copy_context().run, create, item) for item in items]
+            return [future.result() for future in futures]
+
     def update_workflow_progress(self, project_page_id: str, completed_steps: List[str],
                                step_results: Dict[str, Any]) -> None:
         """워크플로우 진행 상황을 프로젝트 페이지에 업데이트"""
         try:
-            # 진행 상황 블록 추가
-            progress_blocks = [
-                {
-                    "object": "block",
-                    "type": "heading_2",
-                    "heading_2": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": "🔄 워크플로우 진행 상황"
-                                }
+            progress_blocks = self._progress_blocks(completed_steps, step_results)
+
+            # 블록 추가
+            self._append_blocks(project_page_id, progress_blocks)
+
+            logger.info(f"워크플로우 진행 상황 업데이트 완료: {project_page_id}")
+
+        except Exception as e:
+            logger.error(f"워크플로우 진행 상황 업데이트 오류: {str(e)}")
+            raise
+
+    def _progress_blocks(self, completed_steps: List[str], step_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """워크플로우 진행 상황 블록"""
+        # 진행 상황 블록 추가
+        progress_blocks = [
+            {
+                "object": "block",
+                "type": "heading_2",
+                "heading_2": {
+                    "rich_text": [
+                        {
+                            "type": "text",
+                            "text": {
+                                "content": "🔄 워크플로우 진행 상황"
                             }
-                        ]
-                    }
+                        }
+                    ]
                 }
-            ]
+            }
+        ]
+
+        # 단계별 상태 표시
+        all_steps = ["epic", "story", "point"]
+        for step in all_steps:
+            status_emoji = "✅" if step in completed_steps else "⏳"
+            step_name = {
+                "epic": "에픽 생성",
+                "story": "스토리 생성",
+                "point": "스토리 포인트 추정"
+            }.get(step, step)
 
-            # 단계별 상태 표시
-            all_steps = ["epic", "story", "point"]
-            for step in all_steps:
-                status_emoji = "✅" if step in completed_steps else "⏳"
-                step_name = {
-                    "epic": "에픽 생성",
-                    "story": "스토리 생성",
-                    "point": "스토리 포인트 추정"
-                }.get(step, step)
-
-                progress_blocks.append({
+            progress_blocks.append({
+                "object": "block",
+                "type": "bulleted_list_item",
+                "bulleted_list_item": {
+                    "rich_text": [
+                        {
+                            "type": "text",
+                            "text": {
+                                "content": f"{status_emoji} {step_name}"
+                            }
+                        }
+                    ]
+                }
+            })
+
+        # 결과 요약
+        if step_results:
+            progress_blocks.extend([
+                {
                     "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
+                    "type": "paragraph",
+                    "paragraph": {
                         "rich_text": [
                             {
                                 "type": "text",
                                 "text": {
-                                    "content": f"{status_emoji} {step_name}"
+                                    "content": f"📊 현재까지 결과: 에픽 {step_results.get('total_epics', 0)}개, 스토리 {step_results.get('total_stories', 0)}개, 총 SP {step_results.get('total_story_points', 0)}개"
                                 }
                             }
                         ]
                     }
-                })
-
-            # 결과 요약
-            if step_results:
-                progress_blocks.extend([
-                    {
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [
-                                {
-                                    "type": "text",
-                                    "text": {
-                                        "content": f"📊 현재까지 결과: 에픽 {step_results.get('total_epics', 0)}개, 스토리 {step_results.get('total_stories', 0)}개, 총 SP {step_results.get('total_story_points', 0)}개"
-                                    }
-                                }
-                            ]
-                        }
-                    },
-                    {
-                        "object": "block",
-                        "type": "divider",
-                        "divider": {}
-                    }
-                ])
-
-            # 블록 추가
-            self.client.blocks.children.append(
-                block_id=project_page_id,
-                children=progress_blocks
-            )
-
-            logger.info(f"워크플로우 진행 상황 업데이트 완료: {project_page_id}")
+                },
+                {
+                    "object": "block",
+                    "type": "divider",
+                    "divider": {}
+                }
+            ])
 
-        except Exception as e:
-            logger.error(f"워크플로우 진행 상황 업데이트 오류: {str(e)}")
-            raise
+        return progress_blocks
 
     def get_page_url(self, page_id: str) -> str:
         """페이지 URL 생성"""
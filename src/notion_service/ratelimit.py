@@ -0,0 +1,85 @@
+# notion_service/ratelimit.py
+"""Notion API 요청 속도 제한
+
+Notion은 통합(integration)당 평균 초당 3회 정도를 허용하고 순간적인 burst는 허용한다.
+모든 요청은 하나의 토큰 버킷을 공유하고, 429 응답을 받으면 Retry-After 동안 버킷 전체를 멈춘다.
+"""
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+RATE_LIMITED_CODE = "rate_limited"
+_EPSILON = 1e-9  # 부동소수점 누적 오차로 토큰이 1에 조금 못 미쳐 대기가 반복되지 않도록
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷 - rate(초당 토큰), burst(최대 보유 토큰)"""
+
+    def __init__(self, rate: float = 3.0, burst: int = 10,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """토큰 1개 획득 (필요하면 대기) - 대기한 시간(초) 반환"""
+        waited = 0.0
+        while True:
+            delay = self._take()
+            if delay <= 0:
+                return waited
+            self._sleep(delay)
+            waited += delay
+
+    async def acquire_async(self) -> float:
+        """acquire()의 비동기 버전 - 이벤트 루프를 막지 않고 대기 (동기 요청과 같은 버킷 공유)"""
+        waited = 0.0
+        while True:
+            delay = self._take()
+            if delay <= 0:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def _take(self) -> float:
+        """토큰이 있으면 1개 사용 후 0, 없으면 다시 시도할 때까지 기다릴 시간(초) 반환"""
+        with self._lock:
+            now = self._clock()
+            delay = self._paused_until - now
+            if delay > 0:
+                return delay
+            self._refill(now)
+            if self._tokens >= 1 - _EPSILON:
+                self._tokens = max(0.0, self._tokens - 1)
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def pause(self, seconds: float) -> None:
+        """429 Retry-After - 모든 요청을 seconds 동안 멈추고 burst 없이 재개"""
+        with self._lock:
+            now = self._clock()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = self._paused_until
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Notion 429 응답이면 Retry-After(초), 아니면 None"""
+    if getattr(error, "status", None) != 429 and getattr(error, "code", None) != RATE_LIMITED_CODE:
+        return None
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", headers.get("Retry-After", 1)))
+    except (TypeError, ValueError):
+        return 1.0
@@ -0,0 +1,75 @@
+# notion_service/sync.py
+"""Notion 증분 동기화 매핑 저장소
+
+에픽/스토리/프로젝트(엔티티 키)별로 생성한 Notion 페이지 id와 속성/블록 내용 해시를 SQLite에 기록한다.
+다시 저장할 때 해시를 비교해 바뀐 속성만 pages.update, 바뀐 블록만 수정/교체하고 변경 없는 엔티티는 건너뛴다.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+DEFAULT_SYNC_DB_PATH = "data/notion_sync.sqlite3"
+
+
+def content_hash(value: Any) -> str:
+    """속성/블록 내용 해시 (키 순서와 무관)"""
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:32]
+
+
+class NotionSyncStore:
+    """엔티티 키 → Notion 페이지 id, 속성 해시, 최상위 블록 목록([{"id", "type", "hash"}])
+
+    pages.create 응답에는 함께 만든 블록 id가 없으므로 블록 id는 처음 비교가 필요할 때 조회해 채운다(None 허용).
+    """
+
+    def __init__(self, db_path: str = DEFAULT_SYNC_DB_PATH):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS notion_sync (
+                    entity_key TEXT PRIMARY KEY,
+                    page_id TEXT NOT NULL,
+                    properties_hash TEXT NOT NULL,
+                    blocks TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def get(self, entity_key: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT page_id, properties_hash, blocks, created_at, updated_at FROM notion_sync WHERE entity_key = ?",
+                (entity_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"page_id": row[0], "properties_hash": row[1], "blocks": json.loads(row[2]),
+                "created_at": row[3], "updated_at": row[4]}
+
+    def put(self, entity_key: str, page_id: str, properties_hash: str, blocks: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO notion_sync (entity_key, page_id, properties_hash, blocks, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(entity_key) DO UPDATE SET page_id = excluded.page_id, "
+                "properties_hash = excluded.properties_hash, blocks = excluded.blocks, updated_at = excluded.updated_at",
+                (entity_key, page_id, properties_hash, json.dumps(blocks), now, now)
+            )
+
+    def delete(self, entity_key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM notion_sync WHERE entity_key = ?", (entity_key,))
@@ -0,0 +1,145 @@
+# orchestrator/admission.py
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from utils.metrics import ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTIONS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """워크플로우 실행 거부 (대기열 초과 또는 대기 시간 초과)"""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """동시 실행 워크플로우 수 제한 + 제한된 대기열
+
+    - 동시 실행 수가 max_concurrent 미만이면 즉시 실행
+    - 초과 시 최대 max_queue 개까지 대기, 대기열이 가득 차면 429
+    - 대기 중 요청별 deadline을 넘기면 503
+    - Retry-After는 최근 워크플로우 처리 시간(EWMA)과 대기열 길이로 추정
+    - 비동기 작업/Slack처럼 자체 대기열이 있는 실행 경로는 wait=True로 거부 없이 슬롯을 기다린다
+      (HTTP 대기열 상한/deadline은 적용하지 않지만 동시 실행 수 상한은 모든 경로가 공유)
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_queue: int = 16, queue_timeout: float = 30.0,
+                 default_duration: float = 30.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._avg_duration = default_duration
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        self._background_waiting = 0
+        self._admitted = 0
+        self._completed = 0
+        self._rejected = {"queue_full": 0, "deadline": 0}
+
+    def retry_after(self) -> int:
+        """현재 처리량 기준으로 슬롯이 빌 때까지 예상 시간(초)"""
+        throughput = self.max_concurrent / max(self._avg_duration, 1e-3)
+        return max(1, math.ceil((self._waiting + 1) / throughput))
+
+    def acquire(self, timeout: Optional[float] = None, wait: bool = False) -> float:
+        """실행 슬롯 획득 - 획득 시각(monotonic) 반환 (wait=True면 거부 없이 슬롯이 빌 때까지 대기)"""
+        timeout = self.queue_timeout if timeout is None else timeout
+        with self._cond:
+            if wait:
+                self._background_waiting += 1
+                try:
+                    while self._in_flight >= self.max_concurrent:
+                        self._cond.wait()
+                finally:
+                    self._background_waiting -= 1
+            elif self._in_flight >= self.max_concurrent or self._waiting:
+                if self._waiting >= self.max_queue:
+                    self._rejected["queue_full"] += 1
+                    ADMISSION_REJECTIONS.inc(reason="queue_full")
+                    logger.warning(f"워크플로우 거부 (대기열 초과): 실행 {self._in_flight}, 대기 {self._waiting}")
+                    raise AdmissionRejected(429, "워크플로우 대기열이 가득 찼습니다", self.retry_after())
+
+                deadline = time.monotonic() + timeout
+                self._waiting += 1
+                ADMISSION_QUEUE_DEPTH.set(self._waiting)
+                try:
+                    while self._in_flight >= self.max_concurrent:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._rejected["deadline"] += 1
+                            ADMISSION_REJECTIONS.inc(reason="deadline")
+                            logger.warning(f"워크플로우 거부 (대기 시간 초과 {timeout}초)")
+                            raise AdmissionRejected(503, "워크플로우 대기 시간이 초과되었습니다", self.retry_after())
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+                    ADMISSION_QUEUE_DEPTH.set(self._waiting)
+
+            self._in_flight += 1
+            self._admitted += 1
+        return time.monotonic()
+
+    def release(self, acquired_at: float) -> None:
+        """실행 슬롯 반환 및 처리 시간 반영"""
+        duration = time.monotonic() - acquired_at
+        with self._cond:
+            self._in_flight -= 1
+            self._completed += 1
+            self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None, wait: bool = False) -> Iterator[None]:
+        """acquire/release를 감싼 컨텍스트 매니저"""
+        acquired_at = self.acquire(timeout=timeout, wait=wait)
+        try:
+            yield
+        finally:
+            self.release(acquired_at)
+
+    def stats(self) -> Dict[str, Any]:
+        """대기열 깊이 / 거부 수 등 상태"""
+        with self._cond:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queue_depth": self._waiting,
+                "background_waiting": self._background_waiting,
+                "admitted": self._admitted,
+                "completed": self._completed,
+                "rejected": dict(self._rejected),
+                "avg_duration": round(self._avg_duration, 3),
+                "retry_after": self.retry_after(),
+            }
+
+
+# 싱글톤 인스턴스
+_admission_controller_instance = None
+_admission_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> AdmissionController:
+    """어드미션 컨트롤러 싱글톤 인스턴스 반환 (API, 비동기 작업, Slack 워커 스레드가 공유)"""
+    global _admission_controller_instance
+    if _admission_controller_instance is None:
+        with _admission_controller_lock:
+            if _admission_controller_instance is None:
+                _admission_controller_instance = AdmissionController(
+                    max_concurrent=int(os.getenv("ORCHESTRATOR_MAX_CONCURRENT", "4")),
+                    max_queue=int(os.getenv("ORCHESTRATOR_MAX_QUEUE", "16")),
+                    queue_timeout=float(os.getenv("ORCHESTRATOR_QUEUE_TIMEOUT", "30"))
+                )
+    return _admission_controller_instance
@@ -10,6 +10,7 @@ from story.models import StoryRequest
 from story_point.services import StoryPointEstimationAgent
 from story_point.models import StoryPointRequest
 
+from llm.usage import track_node_usage
 from .state_schema import OrchestratorState
 
 logging.basicConfig(level=logging.INFO)
@@ -42,6 +43,7 @@ def _get_story_point_agent():
     return _story_point_agent
 
 
+@track_node_usage("epic")
 def epic_agent_node(state: OrchestratorState) -> OrchestratorState:
     """Epic 생성 에이전트 노드"""
     step_start = datetime.now()
@@ -110,6 +112,7 @@ def epic_agent_node(state: OrchestratorState) -> OrchestratorState:
         }
 
 
+@track_node_usage("story")
 def story_agent_node(state: OrchestratorState) -> OrchestratorState:
     """Story 생성 에이전트 노드"""
     step_start = datetime.now()
@@ -194,6 +197,7 @@ def story_agent_node(state: OrchestratorState) -> OrchestratorState:
         }
 
 
+@track_node_usage("point")
 def story_point_agent_node(state: OrchestratorState) -> OrchestratorState:
     """Story Point 추정 에이전트 노드"""
     step_start = datetime.now()
@@ -288,5 +292,6 @@ def initialize_node(state: OrchestratorState) -> OrchestratorState:
         "errors": [],
         "execution_start_time": datetime.now(),
         "step_times": {},
+        "token_usage": {},
         "next_action": "analyze"
     }
\ No newline at end of file
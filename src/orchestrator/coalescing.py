@@ -0,0 +1,99 @@
+# orchestrator/coalescing.py
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from utils.metrics import CACHE_HITS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _normalize_text(text: Optional[str]) -> str:
+    """공백 차이만 있는 입력을 같은 요청으로 취급"""
+    return " ".join((text or "").split())
+
+
+def make_request_key(user_input: str, project_info: str = "", options: Optional[Dict[str, Any]] = None) -> str:
+    """정규화된 (user_input, project_info, options)로 요청 키 생성"""
+    payload = json.dumps(
+        [_normalize_text(user_input), _normalize_text(project_info), options or {}],
+        ensure_ascii=False, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class _InFlight:
+    """실행 중인 요청 - 결과를 기다리는 후속 요청들이 공유"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestCoalescer:
+    """동일 요청 병합 (single-flight) 및 완료 결과 단기 재사용"""
+
+    def __init__(self, reuse_window: float = 0.0, max_entries: int = 256):
+        self.reuse_window = reuse_window
+        self.max_entries = max_entries
+        self._in_flight: Dict[str, _InFlight] = {}
+        self._completed: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"executions": 0, "coalesced": 0, "reused": 0}
+
+    def _purge_expired(self, now: float):
+        while self._completed:
+            finished_at, _ = next(iter(self._completed.values()))
+            if now - finished_at <= self.reuse_window and len(self._completed) <= self.max_entries:
+                break
+            self._completed.popitem(last=False)
+
+    def run(self, key: str, func: Callable[[], Any], cacheable: Callable[[Any], bool] = lambda result: True) -> Any:
+        """같은 key로 실행 중인 작업이 있으면 그 결과를 기다리고, 없으면 func 실행"""
+        with self._lock:
+            now = time.monotonic()
+            self._purge_expired(now)
+
+            cached = self._completed.get(key)
+            if cached is not None:
+                self.stats["reused"] += 1
+                CACHE_HITS.inc(cache="workflow_reuse")
+                logger.info(f"완료 결과 재사용: {key[:12]}")
+                return copy.copy(cached[1])
+
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _InFlight()
+                self._in_flight[key] = flight
+                self.stats["executions"] += 1
+            else:
+                self.stats["coalesced"] += 1
+                CACHE_HITS.inc(cache="workflow_coalesced")
+
+        if not leader:
+            logger.info(f"실행 중인 동일 요청에 병합: {key[:12]}")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.copy(flight.result)
+
+        try:
+            flight.result = func()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+                if flight.error is None and self.reuse_window > 0 and cacheable(flight.result):
+                    self._completed[key] = (time.monotonic(), flight.result)
+            flight.done.set()
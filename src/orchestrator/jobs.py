@@ -0,0 +1,362 @@
+# orchestrator/jobs.py
+import json
+import logging
+import os
+import sqlite3
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from pydantic_core import to_jsonable_python
+
+from common.enums import JobStatus
+from utils.tracing import start_trace
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_DB_PATH = "data/jobs.sqlite3"
+
+
+class JobQueueFullError(Exception):
+    """대기열이 가득 차 작업을 받을 수 없음"""
+
+
+class InvalidWebhookError(ValueError):
+    """허용되지 않은 웹훅 URL (http(s)가 아니거나 허용 목록에 없는 호스트)"""
+
+
+# 오케스트레이터가 예외 대신 결과로 돌려주는 실패 상태
+FAILED_RESULT_STATUSES = {"error", "failed"}
+
+
+def _job_outcome(result: Dict[str, Any]) -> Tuple[JobStatus, Optional[str]]:
+    """워크플로우 결과로 작업 상태와 실패 사유 결정"""
+    if result.get("status") not in FAILED_RESULT_STATUSES:
+        return JobStatus.COMPLETED, None
+    errors = result.get("errors") or []
+    return JobStatus.FAILED, "; ".join(str(error) for error in errors) or f"워크플로우 실패 ({result['status']})"
+
+
+class JobStore:
+    """SQLite 기반 작업 상태 저장소 (재시작 후에도 결과 유지)"""
+
+    def __init__(self, db_path: str = DEFAULT_JOB_DB_PATH):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    webhook_url TEXT,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    owner TEXT,
+                    lease_until REAL
+                )
+                """
+            )
+            # 이전 스키마(owner/lease 없음) 마이그레이션
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in (("owner", "TEXT"), ("lease_until", "REAL")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+
+    def create(self, request: Dict[str, Any], webhook_url: Optional[str] = None) -> str:
+        job_id = str(uuid.uuid4())
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, request, webhook_url, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, JobStatus.QUEUED.value, json.dumps(request, ensure_ascii=False), webhook_url,
+                 datetime.now().isoformat())
+            )
+        return job_id
+
+    def claim(self, job_id: str, owner: str, lease: float) -> bool:
+        """대기 작업을 owner의 실행 중 작업으로 가져옴 - 다른 프로세스가 먼저 가져갔으면 False"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, owner = ?, lease_until = ? WHERE id = ? AND status = ?",
+                (JobStatus.RUNNING.value, datetime.now().isoformat(), owner, time.time() + lease, job_id,
+                 JobStatus.QUEUED.value)
+            )
+        return cursor.rowcount == 1
+
+    def renew(self, job_id: str, owner: str, lease: float) -> bool:
+        """실행 중 작업의 lease 연장 - 더 이상 owner의 작업이 아니면 False"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = ? AND owner = ?",
+                (time.time() + lease, job_id, JobStatus.RUNNING.value, owner)
+            )
+        return cursor.rowcount == 1
+
+    def mark_finished(self, job_id: str, status: JobStatus, result: Optional[Dict[str, Any]] = None,
+                      error: Optional[str] = None, owner: Optional[str] = None) -> bool:
+        """작업 종료 기록 - owner가 있으면 해당 owner가 실행 중인 작업일 때만 기록"""
+        sql = "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_until = NULL WHERE id = ?"
+        params = [status.value,
+                  json.dumps(to_jsonable_python(result), ensure_ascii=False) if result is not None else None,
+                  error, datetime.now().isoformat(), job_id]
+        if owner is not None:
+            sql += " AND status = ? AND owner = ?"
+            params += [JobStatus.RUNNING.value, owner]
+        with self._connect() as conn:
+            cursor = conn.execute(sql, params)
+        return cursor.rowcount == 1
+
+    def fail_expired(self, error: str) -> List[str]:
+        """lease가 만료된(실행하던 프로세스가 종료된) 실행 중 작업을 실패 처리 - 처리한 job id 반환"""
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND (lease_until IS NULL OR lease_until < ?)",
+                (JobStatus.RUNNING.value, now)
+            ).fetchall()
+            expired = []
+            for row in rows:
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_until = NULL "
+                    "WHERE id = ? AND status = ? AND (lease_until IS NULL OR lease_until < ?)",
+                    (JobStatus.FAILED.value, error, datetime.now().isoformat(), row["id"],
+                     JobStatus.RUNNING.value, now)
+                )
+                if cursor.rowcount == 1:
+                    expired.append(row["id"])
+        return expired
+
+    def get(self, job_id: str, include_result: bool = False) -> Optional[Dict[str, Any]]:
+        columns = "*" if include_result else "id, status, request, error, webhook_url, created_at, started_at, finished_at"
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {columns} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["request"] = json.loads(job["request"])
+        if include_result and job.get("result"):
+            job["result"] = json.loads(job["result"])
+        return job
+
+    def list_ids(self, statuses: List[JobStatus]) -> List[str]:
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT id FROM jobs WHERE status IN ({placeholders}) ORDER BY created_at",
+                [status.value for status in statuses]
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+
+class JobManager:
+    """오케스트레이터 워크플로우를 제한된 워커 풀에서 비동기 실행
+
+    같은 JOB_DB_PATH를 여러 프로세스가 공유할 수 있다. 작업은 claim()에 성공한 프로세스만 실행하고,
+    실행 중에는 lease를 주기적으로 연장한다. 재시작 시에는 lease가 만료된 작업만 실패 처리한다.
+    웹훅은 http(s)이고 호스트가 webhook_allowed_hosts에 있을 때만 보낸다 (".example.com"은 하위 도메인 허용,
+    목록이 비어 있으면 웹훅 사용 불가).
+    """
+
+    def __init__(self, store: JobStore, max_workers: int = 2, max_queue_size: int = 100,
+                 webhook_timeout: float = 10.0, lease: float = 60.0, webhook_backoff: float = 1.0,
+                 webhook_allowed_hosts: Optional[Iterable[str]] = None):
+        self.store = store
+        self.webhook_allowed_hosts = {host.strip().lower() for host in webhook_allowed_hosts or [] if host.strip()}
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.webhook_timeout = webhook_timeout
+        self.webhook_backoff = webhook_backoff
+        self.lease = lease
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="orchestrator-job")
+        self._callbacks: Dict[str, Callable[[str, Dict[str, Any]], None]] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._recover()
+
+    def _recover(self):
+        """재시작 시 중단된 작업 정리 - lease가 만료된 실행 중 작업은 실패 처리, 대기 작업은 다시 등록
+
+        다른 프로세스가 실행 중인 작업(lease 유효)은 건드리지 않고, 대기 작업은 claim()에 성공한 프로세스만 실행한다.
+        """
+        for job_id in self.store.fail_expired("서버 재시작으로 작업이 중단되었습니다"):
+            logger.info(f"중단된 작업 실패 처리: {job_id}")
+        for job_id in self.store.list_ids([JobStatus.QUEUED]):
+            logger.info(f"대기 작업 재등록: {job_id}")
+            with self._lock:
+                self._pending += 1
+            self._schedule(job_id)
+
+    @property
+    def pending(self) -> int:
+        """대기 + 실행 중인 작업 수"""
+        return self._pending
+
+    def check_webhook_url(self, webhook_url: str) -> None:
+        """웹훅 URL 검증 - 허용되지 않으면 InvalidWebhookError"""
+        parsed = urlparse(webhook_url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise InvalidWebhookError("웹훅 URL은 http(s) 주소여야 합니다")
+        host = parsed.hostname.lower()
+        if host not in self.webhook_allowed_hosts and \
+                not any(allowed.startswith(".") and host.endswith(allowed) for allowed in self.webhook_allowed_hosts):
+            raise InvalidWebhookError(f"허용되지 않은 웹훅 호스트입니다: {host}")
+
+    def submit(self, request: Dict[str, Any], webhook_url: Optional[str] = None,
+               on_complete: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> str:
+        """작업 등록 후 즉시 job id 반환 (웹훅 URL이 허용되지 않으면 InvalidWebhookError)"""
+        if webhook_url:
+            self.check_webhook_url(webhook_url)
+        with self._lock:
+            if self._pending >= self.max_queue_size + self.max_workers:
+                raise JobQueueFullError("작업 대기열이 가득 찼습니다")
+            job_id = self.store.create(request, webhook_url)
+            # 확인과 같은 임계 구역에서 자리 확보 (동시 등록으로 상한을 넘지 않도록)
+            self._pending += 1
+            if on_complete:
+                self._callbacks[job_id] = on_complete
+        self._schedule(job_id)
+        logger.info(f"작업 등록: {job_id}")
+        return job_id
+
+    def _schedule(self, job_id: str):
+        """자리를 확보한(_pending을 늘린) 작업을 워커 풀에 등록"""
+        self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id: str):
+        with start_trace("job.run", job_id=job_id):
+            self._run_job(job_id)
+
+    def _run_job(self, job_id: str):
+        try:
+            job = self.store.get(job_id)
+            if job is None:
+                return
+            if not self.store.claim(job_id, self.owner, self.lease):
+                # 다른 프로세스가 이미 가져간 작업
+                return
+            request = job["request"]
+
+            finished = threading.Event()
+            heartbeat = threading.Thread(target=self._keep_lease, args=(job_id, finished), daemon=True,
+                                         name=f"job-lease-{job_id[:8]}")
+            heartbeat.start()
+            try:
+                from .admission import get_admission_controller
+                from .orchestrator import get_orchestrator
+                # /orchestrator/execute*와 같은 동시 실행 상한 공유 (작업 대기열이 있으므로 거부 없이 대기)
+                with get_admission_controller().slot(wait=True):
+                    result = get_orchestrator().execute(
+                        user_input=request["user_input"],
+                        project_info=request.get("project_info") or "",
+                        options=request.get("options") or {}
+                    )
+                # 오케스트레이터는 파이프라인 실패를 예외 대신 결과 상태(error/failed)로 돌려준다
+                status, error = _job_outcome(result)
+            except Exception as e:
+                logger.error(f"작업 실행 오류 {job_id}: {str(e)}")
+                result = None
+                status = JobStatus.FAILED
+                error = str(e)
+            finally:
+                finished.set()
+                heartbeat.join()
+
+            if not self.store.mark_finished(job_id, status, result=result, error=error, owner=self.owner):
+                logger.warning(f"작업 {job_id}의 lease를 잃어 결과를 기록하지 않습니다")
+                return
+
+            logger.info(f"작업 완료: {job_id} ({status.value})")
+            self._notify(job_id, status, result, job.get("webhook_url"))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _keep_lease(self, job_id: str, finished: threading.Event):
+        """작업이 끝날 때까지 lease의 1/3 주기로 연장"""
+        while not finished.wait(self.lease / 3):
+            if not self.store.renew(job_id, self.owner, self.lease):
+                logger.warning(f"작업 {job_id}의 lease 연장 실패")
+                return
+
+    def _notify(self, job_id: str, status: JobStatus, result: Optional[Dict[str, Any]], webhook_url: Optional[str]):
+        """완료 콜백(프로세스 내) 및 웹훅 호출"""
+        callback = self._callbacks.pop(job_id, None)
+        if callback:
+            try:
+                callback(job_id, {"status": status.value, "result": result})
+            except Exception as e:
+                logger.error(f"작업 완료 콜백 오류 {job_id}: {str(e)}")
+
+        if webhook_url:
+            # 등록 이후 허용 목록이 바뀌었을 수 있으므로 보내기 전에 다시 확인
+            try:
+                self.check_webhook_url(webhook_url)
+            except InvalidWebhookError as e:
+                logger.warning(f"웹훅 전송 생략 {job_id}: {str(e)}")
+                return
+            self._send_webhook(job_id, status, result, webhook_url)
+
+    def _send_webhook(self, job_id: str, status: JobStatus, result: Optional[Dict[str, Any]], webhook_url: str,
+                      retries: int = 3):
+        import httpx
+
+        payload = {
+            "job_id": job_id,
+            "status": status.value,
+            "result_url": f"/orchestrator/jobs/{job_id}/result",
+            "result": to_jsonable_python(result) if result is not None else None,
+        }
+        for attempt in range(1, retries + 1):
+            try:
+                response = httpx.post(webhook_url, json=payload, timeout=self.webhook_timeout)
+                response.raise_for_status()
+                logger.info(f"웹훅 전송 완료: {job_id}")
+                return
+            except Exception as e:
+                logger.warning(f"웹훅 전송 실패 ({attempt}/{retries}) {job_id}: {str(e)}")
+                if attempt < retries:
+                    time.sleep(self.webhook_backoff * 2 ** (attempt - 1))
+        logger.error(f"웹훅 전송 포기: {job_id}")
+
+
+# 싱글톤 인스턴스
+_job_manager_instance = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """작업 매니저 싱글톤 인스턴스 반환"""
+    global _job_manager_instance
+    if _job_manager_instance is None:
+        with _job_manager_lock:
+            if _job_manager_instance is None:
+                _job_manager_instance = JobManager(
+                    JobStore(os.getenv("JOB_DB_PATH", DEFAULT_JOB_DB_PATH)),
+                    max_workers=int(os.getenv("JOB_MAX_WORKERS", "2")),
+                    max_queue_size=int(os.getenv("JOB_MAX_QUEUE_SIZE", "100")),
+                    lease=float(os.getenv("JOB_LEASE_SECONDS", "60")),
+                    webhook_allowed_hosts=os.getenv("JOB_WEBHOOK_ALLOWED_HOSTS", "").split(",")
+                )
+    return _job_manager_instance
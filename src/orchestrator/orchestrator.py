@@ -1,10 +1,18 @@
 # orchestrator/orchestrator.py
+import functools
+import json
 import logging
+import os
 from datetime import datetime
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional
 
 from langgraph.graph import StateGraph, END
 
+from llm.router import use_model_overrides
+from llm.usage import summarize_workflow_usage
+from utils.metrics import NODE_DURATION, WORKFLOW_DURATION, WORKFLOWS_IN_FLIGHT
+from utils.tracing import start_span
+from .coalescing import RequestCoalescer, make_request_key
 from .state_schema import OrchestratorState
 from .query_analyzer import query_analyzer_node
 from .manager import manager_node
@@ -13,12 +21,31 @@ from .agent_nodes import initialize_node, epic_agent_node, story_agent_node, sto
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 진행 상황 콜백(on_progress)을 호출하는 노드
+PROGRESS_NODES = ("analyze", "epic", "story", "point")
+
+# reuse_window 동안 재사용할 결과 상태 (failed/error 결과는 다음 요청에서 다시 실행)
+CACHEABLE_STATUSES = frozenset({"completed", "completed_with_errors"})
+
+
+def _observed_node(node: str, func):
+    """노드 실행을 span으로 기록하고 실행 시간을 workflow_node_duration_seconds 히스토그램에 기록"""
+    @functools.wraps(func)
+    def wrapper(state):
+        with start_span(f"node.{node}", node=node), NODE_DURATION.time(node=node):
+            return func(state)
+    return wrapper
+
 
 class ProjectManagementOrchestrator:
     """LangGraph 기반 프로젝트 관리 오케스트레이터"""
     
-    def __init__(self):
+    def __init__(self, reuse_window: Optional[float] = None):
         self.graph = self._create_graph()
+        # 동일 요청 병합 - 완료 결과 재사용 시간(초), 0이면 실행 중인 요청만 병합
+        if reuse_window is None:
+            reuse_window = float(os.getenv("ORCHESTRATOR_REUSE_WINDOW", "10"))
+        self.coalescer = RequestCoalescer(reuse_window=reuse_window)
         logger.info("프로젝트 관리 오케스트레이터 초기화 완료")
     
     def _create_graph(self) -> StateGraph:
@@ -29,12 +56,12 @@ class ProjectManagementOrchestrator:
         
         # 노드 추가
         workflow.add_node("initialize", initialize_node)
-        workflow.add_node("analyze", query_analyzer_node)
+        workflow.add_node("analyze", _observed_node("analyze", query_analyzer_node))
         workflow.add_node("manager", manager_node)
-        workflow.add_node("epic", epic_agent_node)
-        workflow.add_node("story", story_agent_node)
-        workflow.add_node("point", story_point_agent_node)
-        workflow.add_node("finalize", self._finalize_node)
+        workflow.add_node("epic", _observed_node("epic", epic_agent_node))
+        workflow.add_node("story", _observed_node("story", story_agent_node))
+        workflow.add_node("point", _observed_node("point", story_point_agent_node))
+        workflow.add_node("finalize", _observed_node("finalize", self._finalize_node))
         
         # 진입점 설정
         workflow.set_entry_point("initialize")
@@ -91,6 +118,15 @@ class ProjectManagementOrchestrator:
         execution_time = 0
         if state.get("execution_start_time"):
             execution_time = (datetime.now() - state["execution_start_time"]).total_seconds()
+
+        # 토큰 사용량 (머신 리더블 로그)
+        workflow_usage = summarize_workflow_usage(state.get("token_usage", {}))
+        usage_log = {
+            "workflow_type": state.get("workflow_type", "unknown"),
+            "execution_time": execution_time,
+            **workflow_usage
+        }
+        logger.info(f"workflow_token_usage {json.dumps(usage_log, ensure_ascii=False)}")
         
         return {
             **state,
@@ -99,19 +135,61 @@ class ProjectManagementOrchestrator:
             "execution_time": execution_time
         }
     
-    def execute(self, user_input: str, project_info: str = "") -> Dict[str, Any]:
-        """전체 워크플로우 실행"""
+    def execute(self, user_input: str, project_info: str = "", options: Optional[Dict[str, Any]] = None,
+                on_progress: Optional[Callable[[str, OrchestratorState], None]] = None) -> Dict[str, Any]:
+        """전체 워크플로우 실행
+
+        options:
+            model_overrides: 노드별 모델 강제 지정 (예: {"epic": "gpt-4o"})
+            coalesce: False면 동일 요청 병합/결과 재사용 없이 새로 실행
+        on_progress:
+            analyze/epic/story/point 노드가 끝날 때마다 (노드 이름, 현재 상태)로 호출
+
+        동일한 (user_input, project_info, options) 요청이 동시에 들어오면 한 번만 실행하고
+        결과를 공유하며, 성공한 결과(CACHEABLE_STATUSES)는 완료 후 reuse_window 동안 재사용한다.
+        (병합된 요청은 실행 중인 요청의 결과만 받으며 on_progress는 호출되지 않는다)
+        """
+        options = options or {}
+        if options.get("coalesce") is False:
+            return self._execute(user_input, project_info, options, on_progress)
+
+        return self.coalescer.run(
+            make_request_key(user_input, project_info, options),
+            lambda: self._execute(user_input, project_info, options, on_progress),
+            cacheable=lambda result: result.get("status") in CACHEABLE_STATUSES
+        )
+
+    def _execute(self, user_input: str, project_info: str, options: Dict[str, Any],
+                 on_progress: Optional[Callable[[str, OrchestratorState], None]] = None) -> Dict[str, Any]:
+        """워크플로우 1회 실행 - workflow span으로 감싸고 결과에 trace_id 포함"""
+        with start_span("workflow.execute", user_input=user_input[:100]) as span:
+            result = self._run_workflow(user_input, project_info, options, on_progress)
+            span.set_attribute("status", result["status"])
+        return {**result, "trace_id": span.trace_id}
+
+    def _run_workflow(self, user_input: str, project_info: str, options: Dict[str, Any],
+                      on_progress: Optional[Callable[[str, OrchestratorState], None]] = None) -> Dict[str, Any]:
+        """LangGraph 워크플로우 실행 및 결과 포맷팅"""
         logger.info(f"워크플로우 실행 시작: {user_input}")
 
         try:
             # 초기 상태 설정
             initial_state: OrchestratorState = {
                 "user_input": user_input,
-                "project_info": project_info
+                "project_info": project_info,
+                "options": options
             }
 
             # 워크플로우 실행
-            final_state = self.graph.invoke(initial_state)
+            WORKFLOWS_IN_FLIGHT.inc()
+            try:
+                with WORKFLOW_DURATION.time(), use_model_overrides(options.get("model_overrides")):
+                    if on_progress is None:
+                        final_state = self.graph.invoke(initial_state)
+                    else:
+                        final_state = self._stream_graph(initial_state, on_progress)
+            finally:
+                WORKFLOWS_IN_FLIGHT.dec()
 
             # 결과 포맷팅
             result = self._format_result(final_state)
@@ -130,10 +208,30 @@ class ProjectManagementOrchestrator:
                 "total_story_points": 0,
                 "execution_time": 0,
                 "step_times": {},
+                "token_usage": {},
                 "completed_steps": [],
                 "errors": [str(e)]
             }
 
+    def _stream_graph(self, initial_state: OrchestratorState,
+                      on_progress: Callable[[str, OrchestratorState], None]) -> OrchestratorState:
+        """노드 완료 이벤트를 스트리밍하며 그래프 실행 - 진행 노드마다 on_progress 호출 후 최종 상태 반환"""
+        final_state = initial_state
+        completed_node = None
+        for mode, chunk in self.graph.stream(initial_state, stream_mode=["updates", "values"]):
+            if mode == "updates":
+                completed_node = next(iter(chunk), None)
+                continue
+            final_state = chunk
+            if completed_node in PROGRESS_NODES:
+                try:
+                    on_progress(completed_node, chunk)
+                except Exception as e:
+                    # 진행 상황 알림 실패가 워크플로우를 중단시키지 않도록 함
+                    logger.warning(f"진행 상황 콜백 오류 ({completed_node}): {str(e)}")
+            completed_node = None
+        return final_state
+
     def execute_from_step(self, start_step: str, state_data: Dict[str, Any]) -> Dict[str, Any]:
         """특정 단계부터 워크플로우 실행"""
         logger.info(f"단계별 워크플로우 실행 시작: {start_step}")
@@ -169,6 +267,7 @@ class ProjectManagementOrchestrator:
                 "total_story_points": 0,
                 "execution_time": 0,
                 "step_times": {},
+                "token_usage": {},
                 "completed_steps": [],
                 "errors": [str(e)]
             }
@@ -218,6 +317,7 @@ class ProjectManagementOrchestrator:
                 "total_story_points": 0,
                 "execution_time": 0,
                 "step_times": {},
+                "token_usage": {},
                 "completed_steps": [],
                 "errors": [str(e)]
             }
@@ -226,6 +326,11 @@ class ProjectManagementOrchestrator:
         """저장된 데이터에서 상태 복원"""
         logger.info("상태 복원 중")
 
+        # 응답 형식({"nodes": ..., "total": ...})으로 전달된 사용량은 노드별 값만 복원
+        token_usage = state_data.get("token_usage", {})
+        if "nodes" in token_usage:
+            token_usage = token_usage["nodes"]
+
         # 기본 상태 구조 생성
         restored_state: OrchestratorState = {
             "user_input": state_data.get("user_input", ""),
@@ -240,6 +345,7 @@ class ProjectManagementOrchestrator:
             "errors": state_data.get("errors", []),
             "execution_start_time": datetime.now(),
             "step_times": state_data.get("step_times", {}),
+            "token_usage": token_usage,
             "next_action": target_step or "epic"
         }
 
@@ -335,7 +441,10 @@ class ProjectManagementOrchestrator:
                     for point in story_points:
                         # 동일한 스토리 타이틀과 포인트 ID로 중복 확인
                         point_key = (point.story_title, getattr(point, 'id', id(point)))
-                        if point.story_title == story.title and point_key not in used_story_points:
+                        # 스토리 id가 있는 추정은 id로, 이전 버전 결과는 제목으로 연결
+                        story_id = getattr(point, 'story_id', None)
+                        matches = story_id == story.id if story_id else point.story_title == story.title
+                        if matches and point_key not in used_story_points:
                             epic_story_points.append(point)
                             used_story_points.add(point_key)
             
@@ -348,7 +457,12 @@ class ProjectManagementOrchestrator:
         
         status = "completed"
         if errors:
-            status = "completed_with_errors" if epics or stories or story_points else "failed"
+            # 마지막으로 실행한 요청 단계의 결과가 없으면 실패 (앞 단계의 기본값 에픽만 남은 경우 포함)
+            outputs = {"epic": epics, "story": stories, "point": story_points}
+            completed_steps = state.get("completed_steps") or []
+            executed = [step for step in state.get("required_steps") or [] if step in outputs and step in completed_steps]
+            produced = outputs[executed[-1]] if executed else epics or stories or story_points
+            status = "completed_with_errors" if produced else "failed"
         
         return {
             "status": status,
@@ -359,6 +473,7 @@ class ProjectManagementOrchestrator:
             "total_story_points": len(story_points),
             "execution_time": state.get("execution_time", 0),
             "step_times": state.get("step_times", {}),
+            "token_usage": summarize_workflow_usage(state.get("token_usage", {})),
             "completed_steps": state.get("completed_steps", []),
             "errors": errors
         }
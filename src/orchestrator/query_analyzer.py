@@ -1,11 +1,16 @@
 # orchestrator/query_analyzer.py
 import logging
+import time
 from datetime import datetime
 from typing import List
 
-from langchain_community.chat_models import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 
+from llm.factory import create_chat_model
+from llm.router import select_model
+from llm.usage import record_llm_usage, track_node_usage
+from utils.metrics import LLM_FALLBACKS, LLM_PARSE_FAILURES
+from utils.tracing import start_span
 from .state_schema import OrchestratorState
 
 logging.basicConfig(level=logging.INFO)
@@ -46,6 +51,7 @@ QUERY_ANALYSIS_PROMPT = ChatPromptTemplate.from_template(
 )
 
 
+@track_node_usage("analyze")
 def query_analyzer_node(state: OrchestratorState) -> OrchestratorState:
     """사용자 쿼리를 분석하여 워크플로우 타입을 결정하는 노드"""
     
@@ -53,19 +59,22 @@ def query_analyzer_node(state: OrchestratorState) -> OrchestratorState:
     logger.info("쿼리 분석 시작")
     
     try:
-        # LLM 초기화 (환경 변수에서 API 키 가져와야 함)
-        import os
-        llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.1,
-            api_key=os.getenv("OPENAI_API_KEY")
+        # LLM 초기화 (라우팅 정책상 가장 작은 모델, LLM_BACKEND 설정에 따라 OpenAI 또는 오프라인 백엔드)
+        model, route = select_model("analyze", default="gpt-4o-mini")
+        llm = create_chat_model(
+            "analyze",
+            model=model,
+            temperature=0.1
         )
         
         # 쿼리 분석 실행
         user_input = state["user_input"]
         prompt = QUERY_ANALYSIS_PROMPT.format(user_input=user_input)
         
-        response = llm.invoke(prompt)
+        call_start = time.perf_counter()
+        with start_span("llm.call", node="analyze", model=model, route=route):
+            response = llm.invoke(prompt)
+        record_llm_usage(response, model=model, latency=time.perf_counter() - call_start, route=route)
         analysis_result = response.content
         
         logger.info(f"LLM 분석 결과: {analysis_result}")
@@ -78,6 +87,8 @@ def query_analyzer_node(state: OrchestratorState) -> OrchestratorState:
             required_steps = parsed_result.get("required_steps", ["epic", "story", "point"])
         except json.JSONDecodeError:
             logger.warning("JSON 파싱 실패, 기본값 사용")
+            LLM_PARSE_FAILURES.inc(node="analyze")
+            LLM_FALLBACKS.inc(node="analyze")
             # 간단한 키워드 기반 분석으로 폴백
             workflow_type, required_steps = _fallback_analysis(user_input)
             logger.info(f"폴백 분석 결과: {workflow_type}, {required_steps}")
@@ -99,6 +110,7 @@ def query_analyzer_node(state: OrchestratorState) -> OrchestratorState:
         
     except Exception as e:
         logger.error(f"쿼리 분석 오류: {str(e)}")
+        LLM_FALLBACKS.inc(node="analyze")
         # 오류 발생 시 전체 파이프라인으로 처리
         return {
             **state,
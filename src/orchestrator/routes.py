@@ -1,14 +1,26 @@
 # orchestrator/routes.py
-from fastapi import APIRouter, HTTPException
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException
 from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
 from utils.logger import get_logger
-from .orchestrator import get_orchestrator
+from common.enums import JobStatus
+from llm.router import ModelRoutingPolicy, get_routing_policy, set_routing_policy
+from .admission import AdmissionRejected, get_admission_controller
+from .jobs import InvalidWebhookError, JobQueueFullError, get_job_manager
 
 router = APIRouter(prefix="/orchestrator", tags=["Orchestrator"])
 
+
+def get_orchestrator():
+    """오케스트레이터 (langgraph / 에이전트 import는 첫 사용 시)"""
+    from .orchestrator import get_orchestrator as _get_orchestrator
+    return _get_orchestrator()
+
 logger = get_logger(__name__)
 
 
@@ -17,6 +29,7 @@ class OrchestratorRequest(BaseModel):
     """오케스트레이터 실행 요청"""
     user_input: str = Field(..., description="사용자 입력")
     project_info: Optional[str] = Field("", description="프로젝트 정보")
+    options: Dict[str, Any] = Field(default_factory=dict, description="실행 옵션 (model_overrides: 노드별 모델 지정)")
 
 
 class OrchestratorResponse(BaseModel):
@@ -29,11 +42,26 @@ class OrchestratorResponse(BaseModel):
     total_story_points: int = Field(..., description="총 스토리 포인트 수")
     execution_time: float = Field(..., description="실행 시간(초)")
     step_times: Dict[str, float] = Field(..., description="단계별 실행 시간")
+    token_usage: Dict[str, Any] = Field(default_factory=dict, description="노드별/전체 LLM 토큰 사용량 및 비용")
+    trace_id: Optional[str] = Field(None, description="워크플로우 trace id (TRACE_FILE에서 조회)")
     completed_steps: List[str] = Field(..., description="완료된 단계들")
     errors: List[str] = Field(..., description="에러 목록")
 
 
-@router.post("/execute", response_model=OrchestratorResponse)
+def workflow_slot(x_queue_timeout: Optional[float] = Header(None, description="실행 슬롯 대기 최대 시간(초)")):
+    """동시 실행 워크플로우 수 제한 - 슬롯을 얻지 못하면 429/503 + Retry-After"""
+    controller = get_admission_controller()
+    try:
+        acquired_at = controller.acquire(timeout=x_queue_timeout)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.reason, headers={"Retry-After": str(e.retry_after)})
+    try:
+        yield
+    finally:
+        controller.release(acquired_at)
+
+
+@router.post("/execute", response_model=OrchestratorResponse, dependencies=[Depends(workflow_slot)])
 def execute_workflow(request: OrchestratorRequest):
     """메인 워크플로우 실행 엔드포인트"""
     try:
@@ -45,7 +73,8 @@ def execute_workflow(request: OrchestratorRequest):
         orchestrator = get_orchestrator()
         result = orchestrator.execute(
             user_input=request.user_input,
-            project_info=request.project_info
+            project_info=request.project_info,
+            options=request.options
         )
         
         end_time = datetime.now()
@@ -61,6 +90,74 @@ def execute_workflow(request: OrchestratorRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class JobRequest(OrchestratorRequest):
+    """비동기 작업 등록 요청"""
+    webhook_url: Optional[str] = Field(None, description="작업 완료 시 결과를 POST할 URL")
+
+
+class JobResponse(BaseModel):
+    """비동기 작업 상태 응답"""
+    job_id: str = Field(..., description="작업 ID")
+    status: str = Field(..., description="작업 상태 (queued, running, completed, failed)")
+    created_at: Optional[str] = Field(None, description="등록 시각")
+    started_at: Optional[str] = Field(None, description="실행 시작 시각")
+    finished_at: Optional[str] = Field(None, description="종료 시각")
+    error: Optional[str] = Field(None, description="실패 사유")
+    result_url: Optional[str] = Field(None, description="결과 조회 URL")
+
+
+def _to_job_response(job: Dict[str, Any]) -> JobResponse:
+    return JobResponse(
+        job_id=job["id"],
+        status=job["status"],
+        created_at=job.get("created_at"),
+        started_at=job.get("started_at"),
+        finished_at=job.get("finished_at"),
+        error=job.get("error"),
+        result_url=f"/orchestrator/jobs/{job['id']}/result"
+    )
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+def submit_job(request: JobRequest):
+    """워크플로우를 비동기 작업으로 등록 - 즉시 job id 반환"""
+    manager = get_job_manager()
+    try:
+        job_id = manager.submit(
+            request.model_dump(include={"user_input", "project_info", "options"}),
+            webhook_url=request.webhook_url
+        )
+    except InvalidWebhookError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    logger.info(f"비동기 작업 등록: {job_id}")
+    return _to_job_response(manager.store.get(job_id))
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+def get_job(job_id: str):
+    """비동기 작업 상태 조회"""
+    job = get_job_manager().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _to_job_response(job)
+
+
+@router.get("/jobs/{job_id}/result", response_model=OrchestratorResponse)
+def get_job_result(job_id: str):
+    """완료된 비동기 작업 결과 조회"""
+    job = get_job_manager().store.get(job_id, include_result=True)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == JobStatus.FAILED.value:
+        raise HTTPException(status_code=500, detail=job.get("error") or "Job failed")
+    if job["status"] != JobStatus.COMPLETED.value:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return OrchestratorResponse(**job["result"])
+
+
 @router.get("/health")
 def health_check():
     """오케스트레이터 헬스 체크"""
@@ -77,6 +174,38 @@ def health_check():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/admission")
+def get_admission_stats():
+    """동시 실행 제한 상태 (실행 중 / 대기열 깊이 / 거부 수)"""
+    return get_admission_controller().stats()
+
+
+@router.get("/model-routing", response_model=ModelRoutingPolicy)
+def get_model_routing():
+    """현재 노드별 모델 라우팅 정책 조회"""
+    return get_routing_policy()
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None, description="ORCHESTRATOR_ADMIN_TOKEN 값")):
+    """운영 설정 변경 API 인증 - ORCHESTRATOR_ADMIN_TOKEN이 없으면 변경 API 비활성화"""
+    expected = os.getenv("ORCHESTRATOR_ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=403, detail="ORCHESTRATOR_ADMIN_TOKEN이 설정되지 않아 변경할 수 없습니다")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode("utf-8"), expected.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="관리자 토큰이 올바르지 않습니다")
+
+
+@router.put("/model-routing", response_model=ModelRoutingPolicy, dependencies=[Depends(require_admin_token)])
+def update_model_routing(policy: ModelRoutingPolicy):
+    """노드별 모델 라우팅 정책 변경 (X-Admin-Token 필요)
+
+    요청을 처리한 워커 프로세스에만 적용된다. 여러 워커(uvicorn --workers)에 같은 정책을 쓰려면
+    LLM_ROUTING_POLICY로 설정하거나 워커마다 호출해야 한다.
+    """
+    set_routing_policy(policy)
+    return policy
+
+
 @router.get("/workflow-types")
 def get_workflow_types():
     """지원하는 워크플로우 타입 목록"""
@@ -142,7 +271,7 @@ def test_orchestrator():
         }
 
 
-@router.post("/execute-from-step", response_model=OrchestratorResponse)
+@router.post("/execute-from-step", response_model=OrchestratorResponse, dependencies=[Depends(workflow_slot)])
 def execute_from_step(request: dict):
     """특정 단계부터 워크플로우 실행"""
     try:
@@ -168,7 +297,7 @@ def execute_from_step(request: dict):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/execute-next-step", response_model=OrchestratorResponse)
+@router.post("/execute-next-step", response_model=OrchestratorResponse, dependencies=[Depends(workflow_slot)])
 def execute_next_step(request: dict):
     """현재 상태에서 다음 단계만 실행"""
     try:
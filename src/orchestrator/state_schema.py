@@ -1,5 +1,5 @@
 # orchestrator/state_schema.py
-from typing import TypedDict, Literal, List, Optional, Dict
+from typing import TypedDict, Literal, List, Optional, Dict, Any
 from datetime import datetime
 
 from epic.models import Epic
@@ -13,6 +13,7 @@ class OrchestratorState(TypedDict, total=False):
     # 입력 데이터
     user_input: str
     project_info: Optional[str]
+    options: Dict[str, Any]  # 실행 옵션 (model_overrides 등)
     
     # 분석 결과 (QueryAnalyzer에서 결정)
     workflow_type: Literal["epic_only", "story_only", "point_only", "full_pipeline"]
@@ -31,6 +32,7 @@ class OrchestratorState(TypedDict, total=False):
     # 메타데이터
     execution_start_time: Optional[datetime]
     step_times: Dict[str, float]
+    token_usage: Dict[str, Dict[str, Any]]  # 노드별 LLM 토큰 사용량/비용
     
     # 라우팅 제어
     next_action: Literal["analyze", "epic", "story", "point", "done"]
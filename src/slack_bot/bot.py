@@ -1,9 +1,24 @@
+import asyncio
 import os
-from slack_bolt import App
-from slack_bolt.adapter.fastapi import SlackRequestHandler
+import re
+
+import aiohttp
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.adapter.fastapi.async_handler import AsyncSlackRequestHandler
+from slack_bolt.response import BoltResponse
 from dotenv import load_dotenv
 
 from utils.logger import get_logger
+from utils.metrics import SLACK_DUPLICATES
+from utils.tracing import start_trace
+from .dedupe import delivery_key, get_slack_deduplicator, get_submission_registry, submission_key
+from .export import EXPORT_FORMATS, export_result
+from .outbox import NotionOutboxWorker, get_notion_outbox
+from .progress import SlackProgressReporter
+from .scheduler import get_fair_scheduler
+from .sessions import get_session_store
+from .views import NAV_ACTION_PREFIX, parse_page_value, render_result_views
+from .workers import SlackWorkerBusyError, get_slack_executor
 
 load_dotenv()
 
@@ -19,25 +34,55 @@ logger.info("Initializing Slack bot...")
 logger.info(f"Bot token configured: {'Yes' if os.environ.get('SLACK_BOT_TOKEN') else 'No'}")
 logger.info(f"Signing secret configured: {'Yes' if os.environ.get('SLACK_SIGNING_SECRET') else 'No'}")
 
-# Slack 앱 초기화
-app = App(
+# Slack 앱 초기화 (비동기 - 리스너와 Web API 호출이 이벤트 루프를 블로킹하지 않음)
+app = AsyncApp(
     token=os.environ.get("SLACK_BOT_TOKEN"),
     signing_secret=os.environ.get("SLACK_SIGNING_SECRET"),
 )
 
+
+async def ensure_http_session() -> aiohttp.ClientSession:
+    """Slack Web API 공용 커넥션 풀
+
+    aiohttp 세션은 이벤트 루프 안에서만 만들 수 있으므로 첫 요청 시 생성해 app.client에 연결한다.
+    Bolt가 요청마다 만드는 client도 app.client.session을 그대로 사용하므로 모든 호출이 풀을 공유한다.
+    """
+    if app.client.session is None or app.client.session.closed:
+        app.client.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=int(os.getenv("SLACK_HTTP_POOL_SIZE", "20")))
+        )
+    return app.client.session
+
+
+async def close_http_session():
+    if app.client.session is not None and not app.client.session.closed:
+        await app.client.session.close()
+
+
+@app.middleware
+async def drop_duplicate_deliveries(req, resp, next):
+    """Slack 재전송(X-Slack-Retry-Num)이나 같은 모달의 중복 제출은 리스너 실행 없이 바로 응답"""
+    key = delivery_key(req.body)
+    if key and get_slack_deduplicator().seen(key):
+        retry_num = (req.headers.get("x-slack-retry-num") or [None])[0]
+        logger.info(f"Duplicate Slack delivery dropped: {key} (retry: {retry_num})")
+        SLACK_DUPLICATES.inc(kind="delivery")
+        return BoltResponse(status=200, body="", headers={"x-slack-no-retry": "1"})
+    return await next()
+
 # 메시지 핸들러
 @app.message("hello")
-def message_hello(message, say):
+async def message_hello(message, say):
     """Hello 메시지 응답"""
     user_id = message['user']
     logger.info(f"Hello message received from user: {user_id}")
-    say(f"Hi <@{user_id}>! 프로젝트 관리 봇입니다. `/project` 명령어로 시작해보세요!")
+    await say(f"Hi <@{user_id}>! 프로젝트 관리 봇입니다. `/project` 명령어로 시작해보세요!")
 
 # 슬래시 커맨드 핸들러
 @app.command("/project")
-def handle_project_command(ack, respond, body, client):
+async def handle_project_command(ack, respond, body, client):
     """프로젝트 관리 슬래시 커맨드"""
-    ack()
+    await ack()
     
     user_id = body["user_id"]
     channel_id = body["channel_id"]
@@ -79,7 +124,7 @@ def handle_project_command(ack, respond, body, client):
     
     # respond() 사용으로 권한 문제 해결
     try:
-        respond(
+        await respond(
             blocks=blocks,
             text="프로젝트 관리 메뉴"
         )
@@ -87,20 +132,20 @@ def handle_project_command(ack, respond, body, client):
         logger.error(f"Failed to respond to slash command: {str(e)}")
         # 대안: DM으로 전송 시도
         try:
-            client.chat_postMessage(
+            await client.chat_postMessage(
                 channel=f"@{body['user_name']}",  # 사용자명으로 DM 시도
                 blocks=blocks,
                 text="프로젝트 관리 메뉴"
             )
         except Exception as dm_error:
             logger.error(f"Failed to send DM: {str(dm_error)}")
-            respond("❌ 메시지 전송에 실패했습니다. 봇에게 DM 권한을 부여해주세요.")
+            await respond("❌ 메시지 전송에 실패했습니다. 봇에게 DM 권한을 부여해주세요.")
 
 # 버튼 클릭 핸들러
 @app.action("create_epic_story")
-def handle_create_epic_story(ack, body, client):
+async def handle_create_epic_story(ack, body, client):
     """에픽/스토리 생성 버튼 클릭"""
-    ack()
+    await ack()
     
     user_id = body["user"]["id"]
     channel_id = body["channel"]["id"]
@@ -108,7 +153,7 @@ def handle_create_epic_story(ack, body, client):
     logger.info(f"Create epic/story button clicked - User: {user_id}, Channel: {channel_id}")
     
     # 모달 열기
-    client.views_open(
+    await client.views_open(
         trigger_id=body["trigger_id"],
         view={
             "type": "modal",
@@ -143,12 +188,49 @@ def handle_create_epic_story(ack, body, client):
         }
     )
 
+def _trace_context_block(trace_id: str) -> dict:
+    """메시지 하단에 trace id 표시 (TRACE_FILE에서 조회용)"""
+    return {
+        "type": "context",
+        "elements": [{"type": "mrkdwn", "text": f"trace: `{trace_id}`"}]
+    }
+
+
+def _export_overflow(run_id: str) -> dict:
+    """결과 파일 내보내기 메뉴 (형식별 value: "run_id:형식")"""
+    return {
+        "type": "overflow",
+        "action_id": "export_result",
+        "options": [
+            {"text": {"type": "plain_text", "text": f"📎 {label} 파일로 받기"}, "value": f"{run_id}:{fmt}"}
+            for fmt, (_, label) in EXPORT_FORMATS.items()
+        ]
+    }
+
+
+def _store_result(user_id: str, result: dict) -> str:
+    """결과와 렌더링된 뷰 페이지 저장 후 run id 반환"""
+    store = get_session_store()
+    run_id = store.put(user_id, result)
+    store.put_views(user_id, run_id, render_result_views(result, run_id))
+    return run_id
+
+
+def _load_session(body) -> tuple:
+    """버튼 value의 run id로 분석 결과 조회 (value가 없으면 사용자의 최근 결과) - (run_id, result)"""
+    store = get_session_store()
+    user_id = body["user"]["id"]
+    actions = body.get("actions") or [{}]
+    run_id = actions[0].get("value") or store.latest_run_id(user_id)
+    if run_id is None:
+        return None, None
+    return run_id, store.get(user_id, run_id)
+
+
 # 모달 제출 핸들러
 @app.view("project_input_modal")
-def handle_project_submission(ack, body, client, view):
-    """프로젝트 입력 모달 제출"""
-    ack()
-    
+async def handle_project_submission(ack, body, client, view):
+    """프로젝트 입력 모달 제출 - 분석은 백그라운드 워커에서 실행하고 리스너는 즉시 반환"""
     user_id = body["user"]["id"]
     
     # 입력값 추출
@@ -157,435 +239,415 @@ def handle_project_submission(ack, body, client, view):
     
     logger.info(f"Project analysis request from {user_id}: {description}")
     
-    # DM 채널 열기 및 분석 실행
+    # 같은 사용자의 동일 제출은 실행 중이거나 방금 끝난 분석에 연결
+    submission = submission_key(user_id, description, project_info)
+    existing = get_submission_registry().claim(submission)
+    if existing is not None:
+        await ack()
+        logger.info(f"Duplicate submission from {user_id} attached to {existing['status']} run {existing['run_id']}")
+        SLACK_DUPLICATES.inc(kind="submission")
+        try:
+            get_slack_executor().submit("duplicate_notice", notify_duplicate_submission, client, user_id, existing)
+        except SlackWorkerBusyError:
+            pass
+        return
+    
+    # 공정 스케줄러에 제출 시점 기준으로 등록 (실행 순서는 워크스페이스/사용자별 가중 공정 큐가 결정)
+    team_id = (body.get("team") or {}).get("id") or body["user"].get("team_id", "")
+    scheduler = get_fair_scheduler()
+    ticket = scheduler.enqueue(team_id, user_id)
+    
     try:
-        # DM 채널 열기 시도
-        dm_response = client.conversations_open(users=[user_id])
-        dm_channel = dm_response["channel"]["id"]
-        
-        # 분석 시작 메시지 전송
-        client.chat_postMessage(
-            channel=dm_channel,
-            text="🔄 프로젝트 분석을 시작합니다...",
-            blocks=[
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"🔄 *프로젝트 분석 시작*\n\n**요구사항:**\n{description}\n\n**프로젝트 유형:** {project_info or '미지정'}\n\n분석 중입니다. 잠시만 기다려주세요..."
-                    }
-                }
-            ]
+        get_slack_executor().submit(
+            "project_analysis", run_project_analysis, client, user_id, description, project_info, submission, ticket
         )
-        
-        # 오케스트레이터 호출
-        logger.info(f"Starting orchestrator execution for user {user_id}")
-        logger.debug(f"User input: {description[:100]}...")
-        
-        from orchestrator.orchestrator import get_orchestrator
-        
-        orchestrator = get_orchestrator()
-        result = orchestrator.execute(
-            user_input=description,
-            project_info=project_info
+    except SlackWorkerBusyError:
+        scheduler.release(ticket)
+        get_submission_registry().release(submission)
+        logger.warning(f"Slack worker queue full - rejecting analysis request from {user_id}")
+        await ack(response_action="errors", errors={
+            "project_description": "요청이 많아 지금은 분석을 시작할 수 없습니다. 잠시 후 다시 시도해주세요."
+        })
+        return
+    await ack()
+
+
+async def notify_duplicate_submission(client, user_id: str, existing: dict):
+    """중복 제출 안내 - 실행 중이면 기존 진행 메시지로, 완료됐으면 기존 결과로 안내"""
+    if existing["status"] == "running":
+        await client.chat_postMessage(
+            channel=user_id,
+            text="⏳ 같은 요청을 이미 분석 중입니다. 진행 중인 분석이 끝나면 결과를 보내드립니다."
         )
+        return
+    
+    run_id = existing["run_id"]
+    await client.chat_postMessage(
+        channel=user_id,
+        text="✅ 같은 요청의 분석 결과가 이미 있습니다.",
+        blocks=[
+            {
+                "type": "section",
+                "text": {"type": "mrkdwn", "text": "✅ *같은 요청의 분석 결과가 이미 있습니다*\n\n기존 결과를 확인해주세요:"}
+            },
+            {
+                "type": "actions",
+                "elements": [
+                    {"type": "button", "text": {"type": "plain_text", "text": "📋 에픽 확인하기"},
+                     "action_id": "show_epics", "value": run_id, "style": "primary"},
+                    {"type": "button", "text": {"type": "plain_text", "text": "📝 스토리 확인하기"},
+                     "action_id": "show_stories", "value": run_id},
+                    {"type": "button", "text": {"type": "plain_text", "text": "🔢 포인트 확인하기"},
+                     "action_id": "show_points", "value": run_id}
+                ]
+            }
+        ]
+    )
+
+
+async def run_project_analysis(client, user_id: str, description: str, project_info: str,
+                               submission: str = None, ticket=None):
+    """프로젝트 분석 실행 후 결과를 DM으로 전송 (Slack 작업 실행기에서 실행)
+
+    ticket이 있으면 공정 스케줄러의 실행 차례를 기다린 뒤 분석하고, 끝나면 슬롯을 반납한다.
+    완료되면 같은 제출(submission)을 TTL 동안 이 결과에 연결하고, 실패하면 다시 제출할 수 있게 해제한다.
+    """
+    run_id = None
+    try:
+        run_id = await _analyze_and_report(client, user_id, description, project_info, ticket)
+    finally:
+        if ticket is not None:
+            get_fair_scheduler().release(ticket)
+        if submission:
+            if run_id:
+                get_submission_registry().complete(submission, run_id)
+            else:
+                get_submission_registry().release(submission)
+
+
+async def _analyze_and_report(client, user_id: str, description: str, project_info: str, ticket=None):
+    """분석 실행 및 진행/결과 메시지 전송 - 완료 시 run id 반환"""
+    # DM 채널 열기 및 분석 실행 (제출 단위 trace - trace id는 결과 메시지에 표시)
+    with start_trace("slack.project_submission", user_id=user_id) as span:
+        try:
+            # DM 채널 열기 시도
+            dm_response = await client.conversations_open(users=[user_id])
+            dm_channel = dm_response["channel"]["id"]
         
-        logger.info(f"Orchestrator execution completed - Status: {result['status']}, Epics: {result.get('total_epics', 0)}, Stories: {result.get('total_stories', 0)}")
+            # 실행 차례가 아니면 대기 순번 안내 후 대기
+            if ticket is not None and not ticket.started:
+                scheduler = get_fair_scheduler()
+                position = scheduler.position(ticket)
+                span.set_attribute("queue_position", position)
+                await client.chat_postMessage(
+                    channel=dm_channel,
+                    text=f"⏳ 분석 요청이 대기열에 등록되었습니다. 대기 순번: {position}번째 (앞에 {position - 1}건)"
+                )
+                await scheduler.wait(ticket)
         
-        if result["status"] == "completed":
-            # 분석 결과를 사용자 세션에 저장
-            if not hasattr(app, "user_sessions"):
-                app.user_sessions = {}
-            app.user_sessions[user_id] = result
-            
-            client.chat_postMessage(
+            # 분석 시작 메시지 전송 (이후 노드 완료마다 이 메시지를 갱신)
+            start_message = await client.chat_postMessage(
                 channel=dm_channel,
-                text="✅ 분석이 완료되었습니다!",
+                text="🔄 프로젝트 분석을 시작합니다...",
                 blocks=[
                     {
                         "type": "section",
                         "text": {
                             "type": "mrkdwn",
-                            "text": f"✅ *분석 완료*\n\n📊 **결과 요약:**\n• 에픽: {result['total_epics']}개\n• 스토리: {result['total_stories']}개\n• 스토리 포인트: {result['total_story_points']}개\n• 실행 시간: {result['execution_time']:.1f}초\n\n다음 단계를 선택해주세요:"
+                            "text": f"🔄 *프로젝트 분석 시작*\n\n**요구사항:**\n{description}\n\n**프로젝트 유형:** {project_info or '미지정'}\n\n분석 중입니다. 잠시만 기다려주세요..."
                         }
-                    },
-                    {
-                        "type": "actions",
-                        "elements": [
-                            {
-                                "type": "button",
-                                "text": {
-                                    "type": "plain_text",
-                                    "text": "📋 에픽 확인하기"
-                                },
-                                "action_id": "show_epics",
-                                "style": "primary"
-                            },
-                            {
-                                "type": "button",
-                                "text": {
-                                    "type": "plain_text",
-                                    "text": "📝 스토리 확인하기"
-                                },
-                                "action_id": "show_stories"
-                            },
-                            {
-                                "type": "button",
-                                "text": {
-                                    "type": "plain_text",
-                                    "text": "🔢 포인트 확인하기"
-                                },
-                                "action_id": "show_points"
-                            }
-                        ]
                     }
                 ]
             )
-        else:
-            client.chat_postMessage(
-                channel=dm_channel,
-                text="❌ 분석 중 오류가 발생했습니다.",
-                blocks=[
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"❌ *분석 실패*\n\n**오류:** {', '.join(result.get('errors', ['알 수 없는 오류']))}\n\n다시 시도해주세요."
-                        }
-                    }
-                ]
+        
+            # 오케스트레이터 호출
+            logger.info(f"Starting orchestrator execution for user {user_id}")
+            logger.debug(f"User input: {description[:100]}...")
+        
+            from orchestrator.admission import get_admission_controller
+            from orchestrator.orchestrator import get_orchestrator
+        
+            # 진행 상황 콜백은 워커 스레드에서 호출되므로 chat_update는 이벤트 루프로 넘겨 실행
+            progress = SlackProgressReporter(
+                client, dm_channel, start_message["ts"],
+                header=f"🔄 *프로젝트 분석 진행 중*\n\n**요구사항:**\n{description}\n\n**프로젝트 유형:** {project_info or '미지정'}",
+                min_interval=float(os.getenv("SLACK_PROGRESS_INTERVAL", "1.0")),
+                loop=asyncio.get_running_loop()
             )
+
+            def execute_workflow():
+                try:
+                    # API/비동기 작업과 같은 동시 실행 상한 공유 (공정 스케줄러가 대기열을 관리하므로 거부 없이 대기)
+                    with get_admission_controller().slot(wait=True):
+                        return get_orchestrator().execute(
+                            user_input=description,
+                            project_info=project_info,
+                            on_progress=progress
+                        )
+                finally:
+                    progress.flush()
+
+            # 오케스트레이터는 동기 코드이므로 Slack 워커 스레드에서 실행
+            result = await get_slack_executor().run_blocking(execute_workflow)
+        
+            logger.info(f"Orchestrator execution completed - Status: {result['status']}, Epics: {result.get('total_epics', 0)}, Stories: {result.get('total_stories', 0)}")
+        
+            if result["status"] == "completed":
+                # 분석 결과를 세션 저장소에 저장 (버튼 value로 실행 단위 조회)
+                # 결과 뷰(에픽/스토리/포인트)는 여기서 한 번만 렌더링 - 버튼 클릭은 페이지 조회만 수행
+                run_id = await get_slack_executor().run_blocking(_store_result, user_id, result)
             
-    except Exception as e:
-        logger.error(f"Error in analysis workflow: {str(e)}")
-        # DM 채널이 있으면 DM으로, 없으면 원래 채널로 오류 메시지 전송
-        try:
-            if 'dm_channel' in locals():
-                client.chat_postMessage(
+                await client.chat_postMessage(
                     channel=dm_channel,
-                    text=f"❌ 시스템 오류가 발생했습니다: {str(e)}"
+                    text="✅ 분석이 완료되었습니다!",
+                    blocks=[
+                        {
+                            "type": "section",
+                            "text": {
+                                "type": "mrkdwn",
+                                "text": f"✅ *분석 완료*\n\n📊 **결과 요약:**\n• 에픽: {result['total_epics']}개\n• 스토리: {result['total_stories']}개\n• 스토리 포인트: {result['total_story_points']}개\n• 실행 시간: {result['execution_time']:.1f}초\n\n다음 단계를 선택해주세요:"
+                            }
+                        },
+                        {
+                            "type": "actions",
+                            "elements": [
+                                {
+                                    "type": "button",
+                                    "text": {
+                                        "type": "plain_text",
+                                        "text": "📋 에픽 확인하기"
+                                    },
+                                    "action_id": "show_epics",
+                                    "value": run_id,
+                                    "style": "primary"
+                                },
+                                {
+                                    "type": "button",
+                                    "text": {
+                                        "type": "plain_text",
+                                        "text": "📝 스토리 확인하기"
+                                    },
+                                    "action_id": "show_stories",
+                                    "value": run_id
+                                },
+                                {
+                                    "type": "button",
+                                    "text": {
+                                        "type": "plain_text",
+                                        "text": "🔢 포인트 확인하기"
+                                    },
+                                    "action_id": "show_points",
+                                    "value": run_id
+                                },
+                                _export_overflow(run_id)
+                            ]
+                        },
+                        _trace_context_block(span.trace_id)
+                    ]
                 )
+                return run_id
             else:
-                # DM 채널 열기에 실패한 경우
-                client.chat_postMessage(
-                    channel=body["channel"]["id"], 
-                    text="❌ DM을 열 수 없습니다. 봇에게 DM 권한을 부여하거나 봇과의 대화를 먼저 시작해주세요."
+                await client.chat_postMessage(
+                    channel=dm_channel,
+                    text="❌ 분석 중 오류가 발생했습니다.",
+                    blocks=[
+                        {
+                            "type": "section",
+                            "text": {
+                                "type": "mrkdwn",
+                                "text": f"❌ *분석 실패*\n\n**오류:** {', '.join(result.get('errors', ['알 수 없는 오류']))}\n\n다시 시도해주세요."
+                            }
+                        },
+                        _trace_context_block(span.trace_id)
+                    ]
                 )
-        except Exception as fallback_error:
-            logger.error(f"Failed to send error message: {str(fallback_error)}")
+            
+        except Exception as e:
+            logger.error(f"Error in analysis workflow: {str(e)}")
+            # DM 채널이 있으면 DM으로, 없으면 원래 채널로 오류 메시지 전송
+            try:
+                if 'dm_channel' in locals():
+                    await client.chat_postMessage(
+                        channel=dm_channel,
+                        text=f"❌ 시스템 오류가 발생했습니다: {str(e)} (trace: {span.trace_id})"
+                    )
+                else:
+                    # DM 채널 열기에 실패한 경우 - 사용자 ID로 앱 DM 전송 시도
+                    await client.chat_postMessage(
+                        channel=user_id,
+                        text="❌ DM을 열 수 없습니다. 봇에게 DM 권한을 부여하거나 봇과의 대화를 먼저 시작해주세요."
+                    )
+            except Exception as fallback_error:
+                logger.error(f"Failed to send error message: {str(fallback_error)}")
 
-# 에픽 결과 보기
-@app.action("show_epics")
-def handle_show_epics(ack, body, client):
-    """에픽 결과 표시"""
-    ack()
-    
+def _result_view_page(user_id: str, run_id: str, view: str, page: int):
+    """미리 렌더링된 결과 뷰 페이지 조회 - 뷰가 없는 실행이면 결과에서 한 번 렌더링 후 저장"""
+    store = get_session_store()
+    cached = store.get_view_page(user_id, run_id, view, page)
+    if cached is not None:
+        return cached
+    result = store.get(user_id, run_id)
+    if result is None:
+        return None
+    views = render_result_views(result, run_id)
+    store.put_views(user_id, run_id, views)
+    pages = views.get(view, [])
+    return pages[page] if page < len(pages) else None
+
+
+async def _show_result_view(body, client, view: str):
+    """결과 뷰 첫 페이지를 DM으로 전송"""
     user_id = body["user"]["id"]
     
-    # 사용자 세션에서 결과 가져오기
-    if not hasattr(app, "user_sessions") or user_id not in app.user_sessions:
-        client.chat_postMessage(
+    # 버튼 value의 run id, 없으면 최근 결과
+    actions = body.get("actions") or [{}]
+    run_id = actions[0].get("value") or await asyncio.to_thread(get_session_store().latest_run_id, user_id)
+    page = await asyncio.to_thread(_result_view_page, user_id, run_id, view, 0) if run_id else None
+    if page is None:
+        await client.chat_postMessage(
             channel=user_id,
             text="❌ 분석 결과를 찾을 수 없습니다. 다시 분석을 시작해주세요."
         )
         return
     
-    result = app.user_sessions[user_id]
-    epic_results = result.get("epic_results", [])
-    
-    if not epic_results:
-        client.chat_postMessage(
-            channel=user_id,
-            text="📋 생성된 에픽이 없습니다."
-        )
-        return
-    
-    # 에픽들을 블록으로 구성
-    blocks = [
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"📋 *생성된 에픽 ({len(epic_results)}개)*"
-            }
-        }
-    ]
-    
-    for i, epic_result in enumerate(epic_results, 1):
-        epic = epic_result["epic"]
-        
-        epic_text = f"*{i}. {epic.title}*\n"
-        epic_text += f"📝 {epic.description}\n"
-        epic_text += f"💼 비즈니스 가치: {epic.business_value}\n"
-        epic_text += f"🔥 우선순위: {epic.priority}\n"
-        
-        if epic.acceptance_criteria:
-            epic_text += f"✅ 수용 기준:\n"
-            for criterion in epic.acceptance_criteria[:3]:  # 최대 3개만 표시
-                epic_text += f"  • {criterion}\n"
-        
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": epic_text
-            }
-        })
-        
-        # 구분선 추가 (마지막 에픽 제외)
-        if i < len(epic_results):
-            blocks.append({"type": "divider"})
-    
-    # 액션 버튼 추가
-    blocks.append({
-        "type": "actions",
-        "elements": [
-            {
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "📝 스토리 확인하기"
-                },
-                "action_id": "show_stories"
-            },
-            {
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "✅ 승인 후 노션에 저장"
-                },
-                "action_id": "approve_and_save",
-                "style": "primary"
-            }
-        ]
-    })
-    
-    client.chat_postMessage(
+    await client.chat_postMessage(
         channel=user_id,
-        blocks=blocks,
-        text=f"생성된 에픽 {len(epic_results)}개"
+        blocks=page["blocks"],
+        text=page["text"]
     )
 
+# 에픽 결과 보기
+@app.action("show_epics")
+async def handle_show_epics(ack, body, client):
+    """에픽 결과 표시"""
+    await ack()
+    await _show_result_view(body, client, "epics")
+
 # 스토리 결과 보기
 @app.action("show_stories")
-def handle_show_stories(ack, body, client):
+async def handle_show_stories(ack, body, client):
     """스토리 결과 표시"""
-    ack()
+    await ack()
+    await _show_result_view(body, client, "stories")
+
+# 스토리 포인트 결과 보기
+@app.action("show_points")
+async def handle_show_points(ack, body, client):
+    """스토리 포인트 결과 표시"""
+    await ack()
+    await _show_result_view(body, client, "points")
+
+# 결과 뷰 페이지 이동 (이전/다음)
+@app.action(re.compile(f"^{NAV_ACTION_PREFIX}"))
+async def handle_view_page(ack, body, client):
+    """결과 뷰 페이지 이동 - 기존 메시지를 해당 페이지로 갱신"""
+    await ack()
     
     user_id = body["user"]["id"]
-    
-    if not hasattr(app, "user_sessions") or user_id not in app.user_sessions:
-        client.chat_postMessage(
+    run_id, view, page_number = parse_page_value(body["actions"][0]["value"])
+    page = await asyncio.to_thread(_result_view_page, user_id, run_id, view, page_number)
+    if page is None:
+        await client.chat_postMessage(
             channel=user_id,
             text="❌ 분석 결과를 찾을 수 없습니다. 다시 분석을 시작해주세요."
         )
         return
     
-    result = app.user_sessions[user_id]
-    epic_results = result.get("epic_results", [])
-    
-    blocks = [
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"📝 *생성된 스토리 ({result.get('total_stories', 0)}개)*"
-            }
-        }
-    ]
-    
-    for epic_result in epic_results:
-        epic = epic_result["epic"]
-        stories = epic_result["stories"]
-        
-        if stories:
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*📋 {epic.title}*"
-                }
-            })
-            
-            for story in stories:
-                story_text = f"• *{story.title}*\n"
-                story_text += f"  📝 {story.description}\n"
-                story_text += f"  🏷️ 도메인: {story.domain}\n"
-                
-                if story.acceptance_criteria:
-                    story_text += f"  ✅ 수용기준:\n"
-                    for criterion in story.acceptance_criteria[:2]:  # 최대 2개만 표시
-                        story_text += f"    - {criterion}\n"
-                
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": story_text
-                    }
-                })
-            
-            blocks.append({"type": "divider"})
-    
-    # 액션 버튼 추가
-    blocks.append({
-        "type": "actions",
-        "elements": [
-            {
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "🔢 포인트 확인하기"
-                },
-                "action_id": "show_points"
-            },
-            {
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "✅ 승인 후 노션에 저장"
-                },
-                "action_id": "approve_and_save",
-                "style": "primary"
-            }
-        ]
-    })
-    
-    client.chat_postMessage(
-        channel=user_id,
-        blocks=blocks,
-        text=f"생성된 스토리 {result.get('total_stories', 0)}개"
+    await client.chat_update(
+        channel=body["channel"]["id"],
+        ts=body["message"]["ts"],
+        blocks=page["blocks"],
+        text=page["text"]
     )
 
-# 스토리 포인트 결과 보기
-@app.action("show_points")
-def handle_show_points(ack, body, client):
-    """스토리 포인트 결과 표시"""
-    ack()
+# 결과 파일로 내보내기
+@app.action("export_result")
+async def handle_export_result(ack, body, client):
+    """선택한 형식의 결과 파일을 업로드 (렌더링/업로드는 백그라운드 워커에서 실행)"""
+    await ack()
     
     user_id = body["user"]["id"]
+    run_id, fmt = body["actions"][0]["selected_option"]["value"].rsplit(":", 1)
+    channel_id = (body.get("channel") or {}).get("id")
     
-    if not hasattr(app, "user_sessions") or user_id not in app.user_sessions:
-        client.chat_postMessage(
+    try:
+        get_slack_executor().submit("result_export", upload_result_file, client, user_id, channel_id, run_id, fmt)
+    except SlackWorkerBusyError:
+        await client.chat_postMessage(
+            channel=user_id,
+            text="⏳ 요청이 많아 지금은 파일을 만들 수 없습니다. 잠시 후 다시 시도해주세요."
+        )
+
+
+async def upload_result_file(client, user_id: str, channel_id: str, run_id: str, fmt: str):
+    """분석 결과 전체를 파일 하나로 렌더링해 한 번에 업로드 (요약 메시지에 파일 첨부)"""
+    result = await asyncio.to_thread(get_session_store().get, user_id, run_id)
+    if result is None:
+        await client.chat_postMessage(
             channel=user_id,
             text="❌ 분석 결과를 찾을 수 없습니다. 다시 분석을 시작해주세요."
         )
         return
     
-    result = app.user_sessions[user_id]
-    epic_results = result.get("epic_results", [])
-    
-    total_points = 0
-    blocks = [
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"🔢 *스토리 포인트 추정 결과*"
-            }
-        }
-    ]
-    
-    displayed_stories = set()  # 중복 표시 방지
-    
-    for epic_result in epic_results:
-        epic = epic_result["epic"]
-        story_points = epic_result["story_points"]
+    path = None
+    try:
+        # 파일 렌더링은 행 단위 스트리밍 - 워커 스레드에서 임시 파일로 작성
+        path, filename, rows = await get_slack_executor().run_blocking(
+            export_result, result, fmt, basename=f"project_analysis_{run_id}"
+        )
+        if not channel_id:
+            dm_response = await client.conversations_open(users=[user_id])
+            channel_id = dm_response["channel"]["id"]
         
-        if story_points:
-            # 중복 제거된 스토리 포인트만 계산
-            unique_story_points = []
-            for sp in story_points:
-                if sp.story_title not in displayed_stories:
-                    unique_story_points.append(sp)
-                    displayed_stories.add(sp.story_title)
-            
-            if unique_story_points:  # 유니크한 스토리 포인트가 있을 때만 표시
-                epic_points = sum(sp.estimated_point for sp in unique_story_points)
-                total_points += epic_points
-                
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"*📋 {epic.title}* - 총 {epic_points} 포인트"
-                    }
-                })
-                
-                for sp in unique_story_points:
-                    point_text = f"• *{sp.story_title}*: {sp.estimated_point} 포인트\n"
-                    point_text += f"  📊 복잡도: {sp.complexity_factors}\n"
-                    point_text += f"  🎯 신뢰도: {sp.confidence_level}\n"
-                    point_text += f"  💭 추정 근거: {sp.reasoning[:100]}..."
-                    
-                    blocks.append({
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": point_text
-                        }
-                    })
-                
-                blocks.append({"type": "divider"})
-    
-    # 총 포인트 요약
-    blocks.insert(1, {
-        "type": "section",
-        "text": {
-            "type": "mrkdwn",
-            "text": f"📊 *전체 프로젝트 예상 포인트: {total_points} 포인트*"
-        }
-    })
-    
-    # 액션 버튼 추가
-    blocks.append({
-        "type": "actions",
-        "elements": [
-            {
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "📋 에픽 다시 보기"
-                },
-                "action_id": "show_epics"
-            },
-            {
-                "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "✅ 승인 후 노션에 저장"
-                },
-                "action_id": "approve_and_save",
-                "style": "primary"
-            }
-        ]
-    })
-    
-    client.chat_postMessage(
-        channel=user_id,
-        blocks=blocks,
-        text=f"스토리 포인트 추정 완료 - 총 {total_points} 포인트"
-    )
+        label = EXPORT_FORMATS[fmt][1]
+        await client.files_upload_v2(
+            channel=channel_id,
+            file=path,
+            filename=filename,
+            title=f"프로젝트 분석 결과 ({label})",
+            initial_comment=(
+                f"📎 *분석 결과 파일 ({label})*\n"
+                f"• 에픽: {result.get('total_epics', 0)}개\n"
+                f"• 스토리: {result.get('total_stories', 0)}개 ({rows}행)\n"
+                f"• 스토리 포인트: {result.get('total_story_points', 0)}개"
+            )
+        )
+        logger.info(f"Uploaded {fmt} export of run {run_id} for user {user_id} ({rows} rows)")
+    except Exception as e:
+        logger.error(f"Failed to export result file: {str(e)}")
+        await client.chat_postMessage(
+            channel=user_id,
+            text=f"❌ 결과 파일 생성 중 오류가 발생했습니다: {str(e)}"
+        )
+    finally:
+        if path:
+            os.remove(path)
 
 # 노션에 저장하기
 @app.action("approve_and_save")
-def handle_approve_and_save(ack, body, client):
+async def handle_approve_and_save(ack, body, client):
     """승인 후 노션에 저장"""
-    ack()
+    await ack()
     
     user_id = body["user"]["id"]
     
-    if not hasattr(app, "user_sessions") or user_id not in app.user_sessions:
-        client.chat_postMessage(
+    run_id, result = await asyncio.to_thread(_load_session, body)
+    if result is None:
+        await client.chat_postMessage(
             channel=user_id,
             text="❌ 분석 결과를 찾을 수 없습니다. 다시 분석을 시작해주세요."
         )
         return
     
-    result = app.user_sessions[user_id]
     
-    # 노션 저장 진행 메시지
-    client.chat_postMessage(
+    # 저장 작업은 outbox에 기록만 하고 바로 반환 (백그라운드 워커가 처리 후 결과를 DM으로 전송)
+    job_id = await asyncio.to_thread(get_notion_outbox().enqueue, user_id, run_id, result)
+    logger.info(f"Notion save job {job_id} queued for user {user_id} (run {run_id})")
+    
+    worker = start_outbox_worker()
+    worker.wake()
+    
+    await client.chat_postMessage(
         channel=user_id,
         text="🔄 노션에 프로젝트 페이지를 생성하고 있습니다...",
         blocks=[
@@ -593,84 +655,132 @@ def handle_approve_and_save(ack, body, client):
                 "type": "section",
                 "text": {
                     "type": "mrkdwn",
-                    "text": "🔄 *노션 페이지 생성 중*\n\n분석 결과를 노션에 저장하고 있습니다. 잠시만 기다려주세요..."
+                    "text": "🔄 *노션 페이지 생성 중*\n\n분석 결과를 노션에 저장하고 있습니다. 완료되면 페이지 링크를 보내드립니다."
                 }
             }
         ]
     )
-    
-    try:
-        from notion_service import get_notion_service
-        
-        notion_service = get_notion_service()
-        
-        # 프로젝트 데이터 준비
-        project_data = {
-            "project_name": "AI 분석 프로젝트",
-            "epic_results": result.get("epic_results", []),
-            "total_stories": result.get("total_stories", 0),
-            "total_story_points": result.get("total_story_points", 0),
-            "execution_time": result.get("execution_time", 0)
-        }
-        
-        # 노션 페이지 생성
-        page_id = notion_service.create_project_page(project_data)
-        page_url = notion_service.get_page_url(page_id)
-        
-        # 성공 메시지
-        client.chat_postMessage(
-            channel=user_id,
-            text="✅ 노션 페이지가 성공적으로 생성되었습니다!",
-            blocks=[
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"✅ *노션 페이지 생성 완료*\n\n프로젝트 분석 결과가 노션에 저장되었습니다!\n\n📊 **저장된 내용:**\n• 에픽: {result.get('total_epics', 0)}개\n• 스토리: {result.get('total_stories', 0)}개\n• 스토리 포인트: {result.get('total_story_points', 0)}개"
-                    }
-                },
-                {
-                    "type": "actions",
-                    "elements": [
-                        {
-                            "type": "button",
-                            "text": {
-                                "type": "plain_text",
-                                "text": "📄 노션 페이지 열기"
-                            },
-                            "url": page_url,
-                            "style": "primary"
-                        },
-                        {
-                            "type": "button",
-                            "text": {
-                                "type": "plain_text",
-                                "text": "🆕 새 프로젝트 시작"
-                            },
-                            "action_id": "create_epic_story"
-                        }
-                    ]
+
+
+async def save_to_notion(job: dict) -> str:
+    """outbox 작업 처리 - 분석 결과를 노션에 저장 후 페이지 링크를 DM으로 전송, 페이지 id 반환
+
+    같은 실행(run_id)을 다시 저장하면 기존 노션 페이지에서 바뀐 내용만 갱신한다.
+    """
+    from notion_service import get_async_notion_service
+    
+    user_id = job["user_id"]
+    result = job["result"]
+    notion_service = get_async_notion_service()
+    
+    # 프로젝트 데이터 준비
+    project_data = {
+        "project_name": "AI 분석 프로젝트",
+        "run_id": job["run_id"],
+        "epic_results": result.get("epic_results", []),
+        "total_stories": result.get("total_stories", 0),
+        "total_story_points": result.get("total_story_points", 0),
+        "execution_time": result.get("execution_time", 0)
+    }
+    
+    # 노션 페이지 생성 (비동기 Notion 클라이언트 - 워커 스레드를 점유하지 않음)
+    page_id = await notion_service.create_project_page(project_data)
+    page_url = notion_service.get_page_url(page_id)
+    
+    # 성공 메시지
+    await app.client.chat_postMessage(
+        channel=user_id,
+        text="✅ 노션 페이지가 성공적으로 생성되었습니다!",
+        blocks=[
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"✅ *노션 페이지 생성 완료*\n\n프로젝트 분석 결과가 노션에 저장되었습니다!\n\n📊 **저장된 내용:**\n• 에픽: {result.get('total_epics', 0)}개\n• 스토리: {result.get('total_stories', 0)}개\n• 스토리 포인트: {result.get('total_story_points', 0)}개"
                 }
-            ]
-        )
-        
-        logger.info(f"Successfully created Notion page {page_id} for user {user_id}")
-        
-    except Exception as e:
-        logger.error(f"Failed to create Notion page: {str(e)}")
-        client.chat_postMessage(
-            channel=user_id,
-            text="❌ 노션 페이지 생성 중 오류가 발생했습니다.",
-            blocks=[
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"❌ *노션 페이지 생성 실패*\n\n**오류:** {str(e)}\n\n환경 변수 설정을 확인해주세요:\n• `NOTION_TOKEN`: 노션 integration 토큰\n• `NOTION_DATABASE_ID`: 저장할 데이터베이스 ID"
+            },
+            {
+                "type": "actions",
+                "elements": [
+                    {
+                        "type": "button",
+                        "text": {
+                            "type": "plain_text",
+                            "text": "📄 노션 페이지 열기"
+                        },
+                        "url": page_url,
+                        "style": "primary"
+                    },
+                    {
+                        "type": "button",
+                        "text": {
+                            "type": "plain_text",
+                            "text": "🆕 새 프로젝트 시작"
+                        },
+                        "action_id": "create_epic_story"
                     }
+                ]
+            }
+        ]
+    )
+    
+    logger.info(f"Successfully created Notion page {page_id} for user {user_id}")
+    return page_id
+
+
+async def notify_notion_save_failed(job: dict, error: Exception):
+    """재시도를 모두 실패한 outbox 작업 - 오류를 DM으로 전송"""
+    logger.error(f"Failed to create Notion page (job {job['id']}): {str(error)}")
+    await app.client.chat_postMessage(
+        channel=job["user_id"],
+        text="❌ 노션 페이지 생성 중 오류가 발생했습니다.",
+        blocks=[
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"❌ *노션 페이지 생성 실패*\n\n**오류:** {str(error)}\n\n환경 변수 설정을 확인해주세요:\n• `NOTION_TOKEN`: 노션 integration 토큰\n• `NOTION_DATABASE_ID`: 저장할 데이터베이스 ID"
                 }
-            ]
+            }
+        ]
+    )
+
+
+# Notion 저장 outbox 워커 (프로세스당 1개)
+outbox_worker = None
+
+
+def start_outbox_worker() -> NotionOutboxWorker:
+    """outbox 워커 시작 (이벤트 루프 안에서 호출, 이미 실행 중이면 그대로 반환)"""
+    global outbox_worker
+    if outbox_worker is None:
+        outbox_worker = NotionOutboxWorker(
+            get_notion_outbox(), save_to_notion, on_failed=notify_notion_save_failed,
+            batch_size=int(os.getenv("NOTION_OUTBOX_BATCH_SIZE", "5")),
+            poll_interval=float(os.getenv("NOTION_OUTBOX_POLL_INTERVAL", "5"))
         )
+    outbox_worker.start()
+    return outbox_worker
+
+
+async def stop_outbox_worker():
+    if outbox_worker is not None:
+        await outbox_worker.stop()
+
+
+async def start_background_workers():
+    """서버 기동 시 - 재시작 전에 남은 outbox 작업도 Slack 요청을 기다리지 않고 처리"""
+    await ensure_http_session()
+    start_outbox_worker()
+
+class PooledSlackRequestHandler(AsyncSlackRequestHandler):
+    """요청 처리 전에 공용 커넥션 풀을 연결하는 FastAPI 어댑터"""
+
+    async def handle(self, req, addition_context_properties=None):
+        await ensure_http_session()
+        start_outbox_worker()
+        return await super().handle(req, addition_context_properties)
+
 
 # FastAPI 어댑터
-handler = SlackRequestHandler(app)
\ No newline at end of file
+handler = PooledSlackRequestHandler(app)
\ No newline at end of file
@@ -0,0 +1,196 @@
+# slack_bot/dedupe.py
+"""Slack 이벤트/인터랙션 중복 제거
+
+- 전달 단위: Slack 재전송(X-Slack-Retry-Num)이나 같은 모달의 중복 제출은 event_id / view id+hash /
+  trigger_id가 같으므로 TTL 동안 기억해 두었다가 리스너 실행 없이 바로 응답한다.
+- 제출 내용 단위: 같은 사용자가 같은 요구사항을 다시 제출하면 새 분석을 시작하지 않고 실행 중이거나
+  방금 끝난 분석에 연결한다.
+
+키는 SQLite에 만료 시각과 함께 저장되어 모든 워커 프로세스가 공유한다 (재전송이 다른 워커로 가도 걸러지도록).
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from orchestrator.coalescing import make_request_key
+
+DEFAULT_DEDUPE_DB_PATH = "data/slack_dedupe.sqlite3"
+
+
+def delivery_key(body: Dict[str, Any]) -> Optional[str]:
+    """Slack 요청 본문에서 전달 단위 식별 키 추출 (재전송 시 동일)"""
+    if body.get("event_id"):
+        return f"event:{body['event_id']}"
+    view = body.get("view") or {}
+    if body.get("type") == "view_submission" and view.get("id"):
+        return f"view:{view['id']}:{view.get('hash', '')}"
+    if body.get("trigger_id"):
+        return f"trigger:{body['trigger_id']}"
+    return None
+
+
+def submission_key(user_id: str, description: str, project_info: str) -> str:
+    """사용자 + 정규화된 입력 내용 해시"""
+    return f"{user_id}:{make_request_key(description, project_info or '', {})}"
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    # 확인과 기록 사이에 다른 워커가 끼어들지 않도록 쓰기 트랜잭션을 바로 시작
+    conn.execute("BEGIN IMMEDIATE")
+    return conn
+
+
+def _prepare_db_path(db_path: str):
+    if os.path.dirname(db_path):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+
+class SlackDeduplicator:
+    """TTL 동안 처리한 전달 키를 기억 (SQLite - 워커 프로세스 간 공유, 만료된 키는 조회 시 삭제)"""
+
+    def __init__(self, db_path: str = DEFAULT_DEDUPE_DB_PATH, ttl: float = 300.0,
+                 clock: Callable[[], float] = time.time):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._clock = clock
+        _prepare_db_path(db_path)
+        self._init_db()
+
+    def _init_db(self):
+        conn = _connect(self.db_path)
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS slack_deliveries (
+                    key TEXT PRIMARY KEY,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_slack_deliveries_expires ON slack_deliveries (expires_at)")
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def seen(self, key: str) -> bool:
+        """이미 처리한 키면 True, 처음이면 기록 후 False"""
+        now = self._clock()
+        conn = _connect(self.db_path)
+        try:
+            conn.execute("DELETE FROM slack_deliveries WHERE expires_at <= ?", (now,))
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO slack_deliveries (key, expires_at) VALUES (?, ?)", (key, now + self.ttl)
+            ).rowcount
+            conn.execute("COMMIT")
+            return inserted == 0
+        finally:
+            conn.close()
+
+
+class SubmissionRegistry:
+    """같은 사용자의 동일 제출을 실행 중이거나 최근(TTL) 완료된 분석에 연결 (SQLite - 워커 프로세스 간 공유)
+
+    실행 중 항목은 running_ttl이 지나면 만료된다 (분석 도중 종료된 워커의 제출이 영구히 막히지 않도록).
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DEDUPE_DB_PATH, ttl: float = 300.0, running_ttl: float = 3600.0,
+                 clock: Callable[[], float] = time.time):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.running_ttl = running_ttl
+        self._clock = clock
+        _prepare_db_path(db_path)
+        self._init_db()
+
+    def _init_db(self):
+        conn = _connect(self.db_path)
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS slack_submissions (
+                    key TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    run_id TEXT,
+                    expires_at REAL NOT NULL,
+                    duplicates INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_slack_submissions_expires ON slack_submissions (expires_at)")
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def claim(self, key: str) -> Optional[Dict[str, Any]]:
+        """새 제출이면 실행 중으로 등록하고 None, 중복이면 기존 항목({"status", "run_id", ...}) 반환"""
+        now = self._clock()
+        conn = _connect(self.db_path)
+        try:
+            conn.execute("DELETE FROM slack_submissions WHERE expires_at <= ?", (now,))
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO slack_submissions (key, status, expires_at) VALUES (?, 'running', ?)",
+                (key, now + self.running_ttl)
+            ).rowcount
+            if inserted:
+                conn.execute("COMMIT")
+                return None
+            conn.execute("UPDATE slack_submissions SET duplicates = duplicates + 1 WHERE key = ?", (key,))
+            status, run_id, expires_at, duplicates = conn.execute(
+                "SELECT status, run_id, expires_at, duplicates FROM slack_submissions WHERE key = ?", (key,)
+            ).fetchone()
+            conn.execute("COMMIT")
+            return {"status": status, "run_id": run_id, "expires_at": expires_at, "duplicates": duplicates}
+        finally:
+            conn.close()
+
+    def complete(self, key: str, run_id: Optional[str]) -> None:
+        """완료 - TTL 동안 같은 제출은 이 결과로 연결"""
+        conn = _connect(self.db_path)
+        try:
+            conn.execute(
+                "UPDATE slack_submissions SET status = 'completed', run_id = ?, expires_at = ? WHERE key = ?",
+                (run_id, self._clock() + self.ttl, key)
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def release(self, key: str) -> None:
+        """실패 등으로 결과가 없을 때 - 다시 제출할 수 있도록 제거"""
+        conn = _connect(self.db_path)
+        try:
+            conn.execute("DELETE FROM slack_submissions WHERE key = ?", (key,))
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+
+# 싱글톤 인스턴스
+_slack_deduplicator_instance = None
+_submission_registry_instance = None
+_dedupe_lock = threading.Lock()
+
+
+def get_slack_deduplicator() -> SlackDeduplicator:
+    """Slack 전달 중복 제거기 싱글톤 인스턴스 반환"""
+    global _slack_deduplicator_instance
+    if _slack_deduplicator_instance is None:
+        with _dedupe_lock:
+            if _slack_deduplicator_instance is None:
+                _slack_deduplicator_instance = SlackDeduplicator(
+                    os.getenv("SLACK_DEDUPE_DB_PATH", DEFAULT_DEDUPE_DB_PATH),
+                    ttl=float(os.getenv("SLACK_DEDUPE_TTL", "300"))
+                )
+    return _slack_deduplicator_instance
+
+
+def get_submission_registry() -> SubmissionRegistry:
+    """Slack 제출 등록부 싱글톤 인스턴스 반환"""
+    global _submission_registry_instance
+    if _submission_registry_instance is None:
+        with _dedupe_lock:
+            if _submission_registry_instance is None:
+                _submission_registry_instance = SubmissionRegistry(
+                    os.getenv("SLACK_DEDUPE_DB_PATH", DEFAULT_DEDUPE_DB_PATH),
+                    ttl=float(os.getenv("SLACK_DEDUPE_TTL", "300"))
+                )
+    return _submission_registry_instance
@@ -0,0 +1,125 @@
+# slack_bot/export.py
+"""분석 결과 파일 내보내기 (CSV / Markdown / XLSX)
+
+큰 프로젝트는 Block Kit 메시지 여러 개 대신 스토리 1건 = 1행인 파일 하나로 전달한다.
+행은 epic_results를 순회하며 하나씩 만들어 바로 파일에 쓰므로 스토리 수와 관계없이 메모리 사용량이 일정하다.
+"""
+import csv
+import os
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from story_point.models import StoryPointIndex
+
+# 형식: (파일 확장자, 표시 이름)
+EXPORT_FORMATS = {
+    "csv": (".csv", "CSV"),
+    "md": (".md", "Markdown"),
+    "xlsx": (".xlsx", "Excel"),
+}
+
+COLUMNS = [
+    "에픽", "에픽 우선순위", "스토리", "도메인", "스토리 설명", "수용 기준",
+    "스토리 포인트", "신뢰도", "복잡도 요소", "추정 근거",
+]
+
+
+class ExportError(Exception):
+    """지원하지 않는 형식이거나 내보내기에 필요한 패키지가 없음"""
+
+
+def iter_export_rows(result: Dict[str, Any]) -> Iterator[List[Any]]:
+    """스토리 단위 행 생성 - 포인트는 같은 에픽의 추정 결과에서 스토리 id로 연결 (id 없는 이전 결과는 제목)"""
+    for epic_result in result.get("epic_results", []):
+        epic = epic_result["epic"]
+        points = StoryPointIndex(epic_result.get("story_points", []))
+        for story in epic_result.get("stories", []):
+            point = points.get(story)
+            yield [
+                epic.title,
+                epic.priority,
+                story.title,
+                story.domain or "",
+                story.description,
+                " / ".join(story.acceptance_criteria),
+                point.estimated_point if point else "",
+                point.confidence_level if point else "",
+                ", ".join(point.complexity_factors) if point else "",
+                point.reasoning if point else "",
+            ]
+
+
+def write_csv(result: Dict[str, Any], fp: TextIO) -> int:
+    """CSV로 쓰기 - 쓴 행 수 반환"""
+    writer = csv.writer(fp)
+    writer.writerow(COLUMNS)
+    count = 0
+    for row in iter_export_rows(result):
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def _md_cell(value: Any) -> str:
+    return str(value).replace("|", "\\|").replace("\r", "").replace("\n", "<br>")
+
+
+def write_markdown(result: Dict[str, Any], fp: TextIO) -> int:
+    """Markdown 표로 쓰기 (에픽별 섹션) - 쓴 행 수 반환"""
+    fp.write("# 프로젝트 분석 결과\n\n")
+    fp.write(f"- 에픽: {result.get('total_epics', 0)}개\n")
+    fp.write(f"- 스토리: {result.get('total_stories', 0)}개\n")
+    fp.write(f"- 스토리 포인트: {result.get('total_story_points', 0)}개\n")
+
+    columns = COLUMNS[2:]  # 에픽 정보는 섹션 제목으로
+    current_epic = None
+    count = 0
+    for row in iter_export_rows(result):
+        if row[0] != current_epic:
+            current_epic = row[0]
+            fp.write(f"\n## {_md_cell(row[0])} (우선순위: {_md_cell(row[1])})\n\n")
+            fp.write("| " + " | ".join(columns) + " |\n")
+            fp.write("|" + "---|" * len(columns) + "\n")
+        fp.write("| " + " | ".join(_md_cell(value) for value in row[2:]) + " |\n")
+        count += 1
+    return count
+
+
+def write_xlsx(result: Dict[str, Any], path: str) -> int:
+    """XLSX로 쓰기 (openpyxl write-only 모드 - 행을 바로 파일로 내보냄) - 쓴 행 수 반환"""
+    try:
+        from openpyxl import Workbook
+    except ImportError as e:
+        raise ExportError("XLSX 내보내기에는 openpyxl 패키지가 필요합니다") from e
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("스토리")
+    sheet.append(COLUMNS)
+    count = 0
+    for row in iter_export_rows(result):
+        sheet.append(row)
+        count += 1
+    workbook.save(path)
+    return count
+
+
+def export_result(result: Dict[str, Any], fmt: str, directory: Optional[str] = None,
+                  basename: str = "project_analysis") -> Tuple[str, str, int]:
+    """결과를 임시 파일로 내보내기 - (파일 경로, 업로드 파일명, 행 수) 반환 (파일 삭제는 호출자 책임)"""
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"지원하지 않는 내보내기 형식입니다: {fmt}")
+    suffix = EXPORT_FORMATS[fmt][0]
+    fd, path = tempfile.mkstemp(prefix="slack_export_", suffix=suffix, dir=directory)
+    try:
+        if fmt == "xlsx":
+            os.close(fd)
+            count = write_xlsx(result, path)
+        else:
+            # CSV는 Excel에서 한글이 깨지지 않도록 BOM 포함
+            encoding = "utf-8-sig" if fmt == "csv" else "utf-8"
+            with open(fd, "w", encoding=encoding, newline="") as fp:
+                count = write_csv(result, fp) if fmt == "csv" else write_markdown(result, fp)
+    except Exception:
+        os.remove(path)
+        raise
+    return path, f"{basename}{suffix}", count
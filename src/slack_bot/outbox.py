@@ -0,0 +1,344 @@
+# slack_bot/outbox.py
+"""Notion 저장 outbox
+
+"승인 후 노션에 저장"은 저장 작업을 SQLite outbox에 기록만 하고 바로 반환한다. 백그라운드 워커가
+outbox를 주기적으로 비우며(한 번에 batch_size개) Notion 페이지를 만들고, 실패하면 지수 백오프로 재시도한다.
+작업은 디스크에 남으므로 Notion 장애나 프로세스 재시작에도 사라지지 않는다.
+
+- 같은 (사용자, 실행)의 대기 중인 작업은 하나로 합친다 (마지막 결과로 저장).
+- 같은 실행의 작업이 처리 중이면 새 작업은 그 작업이 끝날 때까지 가져가지 않는다 (같은 페이지를 동시에 만들지 않도록).
+- 처리 중(running) 작업은 lease 시간이 지나면 다시 대기 상태로 간주한다 (처리 중 종료된 워커 대비).
+  이때도 시도 횟수를 늘리므로 워커를 계속 종료시키는 작업은 max_attempts 후 failed가 된다.
+- claim마다 claim_token을 발급하고 complete/fail은 같은 token일 때만 기록한다
+  (lease 만료 후 다른 워커가 가져간 작업을 이전 워커가 덮어쓰지 않도록).
+- 완료(done) 작업은 retention 시간이 지나면 삭제한다 (워커가 주기적으로 purge).
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from utils.metrics import NOTION_OUTBOX_AGE, NOTION_OUTBOX_DEPTH
+from .sessions import deserialize_result, serialize_result
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTBOX_DB_PATH = "data/notion_outbox.sqlite3"
+
+
+class NotionOutbox:
+    """Notion 저장 작업 대기열 (SQLite - 워커 프로세스 간 공유)"""
+
+    def __init__(self, db_path: str = DEFAULT_OUTBOX_DB_PATH, max_attempts: int = 5, base_delay: float = 5.0,
+                 max_delay: float = 600.0, lease: float = 600.0, retention: float = 7 * 24 * 3600.0,
+                 clock: Callable[[], float] = time.time):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease = lease
+        self.retention = retention
+        self._clock = clock
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._init_db()
+
+    def _connect(self, write: bool = True) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        if write:
+            # 여러 워커가 동시에 claim해도 같은 작업을 가져가지 않도록 쓰기 트랜잭션을 바로 시작
+            conn.execute("BEGIN IMMEDIATE")
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS notion_outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    run_id TEXT,
+                    payload BLOB NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    locked_until REAL,
+                    last_error TEXT,
+                    page_id TEXT,
+                    claim_token TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            # 이전 스키마(claim_token 없음) 마이그레이션
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(notion_outbox)")}
+            if "claim_token" not in columns:
+                conn.execute("ALTER TABLE notion_outbox ADD COLUMN claim_token TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_notion_outbox_due ON notion_outbox (status, next_attempt_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_notion_outbox_run ON notion_outbox (user_id, run_id, status)")
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def enqueue(self, user_id: str, run_id: Optional[str], result: Dict[str, Any]) -> int:
+        """저장 작업 등록 후 작업 id 반환 - 같은 실행의 대기 중인 작업이 있으면 그 작업을 갱신
+
+        같은 실행의 작업이 처리 중이면 새 대기 작업으로 등록하고, claim은 처리 중인 작업이 끝난 뒤에 가져간다.
+        """
+        payload = serialize_result(result)
+        now = self._clock()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT id FROM notion_outbox WHERE user_id = ? AND run_id IS ? AND status = 'pending' "
+                "ORDER BY id DESC LIMIT 1",
+                (user_id, run_id)
+            ).fetchone() if run_id else None
+            if row:
+                conn.execute("UPDATE notion_outbox SET payload = ?, updated_at = ? WHERE id = ?", (payload, now, row[0]))
+                job_id = row[0]
+            else:
+                job_id = conn.execute(
+                    "INSERT INTO notion_outbox (user_id, run_id, payload, status, next_attempt_at, created_at, updated_at) "
+                    "VALUES (?, ?, ?, 'pending', ?, ?, ?)",
+                    (user_id, run_id, payload, now, now, now)
+                ).lastrowid
+            conn.execute("COMMIT")
+            return job_id
+        finally:
+            conn.close()
+
+    def claim(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """처리할 차례가 된 작업을 최대 limit개 가져와 running으로 표시 (lease 만료된 running 포함)
+
+        같은 실행의 작업은 등록 순서대로 하나씩만 처리한다 - 먼저 등록된 작업이 끝나지 않았거나
+        다른 작업이 처리 중(lease 유효)이면 건너뛴다.
+        lease가 만료된 작업은 시도 1회로 세고, 시도 횟수를 다 쓴 작업은 가져가지 않고 failed로 둔다.
+        반환하는 작업의 claim_token을 complete/fail에 넘겨야 한다.
+        """
+        now = self._clock()
+        conn = self._connect()
+        try:
+            candidates = conn.execute(
+                "SELECT id, user_id, run_id, payload, attempts, created_at, status FROM notion_outbox AS job "
+                "WHERE ((status = 'pending' AND next_attempt_at <= ?) OR (status = 'running' AND locked_until <= ?)) "
+                "AND NOT EXISTS (SELECT 1 FROM notion_outbox AS other WHERE other.user_id = job.user_id "
+                "AND other.run_id = job.run_id AND other.id != job.id AND other.status IN ('pending', 'running') "
+                "AND (other.id < job.id OR other.locked_until > ?)) "
+                "ORDER BY id LIMIT ?",
+                (now, now, now, limit)
+            ).fetchall()
+            jobs = []
+            for row in candidates:
+                attempts = row[4]
+                if row[6] == "running":
+                    # 처리하던 워커가 종료됨 - 시도 1회로 계산
+                    attempts += 1
+                    if attempts >= self.max_attempts:
+                        conn.execute(
+                            "UPDATE notion_outbox SET status = 'failed', attempts = ?, locked_until = NULL, "
+                            "claim_token = NULL, last_error = ?, updated_at = ? WHERE id = ?",
+                            (attempts, "처리 중 lease 만료 (워커 종료)", now, row[0])
+                        )
+                        logger.warning(f"Notion outbox job {row[0]} failed after lease expiry (attempt {attempts})")
+                        continue
+                claim_token = uuid.uuid4().hex
+                conn.execute(
+                    "UPDATE notion_outbox SET status = 'running', attempts = ?, locked_until = ?, claim_token = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    (attempts, now + self.lease, claim_token, now, row[0])
+                )
+                jobs.append({"id": row[0], "user_id": row[1], "run_id": row[2], "result": deserialize_result(row[3]),
+                             "attempts": attempts, "created_at": row[5], "claim_token": claim_token})
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return jobs
+
+    def complete(self, job_id: int, page_id: str, claim_token: str) -> bool:
+        """완료 기록 - claim_token이 일치하는(아직 이 claim이 가진) 작업일 때만 기록하고 True"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE notion_outbox SET status = 'done', page_id = ?, locked_until = NULL, claim_token = NULL, "
+                "updated_at = ? WHERE id = ? AND status = 'running' AND claim_token = ?",
+                (page_id, self._clock(), job_id, claim_token)
+            )
+            conn.execute("COMMIT")
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def fail(self, job_id: int, error: str, claim_token: str) -> Optional[bool]:
+        """실패 기록 - 재시도 예정이면 True, 최대 시도 횟수를 넘으면 failed로 두고 False
+
+        claim_token이 일치하지 않으면(lease 만료 후 다른 워커가 가져감) 기록하지 않고 None.
+        """
+        now = self._clock()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT attempts FROM notion_outbox WHERE id = ? AND status = 'running' AND claim_token = ?",
+                (job_id, claim_token)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            attempts = row[0] + 1
+            retry = attempts < self.max_attempts
+            delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+            conn.execute(
+                "UPDATE notion_outbox SET status = ?, attempts = ?, next_attempt_at = ?, locked_until = NULL, "
+                "claim_token = NULL, last_error = ?, updated_at = ? WHERE id = ?",
+                ("pending" if retry else "failed", attempts, now + delay, error[:1000], now, job_id)
+            )
+            conn.execute("COMMIT")
+            return retry
+        finally:
+            conn.close()
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        conn = self._connect(write=False)
+        try:
+            row = conn.execute(
+                "SELECT status, attempts, last_error, page_id FROM notion_outbox WHERE id = ?", (job_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return {"status": row[0], "attempts": row[1], "last_error": row[2], "page_id": row[3]}
+
+    def stats(self) -> Dict[str, float]:
+        """대기 + 처리 중 작업 수, 가장 오래된 작업의 대기 시간(초)"""
+        conn = self._connect(write=False)
+        try:
+            depth, oldest = conn.execute(
+                "SELECT COUNT(*), MIN(created_at) FROM notion_outbox WHERE status IN ('pending', 'running')"
+            ).fetchone()
+        finally:
+            conn.close()
+        return {"depth": depth, "oldest_age": max(0.0, self._clock() - oldest) if oldest else 0.0}
+
+    def purge(self) -> int:
+        """retention 시간이 지난 완료 작업 삭제 - 삭제한 작업 수 반환 (실패 작업은 확인용으로 남김)"""
+        conn = self._connect()
+        try:
+            deleted = conn.execute(
+                "DELETE FROM notion_outbox WHERE status = 'done' AND updated_at < ?", (self._clock() - self.retention,)
+            ).rowcount
+            conn.execute("COMMIT")
+            return deleted
+        finally:
+            conn.close()
+
+
+class NotionOutboxWorker:
+    """outbox를 주기적으로 비우는 이벤트 루프 태스크
+
+    process(job)은 저장 후 페이지 id를 반환하는 코루틴, on_failed(job, error)는 최종 실패 시 호출된다.
+    한 번에 batch_size개를 가져와 동시에 처리하며 wake()로 다음 주기를 기다리지 않고 바로 처리할 수 있다.
+    오래된 완료 작업은 purge_interval초마다 삭제한다.
+    """
+
+    def __init__(self, outbox: NotionOutbox, process: Callable[[Dict[str, Any]], Awaitable[str]],
+                 on_failed: Optional[Callable[[Dict[str, Any], Exception], Awaitable[None]]] = None,
+                 batch_size: int = 5, poll_interval: float = 5.0, purge_interval: float = 3600.0):
+        self.outbox = outbox
+        self.process = process
+        self.on_failed = on_failed
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.purge_interval = purge_interval
+        self._next_purge_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """이벤트 루프 안에서 호출"""
+        if not self.running:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def drain_once(self) -> int:
+        """처리할 차례가 된 작업 한 묶음 처리 - 처리한 작업 수 반환"""
+        jobs = await asyncio.to_thread(self.outbox.claim, self.batch_size)
+        if jobs:
+            await asyncio.gather(*(self._handle(job) for job in jobs))
+        return len(jobs)
+
+    async def _run(self):
+        while True:
+            try:
+                # 한 묶음이 가득 찼으면 쉬지 않고 이어서 처리
+                while await self.drain_once() >= self.batch_size:
+                    pass
+                if time.monotonic() >= self._next_purge_at:
+                    self._next_purge_at = time.monotonic() + self.purge_interval
+                    await asyncio.to_thread(self.outbox.purge)
+            except Exception as e:
+                logger.error(f"Notion outbox 처리 오류: {str(e)}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _handle(self, job: Dict[str, Any]):
+        try:
+            page_id = await self.process(job)
+        except Exception as e:
+            retry = await asyncio.to_thread(self.outbox.fail, job["id"], str(e), job["claim_token"])
+            if retry is None:
+                logger.warning(f"Notion outbox job {job['id']} failed after its lease was lost - not recorded: {e}")
+                return
+            logger.warning(f"Notion outbox job {job['id']} failed (attempt {job['attempts'] + 1}, retry: {retry}): {e}")
+            if not retry and self.on_failed is not None:
+                await self.on_failed(job, e)
+            return
+        if not await asyncio.to_thread(self.outbox.complete, job["id"], page_id, job["claim_token"]):
+            logger.warning(f"Notion outbox job {job['id']} finished after its lease was lost - not recorded")
+
+
+# 싱글톤 인스턴스
+_notion_outbox_instance = None
+_notion_outbox_lock = threading.Lock()
+
+
+def get_notion_outbox() -> NotionOutbox:
+    """Notion 저장 outbox 싱글톤 인스턴스 반환"""
+    global _notion_outbox_instance
+    if _notion_outbox_instance is None:
+        with _notion_outbox_lock:
+            if _notion_outbox_instance is None:
+                _notion_outbox_instance = NotionOutbox(
+                    os.getenv("NOTION_OUTBOX_DB_PATH", DEFAULT_OUTBOX_DB_PATH),
+                    max_attempts=int(os.getenv("NOTION_OUTBOX_MAX_ATTEMPTS", "5")),
+                    base_delay=float(os.getenv("NOTION_OUTBOX_RETRY_DELAY", "5")),
+                    retention=float(os.getenv("NOTION_OUTBOX_RETENTION", str(7 * 24 * 3600)))
+                )
+                NOTION_OUTBOX_DEPTH.set_function(lambda: _notion_outbox_instance.stats()["depth"])
+                NOTION_OUTBOX_AGE.set_function(lambda: _notion_outbox_instance.stats()["oldest_age"])
+    return _notion_outbox_instance
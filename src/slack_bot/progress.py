@@ -0,0 +1,128 @@
+# slack_bot/progress.py
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 진행 메시지에 표시할 단계 (오케스트레이터 PROGRESS_NODES 순서)
+PROGRESS_STEPS = [
+    ("analyze", "요구사항 분석"),
+    ("epic", "에픽 생성"),
+    ("story", "스토리 생성"),
+    ("point", "스토리 포인트 추정"),
+]
+MAX_PREVIEW_EPICS = 10
+
+
+def build_progress_blocks(header: str, completed: List[str], state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """진행 메시지 블록 - 단계별 완료 여부, 부분 집계, 생성된 에픽 미리보기"""
+    epics = state.get("epics") or []
+    stories = state.get("stories") or []
+    story_points = state.get("story_points") or []
+
+    counts = {
+        "epic": f"{len(epics)}개",
+        "story": f"{len(stories)}개",
+        "point": f"{len(story_points)}개 / 총 {sum(sp.estimated_point for sp in story_points)} 포인트",
+    }
+    lines = []
+    current_marked = False
+    for step, label in PROGRESS_STEPS:
+        if step in completed:
+            lines.append(f"✅ {label}" + (f" - {counts[step]}" if step in counts else ""))
+        elif not current_marked:
+            lines.append(f"⏳ {label} 중...")
+            current_marked = True
+        else:
+            lines.append(f"▫️ {label}")
+
+    blocks = [
+        {"type": "section", "text": {"type": "mrkdwn", "text": header}},
+        {"type": "section", "text": {"type": "mrkdwn", "text": "\n".join(lines)}},
+    ]
+    if epics:
+        preview = "\n".join(f"• {epic.title}" for epic in epics[:MAX_PREVIEW_EPICS])
+        if len(epics) > MAX_PREVIEW_EPICS:
+            preview += f"\n… 외 {len(epics) - MAX_PREVIEW_EPICS}개"
+        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": f"📋 *생성된 에픽*\n{preview}"}})
+    return blocks
+
+
+class SlackProgressReporter:
+    """오케스트레이터 on_progress 콜백 - 진행 메시지를 chat_update로 갱신
+
+    Slack 메시지 갱신 rate limit을 넘지 않도록 min_interval 안의 갱신은 마지막 것만 보관했다가
+    다음 이벤트 또는 flush()에서 전송한다. 429 응답을 받으면 Retry-After 동안 갱신을 멈춘다.
+
+    콜백은 워커 스레드에서 호출된다. client가 AsyncWebClient면 loop(슬랙 앱 이벤트 루프)에서 실행하고 결과를 기다린다.
+    """
+
+    def __init__(self, client, channel: str, ts: str, header: str, min_interval: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic, loop: Optional[asyncio.AbstractEventLoop] = None,
+                 timeout: float = 10.0):
+        self.client = client
+        self.channel = channel
+        self.ts = ts
+        self.header = header
+        self.min_interval = min_interval
+        self.completed: List[str] = []
+        self.updates_sent = 0
+        self._clock = clock
+        self._loop = loop
+        self._timeout = timeout
+        self._next_allowed = 0.0
+        self._pending: Optional[List[Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, node: str, state: Dict[str, Any]) -> None:
+        if node not in self.completed:
+            self.completed.append(node)
+        self._update(build_progress_blocks(self.header, self.completed, state))
+
+    def flush(self) -> None:
+        """보류 중인 마지막 갱신 전송"""
+        with self._lock:
+            blocks, self._pending = self._pending, None
+        if blocks is not None:
+            self._update(blocks, force=True)
+
+    def _update(self, blocks: List[Dict[str, Any]], force: bool = False) -> None:
+        with self._lock:
+            now = self._clock()
+            if not force and now < self._next_allowed:
+                self._pending = blocks
+                return
+            self._pending = None
+            self._next_allowed = now + self.min_interval
+
+        try:
+            response = self.client.chat_update(
+                channel=self.channel, ts=self.ts, text="🔄 프로젝트 분석 진행 중...", blocks=blocks
+            )
+            if inspect.isawaitable(response):
+                asyncio.run_coroutine_threadsafe(response, self._loop).result(self._timeout)
+            self.updates_sent += 1
+        except Exception as e:
+            retry_after = _retry_after(e)
+            if retry_after:
+                with self._lock:
+                    self._next_allowed = self._clock() + retry_after
+                    self._pending = self._pending or blocks
+            logger.warning(f"진행 메시지 갱신 실패: {str(e)}")
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """SlackApiError(429)의 Retry-After 헤더 값 (초)"""
+    response = getattr(error, "response", None)
+    if response is None or getattr(response, "status_code", None) != 429:
+        return None
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After", headers.get("retry-after", 1)))
+    except (TypeError, ValueError):
+        return 1.0
@@ -1,11 +1,38 @@
+import asyncio
+import importlib
+import sys
+
 from fastapi import APIRouter, Request, Query
 from fastapi.responses import PlainTextResponse
 from utils.logger import get_logger
-from .bot import handler
 
 router = APIRouter(prefix="/slack", tags=["Slack"])
 logger = get_logger(__name__)
 
+
+def get_slack_handler():
+    """Slack 요청 핸들러 - bot 모듈(Bolt App 초기화)은 첫 요청 또는 warm-up 시 import"""
+    from .bot import handler
+    return handler
+
+
+async def start_notion_outbox():
+    """Notion 저장 outbox 워커 시작 - bot 모듈 import는 이벤트 루프를 막지 않도록 스레드에서 수행"""
+    bot = await asyncio.to_thread(importlib.import_module, "slack_bot.bot")
+    await bot.start_background_workers()
+
+
+async def close_slack_client():
+    """outbox 워커와 Slack Web API / Notion 커넥션 풀 종료 (bot 모듈이 로드되지 않았으면 생략)"""
+    bot = sys.modules.get("slack_bot.bot")
+    if bot is not None:
+        await bot.stop_outbox_worker()
+        await bot.close_http_session()
+    notion = sys.modules.get("notion_service.async_client")
+    if notion is not None:
+        await notion.close_async_notion_service()
+
+
 @router.get("/events")
 async def slack_events_verification(challenge: str = Query(None)):
     """슬랙 URL 검증 - challenge 파라미터 응답"""
@@ -21,7 +48,7 @@ async def slack_events_verification(challenge: str = Query(None)):
 async def slack_events(request: Request):
     """슬랙 이벤트 핸들러"""
     logger.info("Slack event received")
-    return await handler.handle(request)
+    return await get_slack_handler().handle(request)
 
 @router.get("/interactive")
 async def slack_interactive_verification():
@@ -33,7 +60,7 @@ async def slack_interactive_verification():
 async def slack_interactive(request: Request):
     """슬랙 인터랙티브 핸들러"""
     logger.info("Slack interactive request received")
-    return await handler.handle(request)
+    return await get_slack_handler().handle(request)
 
 @router.get("/commands")
 async def slack_commands_verification():
@@ -45,4 +72,4 @@ async def slack_commands_verification():
 async def slack_commands(request: Request):
     """슬랙 슬래시 커맨드 핸들러"""
     logger.info("Slack command received")
-    return await handler.handle(request)
\ No newline at end of file
+    return await get_slack_handler().handle(request)
\ No newline at end of file
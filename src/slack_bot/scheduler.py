@@ -0,0 +1,181 @@
+# slack_bot/scheduler.py
+"""Slack 분석 요청 공정 스케줄러
+
+워크스페이스 → 사용자 2단계 가중 공정 큐(Start-time Fair Queuing). 실행 슬롯이 비면 가상 시간이 가장 작은
+워크스페이스를, 그 안에서 가상 시간이 가장 작은 사용자를 골라 가장 오래된 요청을 실행한다. 한 건을 실행할
+때마다 해당 워크스페이스/사용자의 가상 시간이 1/가중치만큼 증가하므로 요청을 많이 넣은 사용자도 다른 사용자와
+번갈아 실행된다. 사용자별 동시 실행 수는 per_user_limit으로 제한한다.
+
+이벤트 루프 안에서만 사용한다 (잠금 없음).
+"""
+import asyncio
+import itertools
+import os
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional, Tuple
+
+from utils.metrics import SLACK_SCHEDULER_QUEUED
+
+Flow = Tuple[str, str]  # (workspace_id, user_id)
+
+
+def parse_weights(value: Optional[str]) -> Dict[str, float]:
+    """"U123:2,U456:0.5" 형식의 가중치 설정 파싱"""
+    weights = {}
+    for item in (value or "").split(","):
+        if ":" in item:
+            key, weight = item.rsplit(":", 1)
+            weights[key.strip()] = float(weight)
+    return weights
+
+
+class Ticket:
+    """스케줄러에 등록된 요청 1건"""
+
+    __slots__ = ("id", "workspace_id", "user_id", "future", "started")
+
+    def __init__(self, ticket_id: int, workspace_id: str, user_id: str, future: asyncio.Future):
+        self.id = ticket_id
+        self.workspace_id = workspace_id
+        self.user_id = user_id
+        self.future = future
+        self.started = False
+
+    @property
+    def flow(self) -> Flow:
+        return self.workspace_id, self.user_id
+
+
+class FairScheduler:
+    """워크스페이스/사용자 단위 가중 공정 큐 + 사용자별 동시 실행 제한"""
+
+    def __init__(self, max_concurrent: int = 2, per_user_limit: int = 1,
+                 user_weights: Optional[Dict[str, float]] = None,
+                 workspace_weights: Optional[Dict[str, float]] = None):
+        self.max_concurrent = max_concurrent
+        self.per_user_limit = per_user_limit
+        self.user_weights = user_weights or {}
+        self.workspace_weights = workspace_weights or {}
+        self.running = 0
+        self._queues: Dict[Flow, Deque[Ticket]] = {}
+        self._running_by_user: Dict[Flow, int] = defaultdict(int)
+        self._user_vtime: Dict[Flow, float] = defaultdict(float)
+        self._workspace_vtime: Dict[str, float] = defaultdict(float)
+        # 마지막으로 실행한 요청의 시작 가상 시간 (새로 들어온 흐름이 밀린 몫을 몰아서 받지 않도록 기준으로 사용)
+        self._workspace_clock = 0.0
+        self._user_clock: Dict[str, float] = defaultdict(float)
+        self._ids = itertools.count(1)
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def enqueue(self, workspace_id: str, user_id: str) -> Ticket:
+        """요청 등록 - 슬롯이 있으면 바로 시작 상태(ticket.started)가 된다"""
+        ticket = Ticket(next(self._ids), workspace_id, user_id, asyncio.get_running_loop().create_future())
+        flow = ticket.flow
+        if not any(w == workspace_id for w, _ in self._queues):
+            self._workspace_vtime[workspace_id] = max(self._workspace_vtime[workspace_id], self._workspace_clock)
+        if flow not in self._queues:
+            self._user_vtime[flow] = max(self._user_vtime[flow], self._user_clock[workspace_id])
+            self._queues[flow] = deque()
+        self._queues[flow].append(ticket)
+        self._dispatch()
+        return ticket
+
+    async def wait(self, ticket: Ticket) -> None:
+        """실행 차례가 될 때까지 대기"""
+        await ticket.future
+
+    def release(self, ticket: Ticket) -> None:
+        """실행 종료 또는 대기 취소"""
+        if ticket.started:
+            ticket.started = False
+            self.running -= 1
+            self._running_by_user[ticket.flow] -= 1
+        else:
+            queue = self._queues.get(ticket.flow)
+            if queue and ticket in queue:
+                queue.remove(ticket)
+                if not queue:
+                    del self._queues[ticket.flow]
+            if not ticket.future.done():
+                ticket.future.cancel()
+        self._dispatch()
+
+    def position(self, ticket: Ticket) -> int:
+        """대기 순번 (0이면 실행 중) - 현재 대기열 기준으로 선택 순서를 모의 실행한 추정값"""
+        if ticket.started:
+            return 0
+        queues = {flow: deque(queue) for flow, queue in self._queues.items()}
+        user_vtime = dict(self._user_vtime)
+        workspace_vtime = dict(self._workspace_vtime)
+        for position in itertools.count(1):
+            flow = self._select(queues, user_vtime, workspace_vtime, enforce_limit=False)
+            if flow is None:
+                return position
+            if queues[flow].popleft() is ticket:
+                return position
+            if not queues[flow]:
+                del queues[flow]
+            self._charge(flow, user_vtime, workspace_vtime)
+
+    def _dispatch(self) -> None:
+        while self.running < self.max_concurrent:
+            flow = self._select(self._queues, self._user_vtime, self._workspace_vtime, enforce_limit=True)
+            if flow is None:
+                return
+            ticket = self._queues[flow].popleft()
+            if not self._queues[flow]:
+                del self._queues[flow]
+            self._workspace_clock = self._workspace_vtime[flow[0]]
+            self._user_clock[flow[0]] = self._user_vtime[flow]
+            self._charge(flow, self._user_vtime, self._workspace_vtime)
+            self.running += 1
+            self._running_by_user[flow] += 1
+            ticket.started = True
+            if not ticket.future.done():
+                ticket.future.set_result(None)
+
+    def _select(self, queues: Dict[Flow, Deque[Ticket]], user_vtime: Dict[Flow, float],
+                workspace_vtime: Dict[str, float], enforce_limit: bool) -> Optional[Flow]:
+        """가상 시간이 가장 작은 워크스페이스 → 그 안에서 가장 작은 사용자 (동률이면 먼저 온 요청)"""
+        candidates = [
+            flow for flow, queue in queues.items()
+            if queue and (not enforce_limit or self._running_by_user[flow] < self.per_user_limit)
+        ]
+        if not candidates:
+            return None
+        workspace = min(
+            {flow[0] for flow in candidates},
+            key=lambda w: (workspace_vtime.get(w, 0.0),
+                           min(queues[f][0].id for f in candidates if f[0] == w))
+        )
+        return min(
+            (flow for flow in candidates if flow[0] == workspace),
+            key=lambda f: (user_vtime.get(f, 0.0), queues[f][0].id)
+        )
+
+    def _charge(self, flow: Flow, user_vtime: Dict[Flow, float], workspace_vtime: Dict[str, float]) -> None:
+        workspace_id, user_id = flow
+        workspace_weight = self.workspace_weights.get(workspace_id, 1.0)
+        workspace_vtime[workspace_id] = workspace_vtime.get(workspace_id, 0.0) + 1.0 / workspace_weight
+        user_vtime[flow] = user_vtime.get(flow, 0.0) + 1.0 / self.user_weights.get(user_id, 1.0)
+
+
+# 싱글톤 인스턴스
+_fair_scheduler_instance = None
+
+
+def get_fair_scheduler() -> FairScheduler:
+    """Slack 분석 공정 스케줄러 싱글톤 인스턴스 반환"""
+    global _fair_scheduler_instance
+    if _fair_scheduler_instance is None:
+        _fair_scheduler_instance = FairScheduler(
+            max_concurrent=int(os.getenv("SLACK_MAX_WORKERS", "2")),
+            per_user_limit=int(os.getenv("SLACK_USER_MAX_CONCURRENT", "1")),
+            user_weights=parse_weights(os.getenv("SLACK_USER_WEIGHTS")),
+            workspace_weights=parse_weights(os.getenv("SLACK_WORKSPACE_WEIGHTS"))
+        )
+        SLACK_SCHEDULER_QUEUED.set_function(lambda: _fair_scheduler_instance.queued)
+    return _fair_scheduler_instance
@@ -0,0 +1,261 @@
+# slack_bot/sessions.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic_core import to_jsonable_python
+
+from epic.models import Epic
+from story.models import Story
+from story_point.models import StoryPointEstimation
+from utils.metrics import SLACK_SESSION_BYTES, SLACK_SESSIONS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_DB_PATH = "data/slack_sessions.sqlite3"
+
+
+def serialize_result(result: Dict[str, Any]) -> bytes:
+    """분석 결과를 압축 JSON으로 직렬화 (에픽/스토리/포인트 모델 포함)"""
+    payload = {
+        **result,
+        "epic_results": [
+            {
+                "epic": epic_result["epic"].model_dump(mode="json"),
+                # epic_id는 exclude 필드라 model_dump에서 빠지므로 직접 포함
+                "stories": [{**story.model_dump(mode="json"), "epic_id": story.epic_id}
+                            for story in epic_result["stories"]],
+                "story_points": [point.model_dump(mode="json") for point in epic_result["story_points"]],
+            }
+            for epic_result in result.get("epic_results", [])
+        ],
+    }
+    data = json.dumps(to_jsonable_python(payload), ensure_ascii=False, separators=(",", ":"))
+    return zlib.compress(data.encode("utf-8"))
+
+
+def deserialize_result(data: bytes) -> Dict[str, Any]:
+    """serialize_result의 역변환 - 에픽/스토리/포인트를 모델 객체로 복원"""
+    payload = json.loads(zlib.decompress(data).decode("utf-8"))
+    payload["epic_results"] = [
+        {
+            "epic": Epic.model_validate(epic_result["epic"]),
+            "stories": [Story.model_validate(story) for story in epic_result["stories"]],
+            "story_points": [StoryPointEstimation.model_validate(point) for point in epic_result["story_points"]],
+        }
+        for epic_result in payload.get("epic_results", [])
+    ]
+    return payload
+
+
+class _TTLCache:
+    """직렬화된 값을 LRU + TTL로 최대 max_entries개 보관하는 메모리 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.bytes = 0
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Tuple[Any, ...], expires_at: float, data: bytes):
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (expires_at, data)
+            self.bytes += len(data)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Tuple[Any, ...]):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= len(entry[1])
+
+
+class SlackSessionStore:
+    """Slack 분석 결과 저장소 - (사용자, 실행) 단위
+
+    메모리 계층: 직렬화된 결과는 최대 max_entries개, 뷰 페이지는 최대 max_view_pages개를 각각 LRU + TTL로 보관
+    (결과 하나에 페이지가 여러 개이므로 페이지가 결과를 밀어내지 않도록 따로 관리)
+    SQLite 계층: 모든 워커 프로세스가 공유하며 재시작 후에도 TTL 동안 유지
+
+    결과 뷰(views.render_result_views)는 페이지 단위로 저장되어 (run, view, page) 키로 바로 조회된다.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_SESSION_DB_PATH, max_entries: int = 128, ttl: float = 7 * 24 * 3600,
+                 max_view_pages: int = 512):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_view_pages = max_view_pages
+        self.ttl = ttl
+        self._results = _TTLCache(max_entries)
+        self._views = _TTLCache(max_view_pages)
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    user_id TEXT NOT NULL,
+                    run_id TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (user_id, run_id)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user_created ON sessions (user_id, created_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS session_views (
+                    user_id TEXT NOT NULL,
+                    run_id TEXT NOT NULL,
+                    view TEXT NOT NULL,
+                    page INTEGER NOT NULL,
+                    data BLOB NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (user_id, run_id, view, page)
+                )
+            """)
+
+    def put(self, user_id: str, result: Dict[str, Any], run_id: Optional[str] = None) -> str:
+        """결과 저장 후 run id 반환"""
+        run_id = run_id or uuid.uuid4().hex[:12]
+        data = serialize_result(result)
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (user_id, run_id, data, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (user_id, run_id, data, now, expires_at)
+            )
+            conn.execute("DELETE FROM sessions WHERE expires_at < ?", (now,))
+            conn.execute("DELETE FROM session_views WHERE expires_at < ?", (now,))
+        self._results.put((user_id, run_id), expires_at, data)
+        return run_id
+
+    def put_views(self, user_id: str, run_id: str, views: Dict[str, List[Dict[str, Any]]]) -> None:
+        """렌더링된 뷰 페이지 저장 ({view: [page, ...]})"""
+        expires_at = time.time() + self.ttl
+        rows = [
+            (user_id, run_id, view, page["page"], zlib.compress(json.dumps(page, ensure_ascii=False).encode("utf-8")),
+             expires_at)
+            for view, pages in views.items() for page in pages
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO session_views (user_id, run_id, view, page, data, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        for row in rows:
+            self._views.put(row[:4], expires_at, row[4])
+
+    def get_view_page(self, user_id: str, run_id: str, view: str, page: int = 0) -> Optional[Dict[str, Any]]:
+        """뷰 페이지 조회 - {"text", "blocks", "page", "pages"} (없으면 None)"""
+        key = (user_id, run_id, view, page)
+        data = self._views.get(key)
+        if data is None:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT data, expires_at FROM session_views "
+                    "WHERE user_id = ? AND run_id = ? AND view = ? AND page = ? AND expires_at > ?",
+                    (user_id, run_id, view, page, time.time())
+                ).fetchone()
+            if row is None:
+                return None
+            data = row[0]
+            self._views.put(key, row[1], data)
+        return json.loads(zlib.decompress(data).decode("utf-8"))
+
+    def get(self, user_id: str, run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """결과 조회 (run_id가 없으면 사용자의 가장 최근 결과)"""
+        run_id = run_id or self.latest_run_id(user_id)
+        if run_id is None:
+            return None
+        key = (user_id, run_id)
+        data = self._results.get(key)
+        if data is not None:
+            return deserialize_result(data)
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT data, expires_at FROM sessions WHERE user_id = ? AND run_id = ? AND expires_at > ?",
+                (user_id, run_id, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        self._results.put(key, row[1], row[0])
+        return deserialize_result(row[0])
+
+    def latest_run_id(self, user_id: str) -> Optional[str]:
+        # 다른 워커가 저장한 결과도 보이도록 항상 SQLite 기준
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT run_id FROM sessions WHERE user_id = ? AND expires_at > ? ORDER BY created_at DESC LIMIT 1",
+                (user_id, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def list_runs(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """사용자의 최근 실행 목록 (최신순)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT run_id, created_at FROM sessions WHERE user_id = ? AND expires_at > ? "
+                "ORDER BY created_at DESC LIMIT ?",
+                (user_id, time.time(), limit)
+            ).fetchall()
+        return [{"run_id": row[0], "created_at": row[1]} for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """메모리 계층 사용량 (cached_bytes는 결과 + 뷰 페이지)"""
+        return {"cached_entries": len(self._results), "cached_view_pages": len(self._views),
+                "cached_bytes": self._results.bytes + self._views.bytes,
+                "max_entries": self.max_entries, "max_view_pages": self.max_view_pages, "ttl": self.ttl}
+
+
+# 싱글톤 인스턴스
+_session_store_instance = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store() -> SlackSessionStore:
+    """Slack 세션 저장소 싱글톤 인스턴스 반환"""
+    global _session_store_instance
+    if _session_store_instance is None:
+        with _session_store_lock:
+            if _session_store_instance is None:
+                _session_store_instance = SlackSessionStore(
+                    os.getenv("SLACK_SESSION_DB_PATH", DEFAULT_SESSION_DB_PATH),
+                    max_entries=int(os.getenv("SLACK_SESSION_CACHE_SIZE", "128")),
+                    max_view_pages=int(os.getenv("SLACK_SESSION_VIEW_CACHE_SIZE", "512")),
+                    ttl=float(os.getenv("SLACK_SESSION_TTL", str(7 * 24 * 3600)))
+                )
+                SLACK_SESSIONS.set_function(lambda: _session_store_instance.stats()["cached_entries"])
+                SLACK_SESSION_BYTES.set_function(lambda: _session_store_instance.stats()["cached_bytes"])
+    return _session_store_instance
@@ -0,0 +1,182 @@
+# slack_bot/views.py
+"""분석 결과 Block Kit 뷰
+
+실행이 끝날 때 에픽/스토리/포인트 뷰를 한 번 렌더링하고 Slack 메시지 블록 제한(50개) 이하의
+페이지로 나눈다. 페이지는 세션 저장소에 저장되어 버튼 클릭 시 (run, view, page)로 바로 조회된다.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from story_point.models import StoryPointIndex
+
+MAX_BLOCKS = 50
+VIEWS = ("epics", "stories", "points")
+NAV_ACTION_PREFIX = "view_page_"
+
+
+def _section(text: str) -> Dict[str, Any]:
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+
+def _button(text: str, action_id: str, value: str, style: Optional[str] = None) -> Dict[str, Any]:
+    button = {"type": "button", "text": {"type": "plain_text", "text": text}, "action_id": action_id, "value": value}
+    if style:
+        button["style"] = style
+    return button
+
+
+def page_value(run_id: str, view: str, page: int) -> str:
+    """페이지 이동 버튼 value"""
+    return f"{run_id}:{view}:{page}"
+
+
+def parse_page_value(value: str) -> Tuple[str, str, int]:
+    run_id, view, page = value.rsplit(":", 2)
+    return run_id, view, int(page)
+
+
+def _epic_view(result: Dict[str, Any], run_id: str):
+    epic_results = result.get("epic_results", [])
+    header = [_section(f"📋 *생성된 에픽 ({len(epic_results)}개)*")]
+    content = []
+    for i, epic_result in enumerate(epic_results, 1):
+        epic = epic_result["epic"]
+
+        epic_text = f"*{i}. {epic.title}*\n"
+        epic_text += f"📝 {epic.description}\n"
+        epic_text += f"💼 비즈니스 가치: {epic.business_value}\n"
+        epic_text += f"🔥 우선순위: {epic.priority}\n"
+
+        if epic.acceptance_criteria:
+            epic_text += f"✅ 수용 기준:\n"
+            for criterion in epic.acceptance_criteria[:3]:  # 최대 3개만 표시
+                epic_text += f"  • {criterion}\n"
+
+        content.append(_section(epic_text))
+
+        # 구분선 추가 (마지막 에픽 제외)
+        if i < len(epic_results):
+            content.append({"type": "divider"})
+
+    buttons = [
+        _button("📝 스토리 확인하기", "show_stories", run_id),
+        _button("✅ 승인 후 노션에 저장", "approve_and_save", run_id, style="primary"),
+    ]
+    return header, content, buttons, f"생성된 에픽 {len(epic_results)}개"
+
+
+def _story_view(result: Dict[str, Any], run_id: str):
+    header = [_section(f"📝 *생성된 스토리 ({result.get('total_stories', 0)}개)*")]
+    content = []
+    for epic_result in result.get("epic_results", []):
+        epic = epic_result["epic"]
+        stories = epic_result["stories"]
+
+        if stories:
+            content.append(_section(f"*📋 {epic.title}*"))
+
+            for story in stories:
+                story_text = f"• *{story.title}*\n"
+                story_text += f"  📝 {story.description}\n"
+                story_text += f"  🏷️ 도메인: {story.domain}\n"
+
+                if story.acceptance_criteria:
+                    story_text += f"  ✅ 수용기준:\n"
+                    for criterion in story.acceptance_criteria[:2]:  # 최대 2개만 표시
+                        story_text += f"    - {criterion}\n"
+
+                content.append(_section(story_text))
+
+            content.append({"type": "divider"})
+
+    buttons = [
+        _button("🔢 포인트 확인하기", "show_points", run_id),
+        _button("✅ 승인 후 노션에 저장", "approve_and_save", run_id, style="primary"),
+    ]
+    return header, content, buttons, f"생성된 스토리 {result.get('total_stories', 0)}개"
+
+
+def _point_view(result: Dict[str, Any], run_id: str):
+    total_points = 0
+    content = []
+    displayed_stories = set()  # 중복 표시 방지 (스토리 id 기준)
+
+    for epic_result in result.get("epic_results", []):
+        epic = epic_result["epic"]
+        story_points = epic_result["story_points"]
+
+        if story_points:
+            # 에픽의 스토리에 id로 연결된 추정만 스토리당 한 번 계산 (id 없는 이전 결과는 제목으로 연결)
+            point_index = StoryPointIndex(story_points)
+            unique_story_points = []
+            for story in epic_result.get("stories", []):
+                sp = point_index.get(story)
+                if sp is not None and story.id not in displayed_stories:
+                    unique_story_points.append(sp)
+                    displayed_stories.add(story.id)
+
+            if unique_story_points:  # 유니크한 스토리 포인트가 있을 때만 표시
+                epic_points = sum(sp.estimated_point for sp in unique_story_points)
+                total_points += epic_points
+
+                content.append(_section(f"*📋 {epic.title}* - 총 {epic_points} 포인트"))
+
+                for sp in unique_story_points:
+                    point_text = f"• *{sp.story_title}*: {sp.estimated_point} 포인트\n"
+                    point_text += f"  📊 복잡도: {sp.complexity_factors}\n"
+                    point_text += f"  🎯 신뢰도: {sp.confidence_level}\n"
+                    point_text += f"  💭 추정 근거: {sp.reasoning[:100]}..."
+
+                    content.append(_section(point_text))
+
+                content.append({"type": "divider"})
+
+    header = [
+        _section(f"🔢 *스토리 포인트 추정 결과*"),
+        _section(f"📊 *전체 프로젝트 예상 포인트: {total_points} 포인트*"),
+    ]
+    buttons = [
+        _button("📋 에픽 다시 보기", "show_epics", run_id),
+        _button("✅ 승인 후 노션에 저장", "approve_and_save", run_id, style="primary"),
+    ]
+    return header, content, buttons, f"스토리 포인트 추정 완료 - 총 {total_points} 포인트"
+
+
+_VIEW_BUILDERS = {"epics": _epic_view, "stories": _story_view, "points": _point_view}
+
+
+def paginate(view: str, run_id: str, header: List[Dict[str, Any]], content: List[Dict[str, Any]],
+             buttons: List[Dict[str, Any]], text: str) -> List[Dict[str, Any]]:
+    """헤더 + 본문 일부 + 페이지 표시 + 버튼이 MAX_BLOCKS 이하가 되도록 분할"""
+    page_size = MAX_BLOCKS - len(header) - 2  # 페이지 표시(context) + 버튼(actions)
+    chunks = [content[i:i + page_size] for i in range(0, len(content), page_size)] or [[]]
+    pages = []
+    for index, chunk in enumerate(chunks):
+        # 페이지 끝의 구분선은 생략
+        if len(chunk) > 1 and chunk[-1]["type"] == "divider":
+            chunk = chunk[:-1]
+        nav = []
+        if index > 0:
+            nav.append(_button("◀ 이전", f"{NAV_ACTION_PREFIX}prev", page_value(run_id, view, index - 1)))
+        if index < len(chunks) - 1:
+            nav.append(_button("다음 ▶", f"{NAV_ACTION_PREFIX}next", page_value(run_id, view, index + 1)))
+
+        blocks = header + chunk
+        if len(chunks) > 1:
+            blocks.append({"type": "context", "elements": [
+                {"type": "mrkdwn", "text": f"페이지 {index + 1}/{len(chunks)}"}
+            ]})
+        blocks.append({"type": "actions", "elements": nav + buttons})
+        pages.append({"text": text, "blocks": blocks, "page": index, "pages": len(chunks)})
+    return pages
+
+
+def render_result_views(result: Dict[str, Any], run_id: str) -> Dict[str, List[Dict[str, Any]]]:
+    """분석 결과의 에픽/스토리/포인트 뷰를 페이지 단위로 렌더링"""
+    views = {}
+    for view, builder in _VIEW_BUILDERS.items():
+        header, content, buttons, text = builder(result, run_id)
+        views[view] = paginate(view, run_id, header, content, buttons, text)
+    if not result.get("epic_results"):
+        views["epics"] = [{"text": "📋 생성된 에픽이 없습니다.", "blocks": [_section("📋 생성된 에픽이 없습니다.")],
+                           "page": 0, "pages": 1}]
+    return views
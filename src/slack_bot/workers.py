@@ -0,0 +1,90 @@
+# slack_bot/workers.py
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Set
+
+from utils.metrics import SLACK_TASKS_PENDING
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SlackWorkerBusyError(Exception):
+    """대기열이 가득 차 Slack 작업을 받을 수 없음"""
+
+
+class SlackTaskExecutor:
+    """Slack 리스너에서 넘겨받은 작업(워크플로우 실행, Notion 저장)을 백그라운드 태스크로 실행
+
+    리스너는 submit()으로 등록만 하고 즉시 반환한다. 등록된 작업 수는 max_queue_size + max_workers개로 제한되고
+    동기 코드(오케스트레이터, 파일 내보내기)는 run_blocking()으로 max_workers 크기의 워커 스레드 풀에서 실행한다.
+    분석 실행 순서와 동시 실행 수는 scheduler.FairScheduler가 정한다.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue_size: int = 50):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="slack-worker")
+        self._tasks: Set[asyncio.Task] = set()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """대기 + 실행 중인 작업 수"""
+        return self._pending
+
+    def submit(self, name: str, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> None:
+        """코루틴 작업 등록 (이벤트 루프 안에서 호출, 대기열이 가득 차면 SlackWorkerBusyError)"""
+        if self._pending >= self.max_queue_size + self.max_workers:
+            raise SlackWorkerBusyError("Slack 작업 대기열이 가득 찼습니다")
+        self._pending += 1
+        task = asyncio.get_running_loop().create_task(self._run(name, func, args, kwargs))
+        # 태스크가 GC되지 않도록 완료 시까지 참조 유지
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, name: str, func: Callable[..., Awaitable[Any]], args: tuple, kwargs: dict):
+        try:
+            await func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Slack 작업 실행 오류 ({name}): {str(e)}")
+        finally:
+            self._pending -= 1
+
+    async def run_blocking(self, func: Callable, *args, **kwargs) -> Any:
+        """동기 함수를 워커 스레드에서 실행 (trace 등 contextvars 유지)"""
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._threads, call)
+
+    async def join(self):
+        """등록된 작업이 모두 끝날 때까지 대기"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def shutdown(self, wait: bool = True):
+        self._threads.shutdown(wait=wait)
+
+
+# 싱글톤 인스턴스
+_slack_executor_instance = None
+_slack_executor_lock = threading.Lock()
+
+
+def get_slack_executor() -> SlackTaskExecutor:
+    """Slack 작업 실행기 싱글톤 인스턴스 반환"""
+    global _slack_executor_instance
+    if _slack_executor_instance is None:
+        with _slack_executor_lock:
+            if _slack_executor_instance is None:
+                _slack_executor_instance = SlackTaskExecutor(
+                    max_workers=int(os.getenv("SLACK_MAX_WORKERS", "2")),
+                    max_queue_size=int(os.getenv("SLACK_MAX_QUEUE_SIZE", "50"))
+                )
+                SLACK_TASKS_PENDING.set_function(lambda: _slack_executor_instance.pending)
+    return _slack_executor_instance
@@ -3,17 +3,22 @@ from datetime import datetime
 import os
 
 from utils.logger import get_logger
-from story.services import StoryGeneratorAgent
 from story.models import StoryRequest, StoryResponse
 
 router = APIRouter(prefix="/Story", tags=["Story"])
 
 logger = get_logger(__name__)
 
-# EpicGeneratorService 인스턴스 생성
-story_service = StoryGeneratorAgent(
-    openai_api_key=os.getenv("OPENAI_API_KEY")
-)
+# StoryGeneratorAgent 인스턴스 (첫 요청 시 생성 - langchain import 지연)
+_story_service = None
+
+
+def get_story_service():
+    global _story_service
+    if _story_service is None:
+        from story.services import StoryGeneratorAgent
+        _story_service = StoryGeneratorAgent(openai_api_key=os.getenv("OPENAI_API_KEY"))
+    return _story_service
 
 
 @router.post("/generate-storys", response_model=StoryResponse)
@@ -22,7 +27,7 @@ def generate_storys(request: StoryRequest):
     try:
         start_time = datetime.now()
         
-        storys = story_service.generate_storys(request)
+        storys = get_story_service().generate_storys(request)
         
         end_time = datetime.now()
         generation_time = (end_time - start_time).total_seconds()
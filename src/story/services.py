@@ -1,13 +1,17 @@
 import json
 import logging
+import time
 from typing import List, Dict
 
-from langchain_community.chat_models import ChatOpenAI
 from langchain.agents import create_react_agent
 from langchain.prompts import ChatPromptTemplate
 
 from story.prompts import STORY_GENERATOR_PROMPT
 from story.models import Story, StoryRequest
+from llm.router import RoutedChatModels, select_model
+from llm.usage import record_llm_usage
+from utils.metrics import LLM_FALLBACKS, LLM_PARSE_FAILURES
+from utils.tracing import start_span
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,11 +21,9 @@ class StoryGeneratorAgent:
     """스토리 생성 agent"""
     
     def __init__(self, openai_api_key: str,  model_name: str = "gpt-4o-mini", temperature: float = 0.2):
-        self.llm = ChatOpenAI(
-            model=model_name,
-            temperature=temperature,
-            api_key=openai_api_key
-        )
+        self.model_name = model_name
+        self.llms = RoutedChatModels("story", temperature=temperature, api_key=openai_api_key)
+        self.llm = self.llms.get(model_name)
     
     def _create_agent(self, prompt: ChatPromptTemplate):
         self.agent = create_react_agent(llm=self.llm,tools=[],prompt=prompt)
@@ -38,7 +40,12 @@ class StoryGeneratorAgent:
                 max_storys=max_storys
             )
             
-            response = self.llm.invoke(prompt)
+            model, route = select_model("story", default=self.model_name)
+
+            call_start = time.perf_counter()
+            with start_span("llm.call", node="story", model=model, route=route):
+                response = self.llms.get(model).invoke(prompt)
+            record_llm_usage(response, model=model, latency=time.perf_counter() - call_start, route=route)
             logger.info("스토리 생성 완료")
             return response.content
             
@@ -70,6 +77,7 @@ class StoryGeneratorAgent:
             
         except Exception as e:
             logger.error(f"응답 파싱 중 오류: {str(e)}")
+            LLM_PARSE_FAILURES.inc(node="story")
             raise e
 
 ### 추후 개선    
@@ -169,6 +177,7 @@ class StoryGeneratorAgent:
             
         except Exception as e:
             logger.error(f"스토리 생성 중 오류: {str(e)}")
+            LLM_FALLBACKS.inc(node="story")
             # 오류 발생 시 기본 스토리 반환
             return self._create_fallback_story(request.user_input)
         
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import Any, Dict, Iterable, List, Optional
 
 from story.models import Story
 from epic.models import Epic
@@ -8,6 +8,7 @@ from epic.models import Epic
 class StoryPointEstimation(BaseModel):
     """스토리 포인트 추정 결과 모델"""
     story_title: str = Field(..., description="스토리 제목")
+    story_id: Optional[str] = Field(None, description="추정한 스토리 id (이전 버전 결과에는 없음 - 제목으로 연결)")
     estimated_point: int = Field(..., ge=1, le=8, description="추정된 스토리 포인트 (1,2,3,5,8)")
     domain: str = Field(..., description="스토리 영역 (frontend|backend|devops|data)")
     estimation_method: str = Field(..., description="추정 방법 (same_area|cross_area)")
@@ -19,6 +20,30 @@ class StoryPointEstimation(BaseModel):
     risks: List[str] = Field(default_factory=list, description="예상되는 위험 요소들")
 
 
+class StoryPointIndex:
+    """스토리 → 포인트 추정 조인 인덱스
+
+    story_id가 있는 추정은 스토리 id로만 연결하고, story_id가 없는 이전 버전 결과만 제목으로 연결한다.
+    같은 키의 추정이 여러 개면 첫 번째를 사용한다.
+    """
+
+    def __init__(self, story_points: Iterable[Any]):
+        self._by_id: Dict[str, Any] = {}
+        self._by_title: Dict[str, Any] = {}
+        for sp in story_points:
+            story_id = getattr(sp, "story_id", None)
+            if story_id:
+                self._by_id.setdefault(story_id, sp)
+            else:
+                self._by_title.setdefault(sp.story_title, sp)
+
+    def get(self, story: Any) -> Optional[Any]:
+        story_point = self._by_id.get(getattr(story, "id", None))
+        if story_point is None:
+            story_point = self._by_title.get(getattr(story, "title", None))
+        return story_point
+
+
 class StoryPointRequest(BaseModel):
     """스토리 포인트 추정 요청 모델"""
     user_input: str = Field(..., description="사용자 입력")
@@ -3,17 +3,22 @@ from datetime import datetime
 import os
 
 from utils.logger import get_logger
-from story_point.services import StoryPointEstimationAgent
 from story_point.models import StoryPointRequest, StoryPointResponse
 
 router = APIRouter(prefix="/story-point", tags=["StoryPoint"])
 
 logger = get_logger(__name__)
 
-# StoryPointEstimationAgent 인스턴스 생성
-story_point_service = StoryPointEstimationAgent(
-    openai_api_key=os.getenv("OPENAI_API_KEY")
-)
+# StoryPointEstimationAgent 인스턴스 (첫 요청 시 생성 - langchain/pandas import 지연)
+_story_point_service = None
+
+
+def get_story_point_service():
+    global _story_point_service
+    if _story_point_service is None:
+        from story_point.services import StoryPointEstimationAgent
+        _story_point_service = StoryPointEstimationAgent(openai_api_key=os.getenv("OPENAI_API_KEY"))
+    return _story_point_service
 
 
 @router.post("/estimate", response_model=StoryPointResponse)
@@ -22,7 +27,7 @@ def estimate_story_points(request: StoryPointRequest):
     try:
         start_time = datetime.now()
         
-        estimations = story_point_service.estimate_story_points(request)
+        estimations = get_story_point_service().estimate_story_points(request)
         
         end_time = datetime.now()
         generation_time = (end_time - start_time).total_seconds()
@@ -42,7 +47,7 @@ def estimate_story_points(request: StoryPointRequest):
 def reload_reference_data():
     """참고 데이터 다시 로드"""
     try:
-        success = story_point_service.load_reference_data()
+        success = get_story_point_service().load_reference_data()
         if success:
             return {"message": "참고 데이터가 성공적으로 다시 로드되었습니다.", "status": "success"}
         else:
@@ -56,6 +61,7 @@ def reload_reference_data():
 def get_reference_data_stats():
     """참고 데이터 통계"""
     try:
+        story_point_service = get_story_point_service()
         if story_point_service.reference_data is None or story_point_service.reference_data.empty:
             return {"total_stories": 0, "domains": []}
         
@@ -2,13 +2,18 @@ import json
 import logging
 import pandas as pd
 import os
+import threading
+import time
 from datetime import datetime
 from typing import List, Optional, Dict
-from langchain_community.chat_models import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 
 from story_point.prompts import STORY_POINT_ESTIMATION_PROMPT
 from story_point.models import StoryPointEstimation, StoryPointRequest
+from llm.router import RoutedChatModels, needs_escalation, select_model
+from llm.usage import record_llm_usage
+from utils.metrics import LLM_FALLBACKS, LLM_PARSE_FAILURES, REFERENCE_STORE_SIZE
+from utils.tracing import start_span
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,16 +23,31 @@ class StoryPointEstimationAgent:
     """스토리 포인트 추정 agent"""
     
     def __init__(self, openai_api_key: str, model_name: str = "gpt-4o-mini", temperature: float = 0.2, csv_file_path: str = "data/reference_stories.csv"):
-        self.llm = ChatOpenAI(
-            model=model_name,
-            temperature=temperature,
-            api_key=openai_api_key
-        )
+        self.model_name = model_name
+        self.llms = RoutedChatModels("point", temperature=temperature, api_key=openai_api_key)
+        self.llm = self.llms.get(model_name)
         self.csv_file_path = csv_file_path
-        self.reference_data: Optional[pd.DataFrame] = None
-        
-        # CSV 파일 초기화
-        self._initialize_csv_file()
+        # 참고 데이터는 첫 사용 시 로드 (서버 기동 시간 단축)
+        # 기동 warm-up 스레드와 요청 스레드가 동시에 접근하므로 로드는 lock 안에서 한 번만 수행
+        self._reference_data: Optional[pd.DataFrame] = None
+        self._reference_initialized = False
+        self._reference_lock = threading.RLock()
+
+    @property
+    def reference_data(self) -> Optional[pd.DataFrame]:
+        """참고 스토리 데이터 (첫 접근 시 CSV 파일 초기화 및 로드 - 다른 스레드가 로드 중이면 완료까지 대기)"""
+        if not self._reference_initialized:
+            with self._reference_lock:
+                if not self._reference_initialized:
+                    self._initialize_csv_file()
+                    self._reference_initialized = True
+        return self._reference_data
+
+    @reference_data.setter
+    def reference_data(self, value: Optional[pd.DataFrame]):
+        # 데이터를 먼저 기록한 뒤 초기화 완료로 표시 (lock 없이 읽는 스레드가 None을 보지 않도록)
+        self._reference_data = value
+        self._reference_initialized = True
 
     def _initialize_csv_file(self):
         """CSV 파일 초기화 - 파일이 없으면 생성"""
@@ -50,21 +70,24 @@ class StoryPointEstimationAgent:
                 logger.info(f"새로운 CSV 파일 생성: {self.csv_file_path}")
             
             # CSV 파일 로드
-            self.load_reference_data()
+            with start_span("reference.load", path=self.csv_file_path):
+                self.load_reference_data()
             
         except Exception as e:
             logger.error(f"CSV 파일 초기화 실패: {str(e)}")
 
     def load_reference_data(self) -> bool:
-        """CSV 파일에서 참고 스토리 데이터 로드"""
+        """CSV 파일에서 참고 스토리 데이터 로드 (서버 기동 warm-up에서 명시적으로 호출)"""
         try:
-            if os.path.exists(self.csv_file_path):
-                self.reference_data = pd.read_csv(self.csv_file_path)
-                logger.info(f"참고 데이터 로드 완료: {len(self.reference_data)}개 스토리")
-                return True
-            else:
-                logger.warning(f"CSV 파일을 찾을 수 없음: {self.csv_file_path}")
-                return False
+            with self._reference_lock:
+                if os.path.exists(self.csv_file_path):
+                    self.reference_data = pd.read_csv(self.csv_file_path)
+                    REFERENCE_STORE_SIZE.set(len(self._reference_data))
+                    logger.info(f"참고 데이터 로드 완료: {len(self._reference_data)}개 스토리")
+                    return True
+                else:
+                    logger.warning(f"CSV 파일을 찾을 수 없음: {self.csv_file_path}")
+                    return False
         except Exception as e:
             logger.error(f"CSV 파일 로드 실패: {str(e)}")
             return False
@@ -130,22 +153,26 @@ class StoryPointEstimationAgent:
             # DataFrame에 추가
             new_row = pd.DataFrame([new_data])
             
+            # 첫 저장이면 CSV 파일(헤더) 생성 및 기존 데이터 로드
+            reference_data = self.reference_data
+            
             # CSV 파일에 추가 (헤더 없이)
             new_row.to_csv(self.csv_file_path, mode='a', header=False, index=False)
             
             # 메모리의 reference_data도 업데이트
-            if self.reference_data is not None:
-                self.reference_data = pd.concat([self.reference_data, new_row], ignore_index=True)
+            if reference_data is not None:
+                self.reference_data = pd.concat([reference_data, new_row], ignore_index=True)
             else:
                 self.reference_data = new_row
+            REFERENCE_STORE_SIZE.set(len(self.reference_data))
             
             logger.info(f"추정 결과를 CSV에 저장: {estimation.story_title}")
             
         except Exception as e:
             logger.error(f"CSV 저장 실패: {str(e)}")
 
-    def _generate_estimations_with_llm(self, prompt: ChatPromptTemplate, user_input: str, epic_info: str, story_info: str, reference_stories: str) -> str:
-        """LLM을 사용하여 스토리 포인트 추정"""
+    def _generate_estimations_with_llm(self, prompt: ChatPromptTemplate, user_input: str, epic_info: str, story_info: str, reference_stories: str, escalate: bool = False) -> str:
+        """LLM을 사용하여 스토리 포인트 추정 (escalate=True면 상위 모델로 재추정)"""
         try:
             logger.info("스토리 포인트 추정 시작")
             
@@ -156,7 +183,12 @@ class StoryPointEstimationAgent:
                 reference_stories=reference_stories
             )
             
-            response = self.llm.invoke(formatted_prompt)
+            model, route = select_model("point", default=self.model_name, escalate=escalate)
+
+            call_start = time.perf_counter()
+            with start_span("llm.call", node="point", model=model, route=route):
+                response = self.llms.get(model).invoke(formatted_prompt)
+            record_llm_usage(response, model=model, latency=time.perf_counter() - call_start, route=route)
             logger.info("스토리 포인트 추정 완료")
             return response.content
             
@@ -188,6 +220,7 @@ class StoryPointEstimationAgent:
             
         except Exception as e:
             logger.error(f"응답 파싱 중 오류: {str(e)}")
+            LLM_PARSE_FAILURES.inc(node="point")
             raise e
 
     def _validate_estimations(self, parsed_estimations: List[Dict]) -> List[StoryPointEstimation]:
@@ -251,12 +284,15 @@ class StoryPointEstimationAgent:
             logger.error(f"스토리 포인트 추정 결과 검증 중 오류: {str(e)}")
             raise e
     
-    def _create_fallback_estimation(self, story_title: str = "기본 스토리") -> List[StoryPointEstimation]:
+    def _create_fallback_estimation(self, story_title: str = "기본 스토리",
+                                    story_id: Optional[str] = None) -> List[StoryPointEstimation]:
         """기본 스토리 포인트 추정 생성 (fallback)"""
         logger.info("기본 스토리 포인트 추정 생성")
+        LLM_FALLBACKS.inc(node="point")
         
         fallback_estimation = StoryPointEstimation(
             story_title=story_title,
+            story_id=story_id,
             estimated_point=3,
             domain="fullstack",
             estimation_method="cross_area",
@@ -269,12 +305,33 @@ class StoryPointEstimationAgent:
         )
         return [fallback_estimation]
         
+    def _escalate_estimations(self, request: StoryPointRequest, reference_stories_str: str,
+                              estimations: List[StoryPointEstimation]) -> List[StoryPointEstimation]:
+        """상위 모델로 재추정 - 실패하거나 결과가 없으면 기존 추정 유지"""
+        logger.info(f"신뢰도 낮음, 상위 모델로 재추정: {request.story_info.title}")
+        try:
+            raw_response = self._generate_estimations_with_llm(
+                STORY_POINT_ESTIMATION_PROMPT,
+                request.user_input,
+                str(request.epic_info) if request.epic_info else "",
+                str(request.story_info),
+                reference_stories_str,
+                escalate=True
+            )
+            escalated = self._validate_estimations(self._parse_response(raw_response))
+            return escalated or estimations
+        except Exception as e:
+            logger.warning(f"상위 모델 재추정 실패, 기존 추정 사용: {str(e)}")
+            return estimations
+
     def estimate_story_points(self, request: StoryPointRequest) -> List[StoryPointEstimation]:
         """스토리 포인트 추정 (동기)"""
         try:
             # 1. 참고 스토리 데이터 가져오기
             domain = getattr(request.story_info, 'domain', None) or 'fullstack'
-            reference_stories = self.get_reference_stories_by_domain(domain)
+            with start_span("reference.lookup", domain=domain) as span:
+                reference_stories = self.get_reference_stories_by_domain(domain)
+                span.set_attribute("results", len(reference_stories))
             
             # 참고 스토리 문자열 생성
             reference_stories_str = ""
@@ -305,10 +362,18 @@ class StoryPointEstimationAgent:
             
             # 4. 추정 결과 검증 및 변환
             validated_estimations = self._validate_estimations(parsed_estimations)
+
+            # 4-1. 신뢰도가 낮으면 라우팅 정책의 상위 모델로 한 번 재추정
+            if needs_escalation("point", [estimation.confidence_level for estimation in validated_estimations]):
+                validated_estimations = self._escalate_estimations(request, reference_stories_str, validated_estimations)
             
             # 5. 결과가 없으면 기본 추정 생성
             if not validated_estimations:
                 validated_estimations = self._create_fallback_estimation(request.story_info.title)
+
+            # 추정 결과를 스토리 id로 연결 (같은 제목의 스토리가 여러 개여도 구분)
+            for estimation in validated_estimations:
+                estimation.story_id = request.story_info.id
             
             # 6. 유효한 추정 결과만 CSV에 저장
             if validated_estimations and len(validated_estimations) > 0:
@@ -322,5 +387,7 @@ class StoryPointEstimationAgent:
         except Exception as e:
             logger.error(f"스토리 포인트 추정 중 오류: {str(e)}")
             # 오류 발생 시 기본 추정 반환
-            return self._create_fallback_estimation(request.story_info.title if request.story_info else "기본 스토리")
+            if not request.story_info:
+                return self._create_fallback_estimation()
+            return self._create_fallback_estimation(request.story_info.title, request.story_info.id)
         
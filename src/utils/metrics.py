@@ -0,0 +1,368 @@
+# utils/metrics.py
+"""Prometheus 텍스트 포맷 메트릭
+
+외부 의존성 없이 카운터/게이지/히스토그램을 제공한다. 측정은 프로세스 메모리에서
+락 하나로 처리하고(핫패스 오버헤드 최소화), METRICS_MULTIPROC_DIR가 설정되면 각 uvicorn
+워커가 주기적으로 스냅샷 파일을 쓰고 /metrics 요청 시 모든 워커 스냅샷을 합산한다.
+스냅샷 파일은 (pid, 프로세스별 토큰)으로 구분하고, 워커 시작 시 이전 서버 실행(다른 부모 프로세스)에서
+종료된 워커의 파일을 지운다.
+"""
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, Any] = {}
+
+    def snapshot(self) -> List[Tuple[LabelKey, Any]]:
+        with self._lock:
+            return [(key, value) for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self, samples: List[Tuple[LabelKey, Any]]) -> List[str]:
+        return [f"{self.name}_total{_format_labels(key)} {_format_value(value)}" for key, value in samples]
+
+
+class Gauge(_Metric):
+    """현재 값 게이지 - multiprocess_mode: sum(워커 합산) | max"""
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, multiprocess_mode: str = "sum"):
+        super().__init__(name, documentation)
+        self.multiprocess_mode = multiprocess_mode
+        self._functions: Dict[LabelKey, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, func: Callable[[], float], **labels) -> None:
+        """수집 시점에 값을 계산 (세션 수 등 - 핫패스에서 갱신할 필요 없음)"""
+        with self._lock:
+            self._functions[_label_key(labels)] = func
+
+    def snapshot(self) -> List[Tuple[LabelKey, Any]]:
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, func in functions.items():
+            try:
+                values[key] = float(func())
+            except Exception:
+                continue
+        return list(values.items())
+
+    def render(self, samples: List[Tuple[LabelKey, Any]]) -> List[str]:
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in samples]
+
+
+class _Timer:
+    def __init__(self, histogram: "Histogram", labels: Dict[str, Any]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class Histogram(_Metric):
+    """지연 시간 히스토그램 (초)"""
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            data[0][index] += 1
+            data[1] += value
+            data[2] += 1
+
+    def time(self, **labels) -> _Timer:
+        """with 블록 실행 시간 측정"""
+        return _Timer(self, labels)
+
+    def snapshot(self) -> List[Tuple[LabelKey, Any]]:
+        with self._lock:
+            return [(key, [list(data[0]), data[1], data[2]]) for key, data in self._values.items()]
+
+    def render(self, samples: List[Tuple[LabelKey, Any]]) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in samples:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 등록 및 Prometheus 텍스트 출력 (멀티 워커 합산 포함)"""
+
+    def __init__(self, multiproc_dir: Optional[str] = None, flush_interval: float = 5.0):
+        self.multiproc_dir = multiproc_dir
+        self.flush_interval = flush_interval
+        self._metrics: Dict[str, _Metric] = {}
+        self._flusher: Optional[threading.Thread] = None
+        self._token_pid: Optional[int] = None
+        self._token = ""
+        if multiproc_dir:
+            os.makedirs(multiproc_dir, exist_ok=True)
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self.register(Counter(name, documentation))
+
+    def gauge(self, name: str, documentation: str, multiprocess_mode: str = "sum") -> Gauge:
+        return self.register(Gauge(name, documentation, multiprocess_mode))
+
+    def histogram(self, name: str, documentation: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, buckets))
+
+    # 멀티 워커 지원
+    def _process_token(self) -> str:
+        """프로세스별 토큰 (fork 후 다시 생성) - 재사용된 PID가 이전 프로세스 파일을 덮어쓰지 않도록"""
+        if self._token_pid != os.getpid():
+            self._token_pid = os.getpid()
+            self._token = uuid.uuid4().hex[:12]
+        return self._token
+
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.multiproc_dir, f"metrics_{os.getpid()}_{self._process_token()}.json")
+
+    def _local_snapshot(self) -> Dict[str, List]:
+        return {
+            name: [[list(key), value] for key, value in metric.snapshot()]
+            for name, metric in self._metrics.items()
+        }
+
+    def flush(self) -> None:
+        """현재 프로세스 스냅샷을 공유 디렉토리에 기록 (원자적 교체)"""
+        if not self.multiproc_dir:
+            return
+        path = self._snapshot_path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "ppid": os.getppid(), "metrics": self._local_snapshot()}, f)
+        os.replace(tmp_path, path)
+
+    def remove_stale_snapshots(self) -> int:
+        """이전 서버 실행의 스냅샷 삭제 - 종료된 프로세스이면서 부모(서버 프로세스)가 다른 파일, 삭제한 수 반환
+
+        같은 서버 실행 중 재시작된 워커의 카운터/히스토그램은 누적값으로 계속 합산한다.
+        """
+        if not self.multiproc_dir:
+            return 0
+        removed = 0
+        own_file = os.path.basename(self._snapshot_path())
+        for filename, data in self._read_snapshots():
+            if filename == own_file or data.get("ppid") == os.getppid() or \
+                    (data.get("pid") != os.getpid() and _pid_alive(data.get("pid"))):
+                continue
+            try:
+                os.remove(os.path.join(self.multiproc_dir, filename))
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def start_flusher(self) -> None:
+        """백그라운드 스냅샷 기록 스레드 시작 (워커마다 1개)"""
+        if not self.multiproc_dir or (self._flusher and self._flusher.is_alive()):
+            return
+        self.remove_stale_snapshots()
+
+        def run():
+            while True:
+                time.sleep(self.flush_interval)
+                try:
+                    self.flush()
+                except OSError:
+                    pass
+
+        self._flusher = threading.Thread(target=run, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.flush)
+
+    def _read_snapshots(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """공유 디렉토리의 (파일명, 스냅샷) 목록"""
+        snapshots = []
+        for filename in os.listdir(self.multiproc_dir):
+            if not filename.startswith("metrics_") or not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.multiproc_dir, filename), encoding="utf-8") as f:
+                    snapshots.append((filename, json.load(f)))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def _collect_snapshots(self) -> List[Tuple[bool, Dict[str, List]]]:
+        """(프로세스 생존 여부, 메트릭 스냅샷) 목록"""
+        snapshots = [(True, self._local_snapshot())]
+        if not self.multiproc_dir:
+            return snapshots
+
+        own_file = os.path.basename(self._snapshot_path())
+        for filename, data in self._read_snapshots():
+            if filename == own_file:
+                continue
+            # 현재 프로세스와 PID만 같은 파일은 PID를 재사용하기 전 종료된 프로세스의 것
+            alive = data.get("pid") != os.getpid() and _pid_alive(data.get("pid"))
+            snapshots.append((alive, data.get("metrics", {})))
+        return snapshots
+
+    def render(self) -> str:
+        """모든 워커 값을 합산한 Prometheus 텍스트 포맷"""
+        snapshots = self._collect_snapshots()
+        lines = []
+        for name, metric in self._metrics.items():
+            merged: Dict[LabelKey, Any] = {}
+            for alive, snapshot in snapshots:
+                # 종료된 워커의 게이지는 현재 값이 아니므로 제외 (카운터/히스토그램은 누적 유지)
+                if metric.type == "gauge" and not alive:
+                    continue
+                for raw_key, value in snapshot.get(name, []):
+                    key = tuple(tuple(pair) for pair in raw_key)
+                    merged[key] = _merge_value(metric, merged.get(key), value)
+
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            lines.extend(metric.render(sorted(merged.items())))
+        return "\n".join(lines) + "\n"
+
+
+def _merge_value(metric: _Metric, current: Any, value: Any) -> Any:
+    if current is None:
+        return [list(value[0]), value[1], value[2]] if metric.type == "histogram" else value
+    if metric.type == "histogram":
+        return [[a + b for a, b in zip(current[0], value[0])], current[1] + value[1], current[2] + value[2]]
+    if metric.type == "gauge" and metric.multiprocess_mode == "max":
+        return max(current, value)
+    return current + value
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+REGISTRY = MetricsRegistry(
+    multiproc_dir=os.getenv("METRICS_MULTIPROC_DIR"),
+    flush_interval=float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+)
+
+# 워크플로우 / LLM
+NODE_DURATION = REGISTRY.histogram(
+    "workflow_node_duration_seconds", "LangGraph 노드 실행 시간 (analyze, epic, story, point, finalize)"
+)
+WORKFLOW_DURATION = REGISTRY.histogram("workflow_duration_seconds", "워크플로우 전체 실행 시간")
+WORKFLOWS_IN_FLIGHT = REGISTRY.gauge("workflows_in_flight", "실행 중인 워크플로우 수")
+LLM_CALL_DURATION = REGISTRY.histogram("llm_call_duration_seconds", "LLM 호출 지연 시간", buckets=LLM_BUCKETS)
+LLM_FALLBACKS = REGISTRY.counter("llm_fallbacks", "LLM 결과 대신 기본값(fallback)을 사용한 횟수")
+LLM_PARSE_FAILURES = REGISTRY.counter("llm_parse_failures", "LLM 응답 JSON 파싱 실패 횟수")
+CACHE_HITS = REGISTRY.counter("cache_hits", "캐시/요청 병합으로 실행을 생략한 횟수")
+
+# 어드미션 컨트롤
+ADMISSION_QUEUE_DEPTH = REGISTRY.gauge("admission_queue_depth", "실행 슬롯 대기 중인 요청 수")
+ADMISSION_REJECTIONS = REGISTRY.counter("admission_rejections", "실행 슬롯 부족으로 거부된 요청 수")
+
+# Slack / 참고 데이터 / Notion
+SLACK_SESSIONS = REGISTRY.gauge("slack_sessions", "메모리에 보관 중인 Slack 세션 수")
+SLACK_SESSION_BYTES = REGISTRY.gauge("slack_session_cache_bytes", "메모리에 보관 중인 Slack 세션 크기 (직렬화 기준, bytes)")
+SLACK_DUPLICATES = REGISTRY.counter("slack_duplicates", "중복으로 처리하지 않은 Slack 전달/제출 수")
+SLACK_SCHEDULER_QUEUED = REGISTRY.gauge("slack_scheduler_queued", "공정 스케줄러에서 실행 차례를 기다리는 Slack 분석 요청 수")
+SLACK_TASKS_PENDING = REGISTRY.gauge("slack_tasks_pending", "Slack 백그라운드 작업 대기 + 실행 중 수")
+REFERENCE_STORE_SIZE = REGISTRY.gauge(
+    "reference_store_size", "스토리 포인트 참고 데이터 행 수", multiprocess_mode="max"
+)
+NOTION_API_DURATION = REGISTRY.histogram("notion_api_duration_seconds", "Notion API 호출 지연 시간")
+NOTION_RATE_LIMITED = REGISTRY.counter("notion_rate_limited", "Notion 429 응답으로 Retry-After 후 재시도한 횟수")
+NOTION_SYNC = REGISTRY.counter("notion_sync", "Notion 페이지 동기화 결과 (created, updated, unchanged)")
+# outbox는 워커 프로세스 간 공유(SQLite)이므로 합산하지 않고 최댓값 사용
+NOTION_OUTBOX_DEPTH = REGISTRY.gauge(
+    "notion_outbox_depth", "Notion 저장 outbox 대기 + 처리 중 작업 수", multiprocess_mode="max"
+)
+NOTION_OUTBOX_AGE = REGISTRY.gauge(
+    "notion_outbox_oldest_age_seconds", "Notion 저장 outbox에서 가장 오래 대기 중인 작업의 경과 시간", multiprocess_mode="max"
+)
+
+REGISTRY.start_flusher()
@@ -0,0 +1,216 @@
+# utils/tracing.py
+"""경량 span 트레이싱
+
+요청 → LangGraph 노드 → LLM 호출 / 참고 데이터 조회 / Notion API 호출을 하나의 trace id로
+연결한다. 현재 span은 contextvars로 전파되며(graph.invoke 내부 포함), 종료된 span은
+TRACE_FILE(JSONL)에 한 줄씩 기록된다.
+
+JSONL을 Chrome Trace Event 포맷으로 변환하면 Perfetto(ui.perfetto.dev) / chrome://tracing 에서 볼 수 있다:
+    python -m utils.tracing logs/traces.jsonl -o trace.json [--trace-id <id>]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("trace_span", default=None)
+
+
+def _new_trace_id() -> str:
+    return uuid.uuid4().hex
+
+
+def _new_span_id() -> str:
+    return os.urandom(8).hex()
+
+
+class Span:
+    """하나의 작업 구간"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start_ns", "end_ns", "status", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = trace_id
+        self.span_id = _new_span_id()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes or {}
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(((self.end_ns or self.start_ns) - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+            "thread": threading.current_thread().name,
+        }
+
+
+class JsonlSpanExporter:
+    """종료된 span을 JSONL 파일에 기록"""
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_exporter: Optional[JsonlSpanExporter] = None
+_exporter_configured = False
+_exporter_lock = threading.Lock()
+
+
+def configure_tracing(path: Optional[str]) -> None:
+    """span 출력 파일 설정 (None이면 기록하지 않음)"""
+    global _exporter, _exporter_configured
+    with _exporter_lock:
+        if _exporter is not None:
+            _exporter.close()
+        _exporter = JsonlSpanExporter(path) if path else None
+        _exporter_configured = True
+
+
+def _get_exporter() -> Optional[JsonlSpanExporter]:
+    if not _exporter_configured:
+        configure_tracing(os.getenv("TRACE_FILE"))
+    return _exporter
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+
+@contextmanager
+def _open_span(name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+    span = Span(name, trace_id=trace_id, parent_id=parent_id, attributes=attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.status = "error"
+        span.error = str(e)
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        _current_span.reset(token)
+        exporter = _get_exporter()
+        if exporter is not None:
+            exporter.export(span)
+
+
+def start_span(name: str, **attributes):
+    """현재 span의 하위 span 시작 (현재 span이 없으면 새 trace 시작)"""
+    parent = _current_span.get()
+    if parent is None:
+        return _open_span(name, _new_trace_id(), None, attributes)
+    return _open_span(name, parent.trace_id, parent.span_id, attributes)
+
+
+def start_trace(name: str, trace_id: Optional[str] = None, **attributes):
+    """새 trace의 루트 span 시작 (외부에서 받은 trace id 이어받기 가능)"""
+    return _open_span(name, trace_id or _new_trace_id(), None, attributes)
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[str]:
+    """W3C traceparent 헤더에서 trace id 추출"""
+    if not header:
+        return None
+    parts = header.split("-")
+    if len(parts) >= 2 and len(parts[1]) == 32 and parts[1] != "0" * 32:
+        return parts[1]
+    return None
+
+
+def load_spans(path: str, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            span = json.loads(line)
+            if trace_id is None or span["trace_id"] == trace_id:
+                spans.append(span)
+    return spans
+
+
+def to_chrome_trace(spans: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Chrome Trace Event 포맷으로 변환 (trace별로 한 줄(tid)씩 표시)"""
+    lanes: Dict[str, int] = {}
+    events = []
+    for span in spans:
+        tid = lanes.setdefault(span["trace_id"], len(lanes) + 1)
+        events.append({
+            "name": span["name"],
+            "cat": span["name"].split(".")[0],
+            "ph": "X",
+            "ts": span["start_ns"] / 1000,
+            "dur": ((span["end_ns"] or span["start_ns"]) - span["start_ns"]) / 1000,
+            "pid": 1,
+            "tid": tid,
+            "args": {
+                **span.get("attributes", {}),
+                "trace_id": span["trace_id"],
+                "span_id": span["span_id"],
+                "parent_id": span["parent_id"],
+                "status": span["status"],
+                "error": span.get("error"),
+            },
+        })
+    thread_names = [
+        {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": f"trace {trace_id[:8]}"}}
+        for trace_id, tid in lanes.items()
+    ]
+    return {"traceEvents": thread_names + events, "displayTimeUnit": "ms"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="span JSONL → Chrome Trace Event JSON 변환")
+    parser.add_argument("trace_file", help="TRACE_FILE 경로 (JSONL)")
+    parser.add_argument("-o", "--output", default="trace.json", help="출력 파일")
+    parser.add_argument("--trace-id", help="특정 trace만 변환")
+    args = parser.parse_args()
+
+    spans = load_spans(args.trace_file, args.trace_id)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(to_chrome_trace(spans), f, ensure_ascii=False)
+    print(f"{len(spans)} spans → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
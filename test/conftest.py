@@ -0,0 +1,66 @@
+import pytest
+import sys
+import os
+from typing import Any, Dict, Sequence
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from epic.models import Epic
+from llm.factory import configure_llm_backend
+from llm.fake import FakeLLMConfig
+from story.models import Story
+from story_point.models import StoryPointEstimation
+
+
+def build_result(epics: int = 2, stories_per_epic: int = 3, *, description: str = "설명",
+                 acceptance_criteria: Sequence[str] = (), domain: str = None,
+                 complexity_factors: Sequence[str] = (), unestimated_per_epic: int = 0) -> Dict[str, Any]:
+    """합성 분석 결과 (에픽 epics개 × 스토리 stories_per_epic개, 포인트 3)
+
+    에픽마다 마지막 unestimated_per_epic개 스토리는 포인트 추정 없이 둔다. bench/notion_bench.py도 사용.
+    """
+    epic_results = []
+    for e in range(epics):
+        epic = Epic(title=f"에픽 {e}", description=description, business_value="가치", priority="High",
+                    acceptance_criteria=list(acceptance_criteria), included_tasks=[])
+        stories = [Story(epic_id=epic.id, title=f"스토리 {e}-{s}", description=description,
+                         acceptance_criteria=list(acceptance_criteria), domain=domain)
+                   for s in range(stories_per_epic)]
+        points = [
+            StoryPointEstimation(story_title=story.title, estimated_point=3, domain="backend",
+                                 estimation_method="same_area", reasoning="근거", confidence_level="high",
+                                 complexity_factors=list(complexity_factors))
+            for story in stories[:stories_per_epic - unestimated_per_epic]
+        ]
+        epic_results.append({"epic": epic, "stories": stories, "story_points": points})
+    return {"status": "completed", "project_name": "테스트 프로젝트", "epic_results": epic_results,
+            "total_epics": epics, "total_stories": epics * stories_per_epic,
+            "total_story_points": epics * (stories_per_epic - unestimated_per_epic)}
+
+
+@pytest.fixture
+def make_result():
+    return build_result
+
+
+@pytest.fixture
+def fake_backend():
+    configure_llm_backend("fake", FakeLLMConfig(epics=2, stories_per_epic=2))
+    yield
+    configure_llm_backend(None)
+
+
+@pytest.fixture
+def orchestrator(fake_backend, tmp_path, monkeypatch):
+    from orchestrator import agent_nodes
+    from orchestrator.orchestrator import ProjectManagementOrchestrator
+    from story_point.services import StoryPointEstimationAgent
+
+    # 참고 데이터 CSV가 저장소 data/ 를 오염시키지 않도록 임시 경로 사용
+    monkeypatch.setattr(agent_nodes, "_epic_agent", None)
+    monkeypatch.setattr(agent_nodes, "_story_agent", None)
+    monkeypatch.setattr(
+        agent_nodes, "_story_point_agent",
+        StoryPointEstimationAgent(openai_api_key="fake", csv_file_path=str(tmp_path / "reference.csv"))
+    )
+    return ProjectManagementOrchestrator()
@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from orchestrator import admission, routes
+from orchestrator.admission import AdmissionController, AdmissionRejected
+
+
+def test_rejects_with_429_when_queue_full():
+    controller = AdmissionController(max_concurrent=1, max_queue=0)
+    acquired_at = controller.acquire()
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.acquire()
+    assert excinfo.value.status_code == 429
+    assert excinfo.value.retry_after >= 1
+
+    controller.release(acquired_at)
+    assert controller.stats()["rejected"]["queue_full"] == 1
+
+
+def test_rejects_with_503_after_deadline():
+    controller = AdmissionController(max_concurrent=1, max_queue=4)
+    controller.acquire()
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.acquire(timeout=0.05)
+    assert excinfo.value.status_code == 503
+    assert controller.stats()["queue_depth"] == 0
+    assert controller.stats()["rejected"]["deadline"] == 1
+
+
+def test_waiting_request_admitted_when_slot_released():
+    controller = AdmissionController(max_concurrent=1, max_queue=4)
+    acquired_at = controller.acquire()
+    admitted = threading.Event()
+
+    def waiter():
+        controller.release(controller.acquire(timeout=5))
+        admitted.set()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    controller.release(acquired_at)
+    thread.join(5)
+
+    assert admitted.is_set()
+    assert controller.stats()["admitted"] == 2
+
+
+def test_execute_route_returns_retry_after(monkeypatch):
+    controller = AdmissionController(max_concurrent=1, max_queue=0, default_duration=10)
+    monkeypatch.setattr(admission, "_admission_controller_instance", controller)
+    controller.acquire()
+
+    app = FastAPI()
+    app.include_router(routes.router)
+    response = TestClient(app).post("/orchestrator/execute", json={"user_input": "쇼핑몰 만들어줘"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "10"
+
+
+def test_background_job_waits_for_slot_shared_with_routes(tmp_path, monkeypatch):
+    from orchestrator.jobs import JobManager, JobStore
+
+    controller = AdmissionController(max_concurrent=1, max_queue=0)
+    monkeypatch.setattr(admission, "_admission_controller_instance", controller)
+    started = threading.Event()
+    monkeypatch.setattr("orchestrator.orchestrator.get_orchestrator",
+                        lambda: type("Orchestrator", (), {
+                            "execute": lambda self, **kwargs: started.set() or {"status": "completed"}})())
+    acquired_at = controller.acquire()
+
+    # 슬롯이 모두 사용 중이면 비동기 작업은 거부되지 않고 대기
+    manager = JobManager(JobStore(str(tmp_path / "jobs.sqlite3")), max_workers=1)
+    manager.submit({"user_input": "작업"})
+    assert not started.wait(0.2)
+    assert controller.stats()["background_waiting"] == 1
+
+    controller.release(acquired_at)
+    assert started.wait(5)
+    manager._executor.shutdown(wait=True)
+    assert controller.stats()["in_flight"] == 0
+    assert controller.stats()["rejected"] == {"queue_full": 0, "deadline": 0}
@@ -0,0 +1,85 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from orchestrator.coalescing import RequestCoalescer, make_request_key
+
+
+def test_request_key_normalizes_whitespace_and_option_order():
+    assert make_request_key(" 쇼핑몰  만들어줘 ", "웹\n앱", {"a": 1, "b": 2}) == \
+        make_request_key("쇼핑몰 만들어줘", "웹 앱", {"b": 2, "a": 1})
+    assert make_request_key("쇼핑몰", "웹") != make_request_key("쇼핑몰", "앱")
+
+
+def test_concurrent_identical_requests_share_one_execution():
+    coalescer = RequestCoalescer()
+    calls = []
+    started = threading.Event()
+
+    def work():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return {"status": "completed"}
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(coalescer.run, "key", work)
+        started.wait(5)
+        followers = [pool.submit(coalescer.run, "key", work) for _ in range(4)]
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert len(calls) == 1
+    assert all(result == {"status": "completed"} for result in results)
+    assert coalescer.stats["coalesced"] == 4
+
+
+def test_completed_result_reused_within_window_only():
+    coalescer = RequestCoalescer(reuse_window=0.1)
+    calls = []
+
+    def work():
+        calls.append(1)
+        return {"status": "completed"}
+
+    coalescer.run("key", work)
+    coalescer.run("key", work)
+    assert len(calls) == 1
+
+    time.sleep(0.15)
+    coalescer.run("key", work)
+    assert len(calls) == 2
+
+
+def test_error_results_are_not_reused():
+    coalescer = RequestCoalescer(reuse_window=10)
+    calls = []
+
+    def work():
+        calls.append(1)
+        return {"status": "error"}
+
+    for _ in range(2):
+        coalescer.run("key", work, cacheable=lambda result: result["status"] != "error")
+    assert len(calls) == 2
+
+
+def test_orchestrator_reuses_identical_request(orchestrator, monkeypatch):
+    invocations = []
+    original_invoke = orchestrator.graph.invoke
+    monkeypatch.setattr(orchestrator.graph, "invoke", lambda state: invocations.append(1) or original_invoke(state))
+
+    first = orchestrator.execute("쇼핑몰 만들어줘", "웹")
+    second = orchestrator.execute("쇼핑몰  만들어줘", "웹")
+    orchestrator.execute("쇼핑몰 만들어줘", "웹", options={"coalesce": False})
+
+    assert len(invocations) == 2
+    assert first["total_epics"] == second["total_epics"] == 2
+
+
+def test_orchestrator_does_not_reuse_failed_result(orchestrator, monkeypatch):
+    calls = []
+    monkeypatch.setattr(orchestrator, "_execute", lambda *args: calls.append(1) or {"status": "failed"})
+
+    for _ in range(2):
+        assert orchestrator.execute("쇼핑몰 만들어줘", "웹")["status"] == "failed"
+    assert len(calls) == 2
@@ -0,0 +1,64 @@
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from llm.factory import create_chat_model
+from llm.fake import FakeChatModel, FakeLLMConfig, FakeLLMError
+
+
+class TestFakeChatModel:
+    def test_factory_selects_fake_backend(self, fake_backend):
+        llm = create_chat_model("epic", model="gpt-4o-mini")
+        assert isinstance(llm, FakeChatModel)
+        assert llm.model_name == "gpt-4o-mini"
+
+    def test_synthesized_epics_are_deterministic(self):
+        llm = FakeChatModel("epic", config=FakeLLMConfig(epics=4))
+        first = llm.invoke("prompt").content
+        assert first == llm.invoke("prompt").content
+        assert len(json.loads(first)) == 4
+
+    def test_point_response_uses_story_title(self):
+        llm = FakeChatModel("point")
+        prompt = "epic info : id='e' title='에픽'\nstory info : id='s' title='로그인 기능' description='x'"
+        estimations = json.loads(llm.invoke(prompt).content)
+        assert estimations[0]["story_title"] == "로그인 기능"
+        assert estimations[0]["estimated_point"] in [1, 2, 3, 5, 8]
+
+    def test_error_injection(self):
+        llm = FakeChatModel("epic", config=FakeLLMConfig(error_rate=1.0))
+        with pytest.raises(FakeLLMError):
+            llm.invoke("prompt")
+
+    def test_replay_prefers_matching_prompt(self, tmp_path):
+        import hashlib
+        replay_file = tmp_path / "recordings.jsonl"
+        records = [
+            {"node": "epic", "prompt_sha": "other", "content": "other"},
+            {"node": "epic", "prompt_sha": hashlib.sha256("hello".encode()).hexdigest(), "content": "match"},
+        ]
+        replay_file.write_text("\n".join(json.dumps(r) for r in records))
+
+        llm = FakeChatModel("epic", config=FakeLLMConfig(mode="replay", replay_file=str(replay_file)))
+        assert llm.invoke("hello").content == "match"
+
+    def test_replayed_latency_from_logs(self, tmp_path):
+        log_file = tmp_path / "2025-01-01.txt"
+        log_file.write_text('2025-01-01T00:00:00 - llm.usage - INFO - llm_usage {"node": "epic", "latency": 1.5}\n')
+        llm = FakeChatModel("epic", config=FakeLLMConfig(latency="replay", latency_log_glob=str(tmp_path / "*.txt")))
+        assert llm._sample_latency(llm._rng("prompt")) == 1.5
+
+
+class TestOrchestratorWithFakeBackend:
+    def test_full_pipeline(self, orchestrator):
+        result = orchestrator.execute(user_input="할일 관리 앱을 만들어주세요", project_info="웹")
+
+        assert result["status"] == "completed"
+        assert result["total_epics"] == 2
+        assert result["total_stories"] == 4
+        assert result["total_story_points"] == 4
+        assert set(result["token_usage"]["nodes"]) == {"analyze", "epic", "story", "point"}
+        assert result["token_usage"]["total"]["calls"] == 1 + 1 + 2 + 4
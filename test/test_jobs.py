@@ -0,0 +1,179 @@
+import threading
+
+import pytest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from common.enums import JobStatus
+from orchestrator import jobs, routes
+from orchestrator.jobs import JobManager, JobQueueFullError, JobStore
+
+
+def _wait_for(manager: JobManager, job_id: str, timeout: float = 30.0):
+    done = threading.Event()
+    manager._callbacks[job_id] = lambda *_: done.set()
+    job = manager.store.get(job_id)
+    if job["status"] in (JobStatus.COMPLETED.value, JobStatus.FAILED.value):
+        return
+    assert done.wait(timeout)
+
+
+def test_job_api_returns_immediately_and_serves_result(orchestrator, tmp_path, monkeypatch):
+    monkeypatch.setattr("orchestrator.orchestrator._orchestrator_instance", orchestrator)
+    manager = JobManager(JobStore(str(tmp_path / "jobs.sqlite3")), max_workers=1)
+    monkeypatch.setattr(jobs, "_job_manager_instance", manager)
+
+    app = FastAPI()
+    app.include_router(routes.router)
+    client = TestClient(app)
+
+    response = client.post("/orchestrator/jobs", json={"user_input": "쇼핑몰 만들어줘", "project_info": "웹"})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    _wait_for(manager, job_id)
+
+    status = client.get(f"/orchestrator/jobs/{job_id}").json()
+    assert status["status"] == JobStatus.COMPLETED.value
+
+    result = client.get(f"/orchestrator/jobs/{job_id}/result").json()
+    assert result["total_epics"] == 2
+    assert result["total_story_points"] == 4
+
+    assert client.get("/orchestrator/jobs/unknown").status_code == 404
+
+
+def test_job_store_survives_restart(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+    store = JobStore(db_path)
+    job_id = store.create({"user_input": "테스트"})
+    assert store.claim(job_id, "worker-1", lease=60)
+    assert not store.claim(job_id, "worker-2", lease=60)
+    assert store.mark_finished(job_id, JobStatus.COMPLETED, result={"status": "completed"}, owner="worker-1")
+
+    reopened = JobStore(db_path).get(job_id, include_result=True)
+    assert reopened["status"] == JobStatus.COMPLETED.value
+    assert reopened["result"] == {"status": "completed"}
+
+
+def test_only_expired_running_jobs_are_failed_on_restart(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+    store = JobStore(db_path)
+    interrupted = store.create({"user_input": "중단된 작업"})
+    store.claim(interrupted, "dead-worker", lease=-1)
+    in_flight = store.create({"user_input": "다른 워커가 실행 중"})
+    store.claim(in_flight, "live-worker", lease=60)
+
+    manager = JobManager(JobStore(db_path))
+    assert manager.store.get(interrupted)["status"] == JobStatus.FAILED.value
+    assert manager.store.get(in_flight)["status"] == JobStatus.RUNNING.value
+    # lease를 잃은 워커의 결과는 기록하지 않음
+    assert not store.mark_finished(interrupted, JobStatus.COMPLETED, result={}, owner="dead-worker")
+
+
+def test_queued_job_runs_once_across_managers(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "jobs.sqlite3")
+    job_id = JobStore(db_path).create({"user_input": "테스트"})
+    runs = []
+    monkeypatch.setattr("orchestrator.orchestrator.get_orchestrator",
+                        lambda: type("Orchestrator", (), {"execute": lambda self, **kwargs: runs.append(1) or {}})())
+
+    managers = [JobManager(JobStore(db_path), max_workers=1) for _ in range(3)]
+    for manager in managers:
+        manager._executor.shutdown(wait=True)
+    assert runs == [1]
+    assert managers[0].store.get(job_id)["status"] == JobStatus.COMPLETED.value
+
+
+def test_submit_rejects_when_queue_full(tmp_path, monkeypatch):
+    manager = JobManager(JobStore(str(tmp_path / "jobs.sqlite3")), max_workers=1, max_queue_size=0)
+    release = threading.Event()
+    monkeypatch.setattr(manager, "_run", lambda job_id: release.wait(5))
+    try:
+        manager.submit({"user_input": "첫번째"})
+        with pytest.raises(JobQueueFullError):
+            manager.submit({"user_input": "두번째"})
+    finally:
+        release.set()
+
+
+def test_concurrent_submits_respect_queue_cap(tmp_path, monkeypatch):
+    manager = JobManager(JobStore(str(tmp_path / "jobs.sqlite3")), max_workers=1, max_queue_size=2)
+    release = threading.Event()
+    monkeypatch.setattr(manager, "_run", lambda job_id: release.wait(5))
+    accepted, rejected = [], []
+
+    def submit():
+        try:
+            accepted.append(manager.submit({"user_input": "작업"}))
+        except JobQueueFullError:
+            rejected.append(1)
+
+    threads = [threading.Thread(target=submit) for _ in range(10)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert (len(accepted), len(rejected)) == (3, 7)
+    finally:
+        release.set()
+
+
+def test_webhook_retries_back_off(tmp_path, monkeypatch):
+    import httpx
+
+    manager = JobManager(JobStore(str(tmp_path / "jobs.sqlite3")), webhook_backoff=0.5)
+    sleeps = []
+    monkeypatch.setattr(jobs.time, "sleep", sleeps.append)
+    monkeypatch.setattr(httpx, "post", lambda *args, **kwargs: (_ for _ in ()).throw(httpx.ConnectError("down")))
+
+    manager._send_webhook("job-1", JobStatus.COMPLETED, None, "http://hook", retries=3)
+    assert sleeps == [0.5, 1.0]
+
+
+def test_failed_workflow_result_marks_job_failed(tmp_path, monkeypatch):
+    from llm.factory import configure_llm_backend
+    from llm.fake import FakeLLMConfig
+    from orchestrator import agent_nodes
+    from orchestrator.orchestrator import ProjectManagementOrchestrator
+    from story_point.services import StoryPointEstimationAgent
+
+    configure_llm_backend("fake", FakeLLMConfig(epics=2, stories_per_epic=2, error_rate=1.0))
+    try:
+        monkeypatch.setattr(agent_nodes, "_epic_agent", None)
+        monkeypatch.setattr(agent_nodes, "_story_agent", None)
+        monkeypatch.setattr(agent_nodes, "_story_point_agent",
+                            StoryPointEstimationAgent(openai_api_key="fake",
+                                                      csv_file_path=str(tmp_path / "reference.csv")))
+        monkeypatch.setattr("orchestrator.orchestrator._orchestrator_instance", ProjectManagementOrchestrator())
+        manager = JobManager(JobStore(str(tmp_path / "jobs.sqlite3")), max_workers=1)
+
+        job_id = manager.submit({"user_input": "쇼핑몰 만들어줘", "project_info": "웹",
+                                 "options": {"coalesce": False}})
+        _wait_for(manager, job_id)
+    finally:
+        configure_llm_backend(None)
+
+    job = manager.store.get(job_id, include_result=True)
+    assert job["status"] == JobStatus.FAILED.value
+    assert job["result"]["status"] in ("error", "failed")
+    assert job["error"]
+
+
+def test_webhook_url_must_be_http_and_allowed(tmp_path):
+    manager = JobManager(JobStore(str(tmp_path / "jobs.sqlite3")),
+                         webhook_allowed_hosts=["n8n.example.com", ".hooks.example.com"])
+    manager.check_webhook_url("https://n8n.example.com/webhook/1")
+    manager.check_webhook_url("http://a.hooks.example.com/x")
+    for url in ("file:///etc/passwd", "ftp://n8n.example.com/", "http://169.254.169.254/latest",
+                "http://n8n.example.com.evil.com/", "https:///path"):
+        with pytest.raises(jobs.InvalidWebhookError):
+            manager.check_webhook_url(url)
+    with pytest.raises(jobs.InvalidWebhookError):
+        manager.submit({"user_input": "작업"}, webhook_url="http://internal:8080/")
+    assert manager.pending == 0
+
+    # 허용 목록이 없으면 웹훅 사용 불가
+    with pytest.raises(jobs.InvalidWebhookError):
+        JobManager(JobStore(str(tmp_path / "jobs2.sqlite3"))).check_webhook_url("https://n8n.example.com/")
@@ -0,0 +1,74 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from langchain_core.messages import AIMessage
+
+from llm.usage import (
+    estimate_cost,
+    record_llm_usage,
+    summarize_workflow_usage,
+    track_node_usage,
+    track_usage,
+)
+
+
+def _response(prompt_tokens, completion_tokens, cached_tokens=0, model="gpt-4o-mini-2024-07-18"):
+    return AIMessage(
+        content="[]",
+        response_metadata={
+            "model_name": model,
+            "token_usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens},
+            },
+        },
+    )
+
+
+class TestUsageRecording:
+    def test_estimate_cost_uses_versioned_model_prefix(self):
+        cost = estimate_cost("gpt-4o-mini-2024-07-18", 1_000_000, 0)
+        assert cost == pytest.approx(0.15)
+
+    def test_cached_tokens_are_discounted(self):
+        full = estimate_cost("gpt-4o-mini", 1000, 0, cached_tokens=0)
+        cached = estimate_cost("gpt-4o-mini", 1000, 0, cached_tokens=1000)
+        assert cached < full
+
+    def test_track_usage_aggregates_calls(self):
+        with track_usage("story") as recorder:
+            record_llm_usage(_response(100, 50, cached_tokens=20))
+            record_llm_usage(_response(200, 10))
+
+        summary = recorder.summary()
+        assert summary["calls"] == 2
+        assert summary["prompt_tokens"] == 300
+        assert summary["completion_tokens"] == 60
+        assert summary["cached_tokens"] == 20
+        assert summary["total_tokens"] == 360
+        assert summary["models"] == {"gpt-4o-mini-2024-07-18": 2}
+
+    def test_record_outside_scope_is_not_collected(self):
+        with track_usage("epic") as recorder:
+            pass
+        record_llm_usage(_response(10, 10))
+        assert recorder.summary()["calls"] == 0
+
+    def test_track_node_usage_merges_into_state(self):
+        @track_node_usage("epic")
+        def node(state):
+            record_llm_usage(_response(10, 5))
+            return {**state, "epics": []}
+
+        state = node({"token_usage": {"analyze": {"calls": 1, "total_tokens": 3}}})
+        assert set(state["token_usage"]) == {"analyze", "epic"}
+        assert state["token_usage"]["epic"]["total_tokens"] == 15
+
+        workflow = summarize_workflow_usage(state["token_usage"])
+        assert workflow["total"]["calls"] == 2
+        assert workflow["total"]["total_tokens"] == 18
@@ -0,0 +1,80 @@
+import json
+import os
+import re
+
+from utils.metrics import REGISTRY, MetricsRegistry
+
+
+def test_render_prometheus_text_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests", "요청 수")
+    latency = registry.histogram("latency_seconds", "지연", buckets=(0.1, 1.0))
+    requests.inc(node="epic")
+    requests.inc(2, node="epic")
+    latency.observe(0.05, node="epic")
+    latency.observe(0.5, node="epic")
+
+    text = registry.render()
+    assert '# TYPE requests counter' in text
+    assert 'requests_total{node="epic"} 3' in text
+    assert 'latency_seconds_bucket{node="epic",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{node="epic",le="+Inf"} 2' in text
+    assert 'latency_seconds_count{node="epic"} 2' in text
+
+
+def test_multiproc_snapshots_are_merged(tmp_path):
+    registry = MetricsRegistry(multiproc_dir=str(tmp_path))
+    counter = registry.counter("fallbacks", "fallback")
+    in_flight = registry.gauge("in_flight", "실행 중")
+    counter.inc(node="point")
+    in_flight.set(2)
+
+    # 다른 워커(살아있는 프로세스)와 종료된 워커의 스냅샷
+    for pid, value in [(os.getppid(), 1), (999999999, 5)]:
+        with open(tmp_path / f"metrics_{pid}.json", "w") as f:
+            json.dump({"pid": pid, "metrics": {
+                "fallbacks": [[[["node", "point"]], value]],
+                "in_flight": [[[], value]],
+            }}, f)
+
+    text = registry.render()
+    assert 'fallbacks_total{node="point"} 7' in text
+    assert "in_flight 3" in text
+
+
+
+def test_stale_snapshots_from_previous_run_are_removed(tmp_path):
+    registry = MetricsRegistry(multiproc_dir=str(tmp_path))
+    counter = registry.counter("fallbacks", "fallback")
+    counter.inc()
+    snapshots = {
+        "previous_run": {"pid": 999999999, "ppid": 999999998},  # 이전 서버 실행에서 종료된 워커
+        "restarted_worker": {"pid": 999999997, "ppid": os.getppid()},  # 같은 서버 실행에서 종료된 워커
+        "reused_pid": {"pid": os.getpid(), "ppid": 999999998},  # 현재 프로세스와 PID만 같은 이전 프로세스
+    }
+    for name, data in snapshots.items():
+        with open(tmp_path / f"metrics_{name}.json", "w") as f:
+            json.dump({**data, "metrics": {"fallbacks": [[[], 10]]}}, f)
+
+    assert registry.remove_stale_snapshots() == 2
+    assert os.listdir(tmp_path) == ["metrics_restarted_worker.json"]
+
+    # 같은 서버 실행에서 종료된 워커의 누적값은 계속 합산
+    registry.flush()
+    assert len(os.listdir(tmp_path)) == 2
+    assert "fallbacks_total 11" in registry.render()
+
+def test_gauge_function_evaluated_at_collection():
+    registry = MetricsRegistry()
+    sessions = {}
+    registry.gauge("sessions", "세션 수").set_function(lambda: len(sessions))
+    sessions["U1"] = {}
+    assert "sessions 1" in registry.render()
+
+
+def test_workflow_records_node_and_llm_metrics(orchestrator):
+    orchestrator.execute("쇼핑몰 만들어줘", "웹")
+    text = REGISTRY.render()
+    for node in ["analyze", "epic", "story", "point", "finalize"]:
+        assert f'workflow_node_duration_seconds_count{{node="{node}"}}' in text
+    assert re.search(r'llm_call_duration_seconds_count\{model="[^"]+",node="epic"\} \d+', text)
@@ -0,0 +1,100 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from llm.factory import configure_llm_backend
+from llm.fake import FakeLLMConfig
+from llm.router import (
+    ModelRoutingPolicy,
+    get_routing_policy,
+    select_model,
+    set_routing_policy,
+    use_model_overrides,
+)
+
+
+@pytest.fixture(autouse=True)
+def default_policy():
+    previous = get_routing_policy()
+    set_routing_policy(ModelRoutingPolicy())
+    yield
+    set_routing_policy(previous)
+
+
+class TestSelectModel:
+    def test_analyze_uses_smallest_model(self):
+        assert select_model("analyze", default="gpt-4o-mini") == ("gpt-4.1-nano", "policy")
+
+    def test_agent_default_when_no_policy(self):
+        assert select_model("story", default="gpt-4o-mini") == ("gpt-4o-mini", "default")
+
+    def test_long_project_info_upgrades_epic_model(self):
+        assert select_model("epic", default="gpt-4o-mini", project_info="짧음")[0] == "gpt-4o-mini"
+        assert select_model("epic", default="gpt-4o-mini", project_info="x" * 5000) == ("gpt-4o", "long_context")
+
+    def test_request_override_wins(self):
+        with use_model_overrides({"epic": "gpt-4.1"}):
+            assert select_model("epic", default="gpt-4o-mini", project_info="x" * 5000) == ("gpt-4.1", "request_override")
+        assert select_model("epic", default="gpt-4o-mini")[1] == "default"
+
+
+class TestRoutingInPipeline:
+    def test_models_reported_per_node(self, orchestrator):
+        result = orchestrator.execute(
+            user_input="할일 관리 앱",
+            options={"model_overrides": {"story": "gpt-4.1-mini"}}
+        )
+        nodes = result["token_usage"]["nodes"]
+        assert nodes["analyze"]["models"] == {"gpt-4.1-nano": 1}
+        assert nodes["story"]["models"] == {"gpt-4.1-mini": 2}
+        assert nodes["story"]["routes"] == {"gpt-4.1-mini:request_override": 2}
+
+    def test_low_confidence_points_are_escalated(self, orchestrator, tmp_path, monkeypatch):
+        from orchestrator import agent_nodes
+        from story_point.services import StoryPointEstimationAgent
+
+        configure_llm_backend("fake", FakeLLMConfig(epics=1, stories_per_epic=2, low_confidence_rate=1.0))
+        monkeypatch.setattr(
+            agent_nodes, "_story_point_agent",
+            StoryPointEstimationAgent(openai_api_key="fake", csv_file_path=str(tmp_path / "reference.csv"))
+        )
+        result = orchestrator.execute(user_input="할일 관리 앱")
+
+        point_usage = result["token_usage"]["nodes"]["point"]
+        assert point_usage["models"] == {"gpt-4o-mini": 2, "gpt-4o": 2}
+        assert point_usage["routes"]["gpt-4o:low_confidence_escalation"] == 2
+
+
+def test_overrides_default_is_not_shared():
+    from llm import router
+
+    assert router._model_overrides.get() is None
+    with use_model_overrides({}):
+        assert router._model_overrides.get() is None
+    assert select_model("story", default="gpt-4o-mini") == ("gpt-4o-mini", "default")
+
+
+def test_routing_update_requires_admin_token(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from orchestrator import routes
+
+    app = FastAPI()
+    app.include_router(routes.router)
+    client = TestClient(app)
+    body = {"node_models": {"story": "gpt-4o"}}
+
+    monkeypatch.delenv("ORCHESTRATOR_ADMIN_TOKEN", raising=False)
+    assert client.put("/orchestrator/model-routing", json=body).status_code == 403
+
+    monkeypatch.setenv("ORCHESTRATOR_ADMIN_TOKEN", "secret")
+    assert client.put("/orchestrator/model-routing", json=body).status_code == 401
+    assert client.put("/orchestrator/model-routing", json=body, headers={"X-Admin-Token": "wrong"}).status_code == 401
+    assert get_routing_policy().node_models == ModelRoutingPolicy().node_models
+
+    response = client.put("/orchestrator/model-routing", json=body, headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert select_model("story", default="gpt-4o-mini") == ("gpt-4o", "policy")
@@ -0,0 +1,208 @@
+import asyncio
+
+import pytest
+
+from slack_bot.outbox import NotionOutbox, NotionOutboxWorker
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _result(stories=1):
+    return {"status": "completed", "epic_results": [], "total_epics": 0, "total_stories": stories,
+            "total_story_points": 0}
+
+
+def test_jobs_survive_reopen_and_are_claimed_once(tmp_path):
+    db_path = str(tmp_path / "outbox.sqlite3")
+    job_id = NotionOutbox(db_path).enqueue("U1", "run1", _result())
+
+    outbox = NotionOutbox(db_path)
+    jobs = outbox.claim(10)
+    assert [job["id"] for job in jobs] == [job_id]
+    assert jobs[0]["result"]["total_stories"] == 1
+    assert NotionOutbox(db_path).claim(10) == []
+
+    assert outbox.complete(job_id, "page1", jobs[0]["claim_token"])
+    assert outbox.get(job_id)["status"] == "done"
+    assert outbox.stats()["depth"] == 0
+
+
+def test_pending_job_of_same_run_is_coalesced(tmp_path):
+    outbox = NotionOutbox(str(tmp_path / "outbox.sqlite3"))
+    first = outbox.enqueue("U1", "run1", _result(1))
+    assert outbox.enqueue("U1", "run1", _result(2)) == first
+    assert outbox.enqueue("U1", "run2", _result(3)) != first
+
+    jobs = outbox.claim(10)
+    assert [job["result"]["total_stories"] for job in jobs] == [2, 3]
+
+
+def test_resave_while_running_waits_for_running_job(tmp_path):
+    outbox = NotionOutbox(str(tmp_path / "outbox.sqlite3"))
+    first = outbox.enqueue("U1", "run1", _result(1))
+    claimed = outbox.claim(10)
+    assert [job["id"] for job in claimed] == [first]
+
+    # 처리 중에 다시 저장 - 새 작업으로 등록되지만 처리 중인 작업이 끝날 때까지 가져가지 않음
+    second = outbox.enqueue("U1", "run1", _result(2))
+    assert second != first
+    assert outbox.enqueue("U1", "run1", _result(3)) == second
+    assert outbox.claim(10) == []
+
+    outbox.complete(first, "page1", claimed[0]["claim_token"])
+    jobs = outbox.claim(10)
+    assert [(job["id"], job["result"]["total_stories"]) for job in jobs] == [(second, 3)]
+
+
+def test_retried_job_keeps_order_before_newer_save(tmp_path):
+    clock = FakeClock()
+    outbox = NotionOutbox(str(tmp_path / "outbox.sqlite3"), base_delay=10, clock=clock)
+    first = outbox.enqueue("U1", "run1", _result(1))
+    token = outbox.claim(10)[0]["claim_token"]
+    second = outbox.enqueue("U1", "run1", _result(2))
+    outbox.fail(first, "notion down", token)
+
+    # 먼저 등록된 작업의 재시도가 끝나기 전에는 나중 작업을 가져가지 않음 (이전 결과가 나중에 덮어쓰지 않도록)
+    assert outbox.claim(10) == []
+    clock.now += 10
+    retried = outbox.claim(10)
+    assert [job["id"] for job in retried] == [first]
+    outbox.complete(first, "page1", retried[0]["claim_token"])
+    assert [job["id"] for job in outbox.claim(10)] == [second]
+
+
+def test_done_jobs_are_purged_after_retention(tmp_path):
+    clock = FakeClock()
+    outbox = NotionOutbox(str(tmp_path / "outbox.sqlite3"), max_attempts=1, retention=100, clock=clock)
+    done = outbox.enqueue("U1", "run1", _result())
+    failed = outbox.enqueue("U1", "run2", _result())
+    tokens = {job["id"]: job["claim_token"] for job in outbox.claim(10)}
+    outbox.complete(done, "page1", tokens[done])
+    outbox.fail(failed, "notion down", tokens[failed])
+
+    clock.now += 100
+    assert outbox.purge() == 0
+    clock.now += 1
+    assert outbox.purge() == 1
+    assert outbox.get(done) is None
+    assert outbox.get(failed)["status"] == "failed"
+
+
+def test_reads_do_not_take_write_lock(tmp_path):
+    outbox = NotionOutbox(str(tmp_path / "outbox.sqlite3"))
+    job_id = outbox.enqueue("U1", "run1", _result())
+
+    writer = outbox._connect()
+    try:
+        assert outbox.get(job_id)["status"] == "pending"
+        assert outbox.stats()["depth"] == 1
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+
+def test_failed_job_is_retried_with_backoff_then_given_up(tmp_path):
+    clock = FakeClock()
+    outbox = NotionOutbox(str(tmp_path / "outbox.sqlite3"), max_attempts=3, base_delay=10, clock=clock)
+    job_id = outbox.enqueue("U1", "run1", _result())
+
+    token = outbox.claim(1)[0]["claim_token"]
+    assert outbox.fail(job_id, "rate limited", token) is True
+    assert outbox.claim(1) == []
+    clock.now += 10
+    jobs = outbox.claim(1)
+    assert [job["attempts"] for job in jobs] == [1]
+
+    assert outbox.fail(job_id, "rate limited", jobs[0]["claim_token"]) is True
+    clock.now += 19
+    assert outbox.claim(1) == []
+    clock.now += 1
+    token = outbox.claim(1)[0]["claim_token"]
+    assert outbox.fail(job_id, "rate limited", token) is False
+    assert outbox.get(job_id) == {"status": "failed", "attempts": 3, "last_error": "rate limited", "page_id": None}
+    assert outbox.stats()["depth"] == 0
+
+
+def test_expired_lease_makes_running_job_claimable_and_stats_report_age(tmp_path):
+    clock = FakeClock()
+    outbox = NotionOutbox(str(tmp_path / "outbox.sqlite3"), lease=60, clock=clock)
+    outbox.enqueue("U1", "run1", _result())
+    outbox.claim(1)
+
+    clock.now += 30
+    assert outbox.stats() == {"depth": 1, "oldest_age": 30.0}
+    assert outbox.claim(1) == []
+    clock.now += 31
+    assert len(outbox.claim(1)) == 1
+
+
+
+def test_stale_claim_cannot_complete_or_fail_reclaimed_job(tmp_path):
+    clock = FakeClock()
+    outbox = NotionOutbox(str(tmp_path / "outbox.sqlite3"), lease=60, clock=clock)
+    job_id = outbox.enqueue("U1", "run1", _result())
+    stale = outbox.claim(1)[0]
+
+    # lease 만료 후 다른 워커가 가져가면 이전 claim은 기록할 수 없음
+    clock.now += 61
+    current = outbox.claim(1)[0]
+    assert current["attempts"] == 1
+    assert outbox.complete(job_id, "stale-page", stale["claim_token"]) is False
+    assert outbox.fail(job_id, "stale error", stale["claim_token"]) is None
+    assert outbox.get(job_id) == {"status": "running", "attempts": 1, "last_error": None, "page_id": None}
+
+    assert outbox.complete(job_id, "page1", current["claim_token"]) is True
+    assert outbox.get(job_id)["page_id"] == "page1"
+
+
+def test_job_that_keeps_losing_its_lease_is_given_up(tmp_path):
+    clock = FakeClock()
+    outbox = NotionOutbox(str(tmp_path / "outbox.sqlite3"), max_attempts=3, lease=60, clock=clock)
+    job_id = outbox.enqueue("U1", "run1", _result())
+
+    # 처리 중 워커가 계속 종료되는 작업 - lease 만료도 시도로 세어 max_attempts 후 포기
+    assert [job["attempts"] for job in outbox.claim(1)] == [0]
+    clock.now += 61
+    assert [job["attempts"] for job in outbox.claim(1)] == [1]
+    clock.now += 61
+    assert [job["attempts"] for job in outbox.claim(1)] == [2]
+    clock.now += 61
+    assert outbox.claim(1) == []
+    assert outbox.get(job_id)["status"] == "failed"
+    assert outbox.get(job_id)["attempts"] == 3
+    assert outbox.stats()["depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_drains_in_batches_and_reports_final_failure(tmp_path):
+    outbox = NotionOutbox(str(tmp_path / "outbox.sqlite3"), max_attempts=1)
+    for i in range(5):
+        outbox.enqueue("U1", f"run{i}", _result(i))
+    processed, failed = [], []
+
+    async def process(job):
+        if job["run_id"] == "run3":
+            raise RuntimeError("notion down")
+        processed.append(job["run_id"])
+        return f"page-{job['run_id']}"
+
+    async def on_failed(job, error):
+        failed.append((job["run_id"], str(error)))
+
+    worker = NotionOutboxWorker(outbox, process, on_failed=on_failed, batch_size=2, poll_interval=60)
+    worker.start()
+    for _ in range(100):
+        if outbox.stats()["depth"] == 0 and failed:
+            break
+        await asyncio.sleep(0.01)
+    await worker.stop()
+
+    assert sorted(processed) == ["run0", "run1", "run2", "run4"]
+    assert failed == [("run3", "notion down")]
+    assert outbox.get(1)["page_id"] == "page-run0"
@@ -0,0 +1,415 @@
+import json
+import threading
+import time
+import uuid
+
+import httpx
+import pytest
+from notion_client.errors import APIResponseError
+
+from epic.models import Epic
+from notion_service.async_client import AsyncInstrumentedClient, AsyncNotionService
+from notion_service.client import (InstrumentedClient, NotionService, _backfill_block_ids, _is_unchanged,
+                                   _page_changes, _stable_properties, _with_block_ids)
+from notion_service.ratelimit import TokenBucket
+from story.models import Story
+from story_point.models import StoryPointEstimation
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class NotionStub:
+    """페이지/블록 생성·조회·수정·삭제를 흉내내는 Notion API 스텁 (httpx MockTransport)
+
+    페이지별 최상위 블록 목록을 기억해 blocks.children.list / after 삽입 / 삭제 결과를 확인할 수 있다.
+    """
+
+    def __init__(self, latency=0.0, rate_limited=0):
+        self.latency = latency
+        self.rate_limited = rate_limited
+        self.requests = []
+        self.children = {}  # page_id -> [block id]
+        self.blocks = {}    # block id -> block
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content or b"{}")
+        with self._lock:
+            self.requests.append((request.method, request.url.path, body))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            limited = self.rate_limited > 0
+            self.rate_limited -= int(limited)
+        try:
+            time.sleep(self.latency)
+            if limited:
+                return httpx.Response(429, headers={"Retry-After": "2"},
+                                      json={"object": "error", "code": "rate_limited", "message": "slow down"})
+            with self._lock:
+                return self._handle(request.method, request.url.path.split("/")[2:], body,
+                                    dict(request.url.params))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _new_blocks(self, children):
+        block_ids = []
+        for child in children:
+            block_id = str(uuid.uuid4())
+            self.blocks[block_id] = child
+            block_ids.append(block_id)
+        return block_ids
+
+    def _handle(self, method, parts, body, params):
+        if method == "POST" and parts == ["pages"]:
+            page_id = str(uuid.uuid4())
+            self.children[page_id] = self._new_blocks(body.get("children", []))
+            return httpx.Response(200, json={"object": "page", "id": page_id})
+        target = parts[1] if len(parts) > 1 else None
+        if parts[0] == "pages":
+            if target not in self.children:
+                return _not_found()
+            return httpx.Response(200, json={"object": "page", "id": target})
+        if len(parts) == 3 and method == "PATCH":
+            if target not in self.children:
+                return _not_found()
+            block_ids = self._new_blocks(body["children"])
+            siblings = self.children[target]
+            index = siblings.index(body["after"]) + 1 if body.get("after") else len(siblings)
+            siblings[index:index] = block_ids
+            return httpx.Response(200, json={"object": "list", "results": [{"id": i} for i in block_ids]})
+        if len(parts) == 3 and method == "GET":
+            siblings = self.children.get(target, [])
+            start = int(params.get("start_cursor", 0))
+            size = int(params.get("page_size", 100))
+            has_more = start + size < len(siblings)
+            return httpx.Response(200, json={
+                "object": "list", "results": [{"id": i} for i in siblings[start:start + size]],
+                "has_more": has_more, "next_cursor": str(start + size) if has_more else None
+            })
+        if method == "DELETE":
+            for siblings in self.children.values():
+                if target in siblings:
+                    siblings.remove(target)
+            return httpx.Response(200, json={"object": "block", "id": target})
+        self.blocks[target] = body
+        return httpx.Response(200, json={"object": "block", "id": target})
+
+    def page_text(self, page_id):
+        """페이지 최상위 블록의 텍스트 목록"""
+        texts = []
+        for block_id in self.children[page_id]:
+            block = self.blocks[block_id]
+            content = block.get(block.get("type")) or next(value for value in block.values() if isinstance(value, dict))
+            texts.append("".join(item["text"]["content"] for item in content.get("rich_text", [])))
+        return texts
+
+
+def _not_found():
+    return httpx.Response(404, json={"object": "error", "code": "object_not_found", "message": "not found"})
+
+
+def _service(monkeypatch, stub, limiter=None, max_concurrency=4, sync_db_path=""):
+    monkeypatch.setenv("NOTION_TOKEN", "secret")
+    monkeypatch.setenv("NOTION_DATABASE_ID", "db")
+    monkeypatch.setenv("NOTION_SYNC_DB_PATH", sync_db_path)
+    service = NotionService()
+    service.max_concurrency = max_concurrency
+    service.client = InstrumentedClient(auth="secret", client=httpx.Client(transport=httpx.MockTransport(stub)),
+                                        rate_limiter=limiter, max_retries=3)
+    return service
+
+
+def test_token_bucket_allows_burst_then_average_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=3.0, burst=5, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        assert bucket.acquire() == 0.0
+    for _ in range(6):
+        bucket.acquire()
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_token_bucket_pause_blocks_all_requests():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=3.0, burst=5, clock=clock, sleep=clock.sleep)
+    bucket.pause(2.0)
+    bucket.acquire()
+    # Retry-After 후 burst 없이 재개
+    assert clock.now == pytest.approx(2.0 + 1 / 3)
+
+
+def test_rate_limited_request_is_retried_after_retry_after(monkeypatch):
+    clock = FakeClock()
+    stub = NotionStub(rate_limited=2)
+    service = _service(monkeypatch, stub, TokenBucket(rate=100, burst=10, clock=clock, sleep=clock.sleep))
+
+    service.client.pages.create(parent={"database_id": "db"}, properties={})
+    assert len(stub.requests) == 3
+    assert clock.now >= 4.0
+
+    stub.rate_limited = 10
+    with pytest.raises(APIResponseError):
+        service.client.pages.create(parent={"database_id": "db"}, properties={})
+
+
+def test_step_pages_are_created_concurrently_in_order(monkeypatch):
+    stub = NotionStub(latency=0.05)
+    service = _service(monkeypatch, stub, TokenBucket(rate=1000, burst=100), max_concurrency=4)
+    created = []
+    original = service.create_epic_page
+    monkeypatch.setattr(service, "create_epic_page", lambda data: created.append(data["title"]) or original(data))
+    epics = [Epic(title=f"에픽 {i}", description="설명", business_value="가치", priority="High", included_tasks=[])
+             for i in range(8)]
+
+    start = time.perf_counter()
+    page_ids = service.create_step_by_step_pages({"epics": epics}, "epic")
+    elapsed = time.perf_counter() - start
+
+    assert len(page_ids) == 8 and len(set(page_ids)) == 8
+    assert sorted(created) == [f"에픽 {i}" for i in range(8)]
+    assert stub.max_in_flight > 1
+    assert elapsed < 8 * 0.05  # 순차 실행(요청 8회)보다 빠름
+
+
+def test_pages_are_created_with_children_in_one_request(monkeypatch):
+    stub = NotionStub()
+    service = _service(monkeypatch, stub)
+
+    service.create_epic_page({"title": "에픽", "description": "설명", "acceptance_criteria": ["기준 1", "기준 2"]})
+    assert len(stub.requests) == 1
+    method, path, body = stub.requests[0]
+    assert (method, path) == ("POST", "/v1/pages")
+    assert len(body["children"]) == 5
+
+    # 100개를 넘는 블록만 이어 붙임
+    stub.requests.clear()
+    epic_results = [
+        {"epic": Epic(title=f"에픽 {i}", description="설명", business_value="가치", priority="High",
+                      acceptance_criteria=["기준"] * 5, included_tasks=[]),
+         "stories": [], "story_points": []}
+        for i in range(15)
+    ]
+    service.create_project_page({"project_name": "P", "epic_results": epic_results})
+    assert [(method, path.split("/")[2]) for method, path, _ in stub.requests] == [("POST", "pages"),
+                                                                                   ("PATCH", "blocks")]
+    assert len(stub.requests[0][2]["children"]) == 100
+    assert len(stub.requests[1][2]["children"]) == 3 + 15 * 11 - 100  # 개요 3개 + 에픽당 11개
+
+
+def test_blocks_are_streamed_in_chunks(monkeypatch):
+    stub = NotionStub()
+    service = _service(monkeypatch, stub)
+    produced = []
+    produced_at_request = []
+
+    def record(request):
+        produced_at_request.append(len(produced))
+        return NotionStub.__call__(stub, request)
+
+    service.client = InstrumentedClient(auth="secret", client=httpx.Client(transport=httpx.MockTransport(record)),
+                                        max_retries=3)
+
+    def blocks():
+        for i in range(350):
+            produced.append(i)
+            yield {"object": "block", "type": "paragraph",
+                   "paragraph": {"rich_text": [{"type": "text", "text": {"content": str(i)}}]}}
+
+    page_id = service._create_page({"Name": {"title": []}}, blocks())
+    assert [len(body["children"]) for _, _, body in stub.requests] == [100, 100, 100, 50]
+    # 첫 묶음이 차자마자 페이지 생성, 이후에도 전송 중인 묶음 외에 최대 한 묶음만 미리 생성
+    assert produced_at_request[0] == 100
+    assert all(count <= 100 * (n + 2) for n, count in enumerate(produced_at_request))
+    assert stub.page_text(page_id) == [str(i) for i in range(350)]
+
+
+def _requests(stub):
+    return [(method, "/".join("{id}" if len(part) == 36 else part for part in path.split("/")[2:]))
+            for method, path, _ in stub.requests]
+
+
+def test_resaving_only_writes_changed_properties_and_blocks(monkeypatch, tmp_path):
+    stub = NotionStub()
+    service = _service(monkeypatch, stub, sync_db_path=str(tmp_path / "sync.sqlite3"))
+    story = {"id": "s1", "title": "로그인", "description": "설명", "domain": "backend", "story_type": "feature",
+             "acceptance_criteria": ["기준 1"]}
+
+    page_id = service.create_story_page(story)
+    assert _requests(stub) == [("POST", "pages")]
+
+    # 변경 없음 - 요청 없음
+    stub.requests.clear()
+    assert service.create_story_page(story) == page_id
+    assert stub.requests == []
+
+    # 포인트 추정 단계: SP 속성 갱신 + 포인트 정보 블록만 추가
+    stub.requests.clear()
+    pointed = {**story, "story_point": {"estimated_point": 5, "estimation_method": "same_area", "reasoning": "근거"}}
+    assert service.create_story_page(pointed) == page_id
+    assert _requests(stub) == [("PATCH", "pages/{id}"), ("GET", "blocks/{id}/children"),
+                               ("PATCH", "blocks/{id}/children")]
+    assert stub.requests[0][2]["properties"]["SP"] == {"number": 5}
+    assert "날짜" not in stub.requests[0][2]["properties"]
+    assert stub.page_text(page_id)[-3:] == ["추정 포인트: 5", "추정 방법: same_area", "추정 근거: 근거"]
+
+    # 설명만 변경 - 블록 id를 이미 알고 있으므로 해당 블록만 수정
+    stub.requests.clear()
+    service.create_story_page({**pointed, "description": "새 설명"})
+    assert _requests(stub) == [("PATCH", "blocks/{id}")]
+    assert stub.page_text(page_id)[1] == "새 설명"
+
+    # 수용 기준 제거 - 중간 블록 교체/삭제 후에도 순서 유지
+    stub.requests.clear()
+    service.create_story_page({**pointed, "description": "새 설명", "acceptance_criteria": []})
+    assert stub.page_text(page_id) == ["Story 설명", "새 설명", "스토리 포인트 정보", "추정 포인트: 5",
+                                       "추정 방법: same_area", "추정 근거: 근거"]
+
+
+def test_deleted_page_is_recreated(monkeypatch, tmp_path):
+    stub = NotionStub()
+    service = _service(monkeypatch, stub, sync_db_path=str(tmp_path / "sync.sqlite3"))
+    epic = {"id": "e1", "title": "에픽", "description": "설명", "priority": "High"}
+    page_id = service.create_epic_page(epic)
+
+    del stub.children[page_id]
+    new_page_id = service.create_epic_page({**epic, "priority": "Low"})
+    assert new_page_id != page_id
+    assert service.create_epic_page({**epic, "priority": "Low"}) == new_page_id
+
+
+def test_project_page_is_synced_per_run(monkeypatch, tmp_path):
+    stub = NotionStub()
+    service = _service(monkeypatch, stub, sync_db_path=str(tmp_path / "sync.sqlite3"))
+    epic = Epic(title="에픽", description="설명", business_value="가치", priority="High", included_tasks=[])
+    project = {"project_name": "P", "run_id": "run1", "epic_results": [
+        {"epic": epic, "stories": [], "story_points": []}
+    ]}
+
+    page_id = service.create_project_page(project)
+    stub.requests.clear()
+    assert service.create_project_page(project) == page_id
+    assert stub.requests == []
+    assert service.create_project_page({**project, "run_id": "run2"}) != page_id
+
+
+def _point(story_title, estimated_point, story_id=None):
+    return StoryPointEstimation(story_title=story_title, story_id=story_id, estimated_point=estimated_point,
+                                domain="backend", estimation_method="same_area", reasoning="근거",
+                                confidence_level="high")
+
+
+def test_story_points_are_joined_by_story_id_with_title_fallback(monkeypatch):
+    stub = NotionStub()
+    service = _service(monkeypatch, stub)
+    epic = Epic(title="에픽", description="설명", business_value="가치", priority="High", included_tasks=[])
+    first, second, legacy = [Story(epic_id=epic.id, title=title, description="설명", domain="backend",
+                                   story_type="feature") for title in ("로그인", "로그인", "회원가입")]
+    # 같은 제목의 두 스토리 - 포인트 순서를 스토리와 반대로
+    points = [_point("로그인", 8, second.id), _point("로그인", 2, first.id), _point("회원가입", 5)]
+
+    service.create_step_by_step_pages({"stories": [first, second, legacy], "story_points": points}, "point")
+    # 페이지는 동시에 생성되므로 요청 순서 대신 티켓 ID(스토리 id)로 비교
+    points_by_story = {body["properties"]["티켓 ID"]["rich_text"][0]["text"]["content"]: body["properties"]["SP"]
+                       for _, _, body in stub.requests}
+    assert points_by_story == {f"STORY-{first.id}": {"number": 2}, f"STORY-{second.id}": {"number": 8},
+                               f"STORY-{legacy.id}": {"number": 5}}
+
+    stub.requests.clear()
+    page_id = service.create_project_page({"project_name": "P", "epic_results": [
+        {"epic": epic, "stories": [first, second, legacy], "story_points": points}
+    ]})
+    texts = stub.page_text(page_id)
+    assert texts[1].endswith("15개 스토리 포인트")
+    assert ["로그인 - 2pt", "로그인 - 8pt", "회원가입 - 5pt"] == [text for text in texts if "pt" in text]
+
+
+def _async_service(monkeypatch, stub, sync_db_path=""):
+    monkeypatch.setenv("NOTION_TOKEN", "secret")
+    monkeypatch.setenv("NOTION_DATABASE_ID", "db")
+    monkeypatch.setenv("NOTION_SYNC_DB_PATH", sync_db_path)
+    service = AsyncNotionService()
+    service.client = AsyncInstrumentedClient(auth="secret",
+                                             client=httpx.AsyncClient(transport=httpx.MockTransport(stub)),
+                                             rate_limiter=None, max_retries=3)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_async_service_exports_and_syncs_pages(monkeypatch, tmp_path):
+    stub = NotionStub(rate_limited=1)
+    service = _async_service(monkeypatch, stub, sync_db_path=str(tmp_path / "sync.sqlite3"))
+    monkeypatch.setattr("notion_service.async_client.asyncio.sleep", _no_sleep)
+    epics = [Epic(title=f"에픽 {i}", description="설명", business_value="가치", priority="High",
+                  acceptance_criteria=["기준"] * 5, included_tasks=[]) for i in range(15)]
+    project = {"project_name": "P", "run_id": "run1",
+               "epic_results": [{"epic": epic, "stories": [], "story_points": []} for epic in epics]}
+
+    # 429 재시도 후 생성, 100개 초과 블록은 이어 붙임
+    page_id = await service.create_project_page(project)
+    assert _requests(stub) == [("POST", "pages"), ("POST", "pages"), ("PATCH", "blocks/{id}/children")]
+    assert len(stub.page_text(page_id)) == 3 + 15 * 11
+
+    stub.requests.clear()
+    assert await service.create_project_page(project) == page_id
+    assert stub.requests == []
+
+    page_ids = await service.create_step_by_step_pages({"epics": epics}, "epic")
+    assert [stub.page_text(pid)[1] for pid in page_ids] == ["설명"] * 15
+    assert len(set(page_ids)) == 15
+
+    stub.requests.clear()
+    await service.update_workflow_progress(page_id, ["epic"], {"total_epics": 15})
+    assert _requests(stub) == [("PATCH", "blocks/{id}/children")]
+    assert stub.page_text(page_id)[-6:-1] == ["🔄 워크플로우 진행 상황", "✅ 에픽 생성", "⏳ 스토리 생성",
+                                            "⏳ 스토리 포인트 추정", "📊 현재까지 결과: 에픽 15개, 스토리 0개, 총 SP 0개"]
+
+
+@pytest.mark.asyncio
+async def test_async_service_updates_only_changed_blocks(monkeypatch, tmp_path):
+    stub = NotionStub()
+    service = _async_service(monkeypatch, stub, sync_db_path=str(tmp_path / "sync.sqlite3"))
+    story = {"id": "s1", "title": "로그인", "description": "설명", "domain": "backend", "story_type": "feature",
+             "acceptance_criteria": ["기준 1"]}
+    page_id = await service.create_story_page(story)
+
+    stub.requests.clear()
+    await service.create_story_page({**story, "description": "새 설명", "acceptance_criteria": []})
+    assert _requests(stub)[0] == ("GET", "blocks/{id}/children")
+    assert stub.page_text(page_id) == ["Story 설명", "새 설명"]
+
+
+async def _no_sleep(seconds):
+    pass
+
+
+def test_sync_decision_helpers_shared_by_sync_and_async_services():
+    properties = {"이름": {"title": []}, "날짜": {"date": {"start": "2026-01-01"}}}
+    stable, properties_hash = _stable_properties(properties)
+    assert stable == {"이름": {"title": []}}
+    assert _stable_properties({**properties, "날짜": {"date": {"start": "2026-02-01"}}})[1] == properties_hash
+
+    children = ({"type": "paragraph", "paragraph": {"rich_text": []}} for _ in range(2))
+    changed, children, blocks = _page_changes({"properties_hash": properties_hash}, properties_hash, children)
+    assert not changed and len(children) == 2 and all(block["id"] is None for block in blocks)
+    assert _is_unchanged({"blocks": blocks}, changed, blocks)
+    assert not _is_unchanged({"blocks": blocks}, True, blocks)
+
+    # 블록 수가 같으면 조회한 id를 채우고, 다르면(Notion에서 편집) 전체 다시 작성
+    assert [block["id"] for block in _backfill_block_ids(blocks, ["a", "b"])] == ["a", "b"]
+    assert _backfill_block_ids(blocks, ["a"]) is None
+    # 응답에 id가 부족해도 블록 매핑 길이는 유지
+    assert [block["id"] for block in _with_block_ids(blocks, ["a"])] == ["a", None]
@@ -0,0 +1,229 @@
+import asyncio
+import importlib
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from slack_bot.dedupe import SlackDeduplicator, SubmissionRegistry
+from slack_bot.outbox import NotionOutbox
+from slack_bot.scheduler import FairScheduler
+from slack_bot.sessions import SlackSessionStore
+from slack_bot.workers import SlackTaskExecutor
+
+
+class FakeAsyncSlackClient:
+    def __init__(self):
+        self.calls = []
+
+    async def conversations_open(self, **kwargs):
+        self.calls.append(("conversations_open", kwargs))
+        return {"channel": {"id": "D1"}}
+
+    async def chat_postMessage(self, **kwargs):
+        self.calls.append(("chat_postMessage", kwargs))
+        return {"ts": f"{len(self.calls)}.0"}
+
+    async def chat_update(self, **kwargs):
+        self.calls.append(("chat_update", kwargs))
+        return {"ok": True}
+
+    async def files_upload_v2(self, **kwargs):
+        with open(kwargs["file"], "rb") as fp:
+            kwargs["data"] = fp.read()
+        self.calls.append(("files_upload_v2", kwargs))
+        return {"file": {"permalink": "https://files.example/1"}}
+
+
+@pytest.fixture
+def slack_bot(monkeypatch, tmp_path, orchestrator):
+    monkeypatch.setenv("SLACK_BOT_TOKEN", "xoxb-test")
+    monkeypatch.setenv("SLACK_SIGNING_SECRET", "secret")
+    bot = importlib.import_module("slack_bot.bot")
+
+    executor = SlackTaskExecutor(max_workers=1)
+    monkeypatch.setattr("orchestrator.orchestrator._orchestrator_instance", orchestrator)
+    monkeypatch.setattr("slack_bot.sessions._session_store_instance", SlackSessionStore(str(tmp_path / "s.sqlite3")))
+    monkeypatch.setattr("slack_bot.workers._slack_executor_instance", executor)
+    monkeypatch.setattr("slack_bot.scheduler._fair_scheduler_instance", FairScheduler(max_concurrent=1))
+    dedupe_db = str(tmp_path / "dedupe.sqlite3")
+    monkeypatch.setattr("slack_bot.dedupe._slack_deduplicator_instance", SlackDeduplicator(dedupe_db))
+    monkeypatch.setattr("slack_bot.dedupe._submission_registry_instance", SubmissionRegistry(dedupe_db))
+    monkeypatch.setattr("slack_bot.outbox._notion_outbox_instance", NotionOutbox(str(tmp_path / "outbox.sqlite3")))
+    monkeypatch.setattr(bot, "outbox_worker", None)
+    yield bot, executor
+    executor.shutdown()
+
+
+def _view(description):
+    return {"state": {"values": {
+        "project_description": {"description_input": {"value": description}},
+        "project_info": {"info_input": {"value": "웹"}},
+    }}}
+
+
+@pytest.mark.asyncio
+async def test_submission_acks_immediately_and_posts_result_to_dm(slack_bot):
+    bot, executor = slack_bot
+    client = FakeAsyncSlackClient()
+    acks = []
+
+    async def ack(**kwargs):
+        acks.append(kwargs)
+
+    start = time.perf_counter()
+    await bot.handle_project_submission(ack=ack, body={"user": {"id": "U1"}}, client=client,
+                                        view=_view("쇼핑몰 만들어줘"))
+    assert time.perf_counter() - start < 0.05
+    assert acks == [{}]
+    assert client.calls == []
+
+    await executor.join()
+    names = [name for name, _ in client.calls]
+    assert names[:2] == ["conversations_open", "chat_postMessage"]
+    assert "chat_update" in names
+    completed = client.calls[-1][1]
+    assert completed["text"] == "✅ 분석이 완료되었습니다!"
+
+    run_id = completed["blocks"][1]["elements"][0]["value"]
+    await bot.handle_show_epics(ack=ack, body={"user": {"id": "U1"}, "actions": [{"value": run_id}]}, client=client)
+    assert client.calls[-1][1]["text"].startswith("생성된 에픽")
+
+
+@pytest.mark.asyncio
+async def test_duplicate_submission_attaches_to_in_flight_run(slack_bot, orchestrator, monkeypatch):
+    bot, executor = slack_bot
+    runs = []
+    original_execute = orchestrator.execute
+    monkeypatch.setattr(orchestrator, "execute", lambda **kwargs: runs.append(1) or original_execute(**kwargs))
+    client = FakeAsyncSlackClient()
+
+    async def ack(**kwargs):
+        pass
+
+    body = {"user": {"id": "U1"}}
+    await bot.handle_project_submission(ack=ack, body=body, client=client, view=_view("쇼핑몰 만들어줘"))
+    await bot.handle_project_submission(ack=ack, body=body, client=client, view=_view("쇼핑몰  만들어줘"))
+    await executor.join()
+    assert len(runs) == 1
+    texts = [kwargs.get("text") for name, kwargs in client.calls if name == "chat_postMessage"]
+    assert texts.count("✅ 분석이 완료되었습니다!") == 1
+    assert any(text.startswith("⏳ 같은 요청을 이미 분석 중입니다") for text in texts)
+
+    # 완료 후 TTL 안의 재제출은 기존 결과로 안내
+    await bot.handle_project_submission(ack=ack, body=body, client=client, view=_view("쇼핑몰 만들어줘"))
+    await executor.join()
+    assert len(runs) == 1
+    assert client.calls[-1][1]["text"] == "✅ 같은 요청의 분석 결과가 이미 있습니다."
+
+
+@pytest.mark.asyncio
+async def test_queued_submission_is_told_its_position(slack_bot):
+    bot, executor = slack_bot
+    clients = {"U1": FakeAsyncSlackClient(), "U2": FakeAsyncSlackClient()}
+
+    async def ack(**kwargs):
+        pass
+
+    for user_id, client in clients.items():
+        await bot.handle_project_submission(ack=ack, body={"user": {"id": user_id, "team_id": "T1"}},
+                                            client=client, view=_view(f"{user_id} 쇼핑몰"))
+    await executor.join()
+
+    first = [kwargs["text"] for name, kwargs in clients["U1"].calls if name == "chat_postMessage"]
+    second = [kwargs["text"] for name, kwargs in clients["U2"].calls if name == "chat_postMessage"]
+    assert not any(text.startswith("⏳ 분석 요청이 대기열에") for text in first)
+    assert second[0] == "⏳ 분석 요청이 대기열에 등록되었습니다. 대기 순번: 1번째 (앞에 0건)"
+    assert second[-1] == "✅ 분석이 완료되었습니다!"
+    assert bot.get_fair_scheduler().running == 0
+
+
+@pytest.mark.asyncio
+async def test_export_uploads_single_file_with_summary(slack_bot):
+    bot, executor = slack_bot
+    client = FakeAsyncSlackClient()
+
+    async def ack(**kwargs):
+        pass
+
+    await bot.handle_project_submission(ack=ack, body={"user": {"id": "U1"}}, client=client,
+                                        view=_view("쇼핑몰 만들어줘"))
+    await executor.join()
+    overflow = client.calls[-1][1]["blocks"][1]["elements"][-1]
+    assert overflow["action_id"] == "export_result"
+    csv_option = next(option for option in overflow["options"] if option["value"].endswith(":csv"))
+
+    await bot.handle_export_result(ack=ack, client=client, body={
+        "user": {"id": "U1"}, "channel": {"id": "D1"}, "actions": [{"selected_option": csv_option}]
+    })
+    await executor.join()
+    name, upload = client.calls[-1]
+    assert name == "files_upload_v2"
+    assert upload["channel"] == "D1" and upload["filename"].endswith(".csv")
+    assert upload["initial_comment"].startswith("📎 *분석 결과 파일 (CSV)*")
+    assert upload["data"].decode("utf-8-sig").count("\n") == 5  # 헤더 + 스토리 4개
+    assert not os.path.exists(upload["file"])
+
+
+class FakeNotionService:
+    def __init__(self):
+        self.saved = []
+
+    async def create_project_page(self, project_data):
+        self.saved.append(project_data)
+        return "0f0e-page"
+
+    def get_page_url(self, page_id):
+        return f"https://www.notion.so/{page_id}"
+
+
+@pytest.mark.asyncio
+async def test_approval_queues_notion_save_and_posts_page_url(slack_bot, monkeypatch):
+    bot, executor = slack_bot
+    client = FakeAsyncSlackClient()
+    notion = FakeNotionService()
+    monkeypatch.setattr("notion_service.async_client._async_notion_service", notion)
+    monkeypatch.setattr(bot.app, "_async_client", client)
+
+    async def ack(**kwargs):
+        pass
+
+    await bot.handle_project_submission(ack=ack, body={"user": {"id": "U1"}}, client=client,
+                                        view=_view("쇼핑몰 만들어줘"))
+    await executor.join()
+    run_id = client.calls[-1][1]["blocks"][1]["elements"][0]["value"]
+
+    await bot.handle_approve_and_save(ack=ack, body={"user": {"id": "U1"}, "actions": [{"value": run_id}]},
+                                      client=client)
+    assert client.calls[-1][1]["text"] == "🔄 노션에 프로젝트 페이지를 생성하고 있습니다..."
+    outbox = bot.get_notion_outbox()
+    for _ in range(200):
+        if outbox.stats()["depth"] == 0:
+            break
+        await asyncio.sleep(0.01)
+    await bot.stop_outbox_worker()
+
+    assert [data["run_id"] for data in notion.saved] == [run_id]
+    done = client.calls[-1][1]
+    assert done["text"] == "✅ 노션 페이지가 성공적으로 생성되었습니다!"
+    assert done["blocks"][1]["elements"][0]["url"] == "https://www.notion.so/0f0e-page"
+
+
+@pytest.mark.asyncio
+async def test_retried_delivery_is_acknowledged_without_running_listeners(slack_bot):
+    bot, _ = slack_bot
+    calls = []
+
+    async def next_():
+        calls.append(1)
+        return "listener"
+
+    req = SimpleNamespace(body={"event_id": "Ev1"}, headers={})
+    assert await bot.drop_duplicate_deliveries(req, None, next_) == "listener"
+
+    retry = SimpleNamespace(body={"event_id": "Ev1"}, headers={"x-slack-retry-num": ["1"]})
+    response = await bot.drop_duplicate_deliveries(retry, None, next_)
+    assert response.status == 200
+    assert response.headers["x-slack-no-retry"] == ["1"]
+    assert calls == [1]
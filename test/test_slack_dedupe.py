@@ -0,0 +1,66 @@
+from slack_bot.dedupe import SlackDeduplicator, SubmissionRegistry, delivery_key, submission_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_delivery_keys_are_stable_across_retries():
+    assert delivery_key({"event_id": "Ev1", "event": {}}) == "event:Ev1"
+    view = {"type": "view_submission", "trigger_id": "t1", "view": {"id": "V1", "hash": "h1"}}
+    assert delivery_key(view) == "view:V1:h1"
+    assert delivery_key({"type": "block_actions", "trigger_id": "t2"}) == "trigger:t2"
+    assert delivery_key({}) is None
+
+
+def test_deduplicator_expires_after_ttl(tmp_path):
+    clock = FakeClock()
+    dedupe = SlackDeduplicator(str(tmp_path / "dedupe.sqlite3"), ttl=10, clock=clock)
+    assert not dedupe.seen("event:Ev1")
+    assert dedupe.seen("event:Ev1")
+    clock.now = 11
+    assert not dedupe.seen("event:Ev1")
+
+
+def test_submission_key_normalizes_whitespace_and_is_per_user():
+    assert submission_key("U1", "쇼핑몰  만들어줘 ", "웹") == submission_key("U1", "쇼핑몰 만들어줘", "웹")
+    assert submission_key("U1", "쇼핑몰 만들어줘", "웹") != submission_key("U2", "쇼핑몰 만들어줘", "웹")
+
+
+def test_deduplicator_is_shared_across_workers(tmp_path):
+    # 같은 DB를 쓰는 다른 프로세스의 인스턴스 - 재전송이 다른 워커로 가도 걸러짐
+    db_path = str(tmp_path / "dedupe.sqlite3")
+    assert not SlackDeduplicator(db_path).seen("event:Ev1")
+    assert SlackDeduplicator(db_path).seen("event:Ev1")
+
+
+def test_registry_attaches_duplicates_until_ttl_after_completion(tmp_path):
+    clock = FakeClock()
+    registry = SubmissionRegistry(str(tmp_path / "dedupe.sqlite3"), ttl=10, clock=clock)
+    assert registry.claim("k") is None
+    assert registry.claim("k")["status"] == "running"
+
+    registry.complete("k", "run1")
+    assert registry.claim("k") == {"status": "completed", "run_id": "run1", "expires_at": 10, "duplicates": 2}
+    clock.now = 11
+    assert registry.claim("k") is None
+
+    registry.release("k")
+    assert registry.claim("k") is None
+
+
+def test_registry_is_shared_across_workers_and_running_entries_expire(tmp_path):
+    clock = FakeClock()
+    db_path = str(tmp_path / "dedupe.sqlite3")
+    first = SubmissionRegistry(db_path, running_ttl=60, clock=clock)
+    second = SubmissionRegistry(db_path, running_ttl=60, clock=clock)
+    assert first.claim("k") is None
+    assert second.claim("k")["status"] == "running"
+
+    # 분석 중 워커가 종료되어 complete/release가 호출되지 않아도 running_ttl 후 다시 제출 가능
+    clock.now = 61
+    assert second.claim("k") is None
@@ -0,0 +1,89 @@
+import csv
+import io
+import os
+import tracemalloc
+
+import pytest
+
+from epic.models import Epic
+from slack_bot.export import ExportError, export_result, iter_export_rows, write_csv, write_markdown
+from story.models import Story
+from story_point.models import StoryPointEstimation
+
+
+@pytest.fixture
+def make_export_result(make_result):
+    """내보내기용 결과 팩토리 - 여러 줄/파이프가 든 설명, 에픽마다 마지막 스토리는 포인트 없음"""
+    def factory(epics=2, stories_per_epic=3):
+        return make_result(epics, stories_per_epic, description="여러 줄\n설명 | 파이프",
+                           acceptance_criteria=["기준 1", "기준 2"], domain="backend",
+                           complexity_factors=["인증", "외부 연동"], unestimated_per_epic=1)
+    return factory
+
+
+def test_rows_join_points_by_story_title(make_export_result):
+    rows = list(iter_export_rows(make_export_result()))
+    assert len(rows) == 6
+    assert rows[0][:4] == ["에픽 0", "High", "스토리 0-0", "backend"]
+    assert rows[0][5:9] == ["기준 1 / 기준 2", 3, "high", "인증, 외부 연동"]
+    assert rows[2][6] == ""
+
+
+def test_csv_and_markdown_render_every_story(make_export_result):
+    fp = io.StringIO()
+    assert write_csv(make_export_result(), fp) == 6
+    parsed = list(csv.reader(io.StringIO(fp.getvalue())))
+    assert parsed[0][2] == "스토리"
+    assert parsed[1][4] == "여러 줄\n설명 | 파이프"
+
+    fp = io.StringIO()
+    assert write_markdown(make_export_result(), fp) == 6
+    text = fp.getvalue()
+    assert text.count("\n## ") == 2
+    assert "| 스토리 0-0 | backend | 여러 줄<br>설명 \\| 파이프 |" in text
+
+
+def test_export_writes_temp_file_and_streams(tmp_path, make_export_result):
+    path, filename, rows = export_result(make_export_result(), "csv", directory=str(tmp_path), basename="run1")
+    assert filename == "run1.csv" and rows == 6
+    with open(path, encoding="utf-8-sig") as fp:
+        assert fp.readline().startswith("에픽,")
+    os.remove(path)
+
+    # 스토리 수가 늘어도 렌더링 중 메모리 사용량은 거의 그대로 (결과 객체 제외)
+    large = make_export_result(epics=20, stories_per_epic=200)
+    tracemalloc.start()
+    path, _, rows = export_result(large, "md", directory=str(tmp_path))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert rows == 4000
+    assert peak < os.path.getsize(path) / 4
+    os.remove(path)
+
+
+def test_export_rejects_unknown_format(tmp_path, make_export_result):
+    with pytest.raises(ExportError):
+        export_result(make_export_result(), "pdf", directory=str(tmp_path))
+    assert os.listdir(tmp_path) == []
+
+
+def test_xlsx_export(tmp_path, make_export_result):
+    openpyxl = pytest.importorskip("openpyxl")
+    path, filename, rows = export_result(make_export_result(), "xlsx", directory=str(tmp_path))
+    assert filename.endswith(".xlsx") and rows == 6
+    sheet = openpyxl.load_workbook(path).active
+    assert sheet.max_row == 7
+
+
+def test_rows_join_points_by_story_id_with_title_fallback():
+    epic = Epic(title="에픽", description="설명", business_value="가치", priority="High", included_tasks=[])
+    first, second, legacy = [Story(epic_id=epic.id, title=title, description="설명")
+                             for title in ("로그인", "로그인", "회원가입")]
+    # 같은 제목의 두 스토리 - 포인트 순서를 스토리와 반대로, 마지막은 story_id 없는 이전 결과
+    points = [
+        StoryPointEstimation(story_title=title, story_id=story_id, estimated_point=point, domain="backend",
+                             estimation_method="same_area", reasoning="근거", confidence_level="high")
+        for title, story_id, point in (("로그인", second.id, 8), ("로그인", first.id, 2), ("회원가입", None, 5))
+    ]
+    result = {"epic_results": [{"epic": epic, "stories": [first, second, legacy], "story_points": points}]}
+    assert [row[6] for row in iter_export_rows(result)] == [2, 8, 5]
@@ -0,0 +1,64 @@
+from slack_bot.progress import SlackProgressReporter, build_progress_blocks
+
+
+class FakeSlackClient:
+    def __init__(self):
+        self.updates = []
+
+    def chat_update(self, **kwargs):
+        self.updates.append(kwargs)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_orchestrator_reports_each_completed_node(orchestrator):
+    events = []
+    result = orchestrator.execute(
+        "쇼핑몰 만들어줘", "웹", options={"coalesce": False},
+        on_progress=lambda node, state: events.append((node, len(state.get("epics") or [])))
+    )
+
+    assert result["status"] == "completed"
+    assert [node for node, _ in events] == ["analyze", "epic", "story", "point"]
+    assert events[1][1] == result["total_epics"]
+
+
+def test_progress_callback_error_does_not_break_workflow(orchestrator):
+    def failing(node, state):
+        raise RuntimeError("slack down")
+
+    result = orchestrator.execute("쇼핑몰 만들어줘", "웹", options={"coalesce": False}, on_progress=failing)
+    assert result["status"] == "completed"
+
+
+def test_reporter_throttles_and_flushes_latest_update():
+    client, clock = FakeSlackClient(), FakeClock()
+    reporter = SlackProgressReporter(client, "D1", "123.456", header="분석", min_interval=1.0, clock=clock)
+
+    reporter("analyze", {})
+    reporter("epic", {})
+    reporter("story", {})
+    assert len(client.updates) == 1
+
+    reporter.flush()
+    assert len(client.updates) == 2
+    assert "스토리 생성" in client.updates[-1]["blocks"][1]["text"]["text"]
+
+    clock.now = 5.0
+    reporter("point", {})
+    assert len(client.updates) == 3
+    assert client.updates[-1]["ts"] == "123.456"
+
+
+def test_progress_blocks_show_counts_and_current_step():
+    blocks = build_progress_blocks("분석", ["analyze"], {})
+    lines = blocks[1]["text"]["text"].splitlines()
+    assert lines[0].startswith("✅")
+    assert lines[1] == "⏳ 에픽 생성 중..."
+    assert lines[2].startswith("▫️")
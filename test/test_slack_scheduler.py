@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from slack_bot.scheduler import FairScheduler, parse_weights
+
+
+def _run_order(scheduler, tickets):
+    """실행 중인 요청을 하나씩 끝내면서 시작 순서 기록"""
+    order = []
+    while True:
+        running = [t for t in tickets if t.started and t not in order]
+        if not running:
+            return order
+        order.append(running[0])
+        scheduler.release(running[0])
+
+
+@pytest.mark.asyncio
+async def test_heavy_user_alternates_with_others():
+    scheduler = FairScheduler(max_concurrent=1, per_user_limit=1)
+    tickets = [scheduler.enqueue("T1", "U1") for _ in range(4)]
+    tickets += [scheduler.enqueue("T1", "U2"), scheduler.enqueue("T1", "U2")]
+
+    order = _run_order(scheduler, tickets)
+    assert [t.user_id for t in order] == ["U1", "U2", "U1", "U2", "U1", "U1"]
+    assert scheduler.queued == 0 and scheduler.running == 0
+
+
+@pytest.mark.asyncio
+async def test_per_user_limit_leaves_slots_for_other_users():
+    scheduler = FairScheduler(max_concurrent=3, per_user_limit=1)
+    first = scheduler.enqueue("T1", "U1")
+    second = scheduler.enqueue("T1", "U1")
+    other = scheduler.enqueue("T1", "U2")
+
+    assert first.started and other.started
+    assert not second.started
+    assert scheduler.running == 2
+
+    scheduler.release(first)
+    assert second.started
+
+
+@pytest.mark.asyncio
+async def test_workspace_and_user_weights():
+    scheduler = FairScheduler(max_concurrent=1, workspace_weights={"T1": 2})
+    tickets = [scheduler.enqueue("T1", f"U{i}") for i in range(4)]
+    tickets += [scheduler.enqueue("T2", f"V{i}") for i in range(2)]
+    order = _run_order(scheduler, tickets)
+    assert [t.workspace_id for t in order] == ["T1", "T2", "T1", "T1", "T2", "T1"]
+
+    scheduler = FairScheduler(max_concurrent=1, per_user_limit=1, user_weights={"U1": 2})
+    tickets = [scheduler.enqueue("T1", "U1") for _ in range(4)]
+    tickets += [scheduler.enqueue("T1", "U2") for _ in range(2)]
+    order = _run_order(scheduler, tickets)
+    assert [t.user_id for t in order] == ["U1", "U2", "U1", "U1", "U2", "U1"]
+
+
+@pytest.mark.asyncio
+async def test_position_and_wait():
+    scheduler = FairScheduler(max_concurrent=1)
+    running = scheduler.enqueue("T1", "U1")
+    queued = [scheduler.enqueue("T1", "U1"), scheduler.enqueue("T1", "U2")]
+
+    assert scheduler.position(running) == 0
+    # U1은 이미 한 건 실행했으므로 U2가 먼저
+    assert [scheduler.position(t) for t in queued] == [2, 1]
+
+    waiter = asyncio.ensure_future(scheduler.wait(queued[1]))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    scheduler.release(running)
+    await asyncio.wait_for(waiter, 1)
+    assert queued[1].started
+
+
+@pytest.mark.asyncio
+async def test_release_of_queued_ticket_cancels_it():
+    scheduler = FairScheduler(max_concurrent=1)
+    running = scheduler.enqueue("T1", "U1")
+    queued = scheduler.enqueue("T1", "U2")
+
+    scheduler.release(queued)
+    assert scheduler.queued == 0
+    with pytest.raises(asyncio.CancelledError):
+        await scheduler.wait(queued)
+    scheduler.release(running)
+    assert scheduler.running == 0
+
+
+def test_parse_weights():
+    assert parse_weights("U1:2, T1:0.5,invalid") == {"U1": 2.0, "T1": 0.5}
+    assert parse_weights(None) == {}
@@ -0,0 +1,48 @@
+import time
+
+from slack_bot.sessions import SlackSessionStore, deserialize_result, serialize_result
+
+
+def _result(orchestrator):
+    return orchestrator.execute("쇼핑몰 만들어줘", "웹", options={"coalesce": False})
+
+
+def test_result_round_trips_with_models(orchestrator):
+    result = _result(orchestrator)
+    restored = deserialize_result(serialize_result(result))
+
+    original_story = result["epic_results"][0]["stories"][0]
+    restored_story = restored["epic_results"][0]["stories"][0]
+    assert restored_story.title == original_story.title
+    assert restored_story.epic_id == original_story.epic_id
+    assert restored["epic_results"][0]["epic"].title == result["epic_results"][0]["epic"].title
+    assert restored["total_stories"] == result["total_stories"]
+
+
+def test_runs_are_kept_per_user_and_shared_through_sqlite(orchestrator, tmp_path):
+    db_path = str(tmp_path / "sessions.sqlite3")
+    store = SlackSessionStore(db_path, max_entries=1)
+    result = _result(orchestrator)
+
+    first = store.put("U1", result)
+    second = store.put("U1", {**result, "total_epics": 99})
+    assert store.get("U1")["total_epics"] == 99
+    assert store.get("U1", first)["total_epics"] == result["total_epics"]
+    assert [run["run_id"] for run in store.list_runs("U1")] == [second, first]
+    assert store.get("U2") is None
+
+    # LRU: 메모리에는 1개만 유지
+    assert store.stats()["cached_entries"] == 1
+    assert store.stats()["cached_bytes"] > 0
+
+    # 다른 워커 / 재시작 후에도 조회 가능
+    assert SlackSessionStore(db_path).get("U1", first)["total_epics"] == result["total_epics"]
+
+
+def test_expired_sessions_are_not_returned(orchestrator, tmp_path):
+    store = SlackSessionStore(str(tmp_path / "sessions.sqlite3"), ttl=0.05)
+    run_id = store.put("U1", _result(orchestrator))
+    time.sleep(0.1)
+    assert store.get("U1", run_id) is None
+    assert store.get("U1") is None
+    assert store.stats()["cached_entries"] == 0
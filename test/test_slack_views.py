@@ -0,0 +1,81 @@
+import pytest
+
+from epic.models import Epic
+from slack_bot.sessions import SlackSessionStore
+from slack_bot.views import MAX_BLOCKS, parse_page_value, render_result_views
+from story.models import Story
+from story_point.models import StoryPointEstimation
+
+
+@pytest.fixture
+def large_result(make_result):
+    return make_result(epics=4, stories_per_epic=20)
+
+
+def test_large_views_are_split_into_pages_within_block_limit(large_result):
+    views = render_result_views(large_result, "run1")
+
+    stories = views["stories"]
+    assert len(stories) > 1
+    for page in stories:
+        assert len(page["blocks"]) <= MAX_BLOCKS
+    rendered = "".join(block["text"]["text"] for page in stories for block in page["blocks"]
+                       if block["type"] == "section")
+    assert all(f"스토리 {e}-{s}" in rendered for e in range(4) for s in range(20))
+
+    first_nav = stories[0]["blocks"][-1]["elements"]
+    assert first_nav[0]["action_id"] == "view_page_next"
+    assert parse_page_value(first_nav[0]["value"]) == ("run1", "stories", 1)
+    last_nav = stories[-1]["blocks"][-1]["elements"]
+    assert last_nav[0]["action_id"] == "view_page_prev"
+    assert views["points"][0]["text"] == "스토리 포인트 추정 완료 - 총 240 포인트"
+
+
+def test_empty_result_has_single_epic_page():
+    views = render_result_views({"epic_results": []}, "run1")
+    assert views["epics"][0]["text"] == "📋 생성된 에픽이 없습니다."
+
+
+def test_view_pages_are_stored_and_looked_up_by_page(tmp_path, large_result):
+    db_path = str(tmp_path / "sessions.sqlite3")
+    store = SlackSessionStore(db_path)
+    result = large_result
+    run_id = store.put("U1", result)
+    views = render_result_views(result, run_id)
+    store.put_views("U1", run_id, views)
+
+    page = SlackSessionStore(db_path).get_view_page("U1", run_id, "stories", 1)
+    assert page == views["stories"][1]
+    assert store.get_view_page("U1", run_id, "stories", 99) is None
+
+
+def test_point_view_joins_by_story_id_and_keeps_same_title_stories():
+    epic = Epic(title="에픽", description="설명", business_value="가치", priority="High", included_tasks=[])
+    first, second, legacy = [Story(epic_id=epic.id, title=title, description="설명")
+                             for title in ("로그인", "로그인", "회원가입")]
+    points = [
+        StoryPointEstimation(story_title=title, story_id=story_id, estimated_point=point, domain="backend",
+                             estimation_method="same_area", reasoning="근거", confidence_level="high")
+        for title, story_id, point in (("로그인", second.id, 8), ("로그인", first.id, 2), ("회원가입", None, 5))
+    ]
+    result = {"epic_results": [{"epic": epic, "stories": [first, second, legacy], "story_points": points}]}
+
+    page = render_result_views(result, "run1")["points"][0]
+    assert page["text"] == "스토리 포인트 추정 완료 - 총 15 포인트"
+    rendered = [block["text"]["text"].split("\n")[0] for block in page["blocks"] if block["type"] == "section"]
+    assert [line for line in rendered if line.startswith("•")] == [
+        "• *로그인*: 2 포인트", "• *로그인*: 8 포인트", "• *회원가입*: 5 포인트"]
+
+
+def test_view_pages_do_not_evict_cached_results(tmp_path, large_result):
+    store = SlackSessionStore(str(tmp_path / "sessions.sqlite3"), max_entries=2, max_view_pages=3)
+    result = large_result
+    run_ids = [store.put("U1", result) for _ in range(2)]
+    for run_id in run_ids:
+        store.put_views("U1", run_id, render_result_views(result, run_id))
+
+    stats = store.stats()
+    assert stats["cached_entries"] == 2
+    assert stats["cached_view_pages"] == 3
+    # 결과는 메모리에서 조회 (SQLite 조회 없이)
+    assert all(store._results.get(("U1", run_id)) is not None for run_id in run_ids)
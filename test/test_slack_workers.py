@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from slack_bot.workers import SlackTaskExecutor, SlackWorkerBusyError
+from utils.tracing import current_trace_id, start_trace
+
+
+@pytest.mark.asyncio
+async def test_submit_returns_immediately_and_runs_in_background():
+    executor = SlackTaskExecutor(max_workers=1, max_queue_size=1)
+    release = asyncio.Event()
+    done = asyncio.Event()
+
+    async def task():
+        await release.wait()
+        done.set()
+
+    start = time.perf_counter()
+    executor.submit("slow", task)
+    assert time.perf_counter() - start < 0.05
+    assert executor.pending == 1
+
+    release.set()
+    await asyncio.wait_for(done.wait(), 5)
+    await executor.join()
+    assert executor.pending == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_and_failed_task_frees_slot():
+    executor = SlackTaskExecutor(max_workers=1, max_queue_size=1)
+    release = asyncio.Event()
+
+    async def failing():
+        raise ZeroDivisionError()
+
+    executor.submit("blocking", release.wait)
+    executor.submit("queued", failing)
+    with pytest.raises(SlackWorkerBusyError):
+        executor.submit("rejected", release.wait)
+
+    release.set()
+    await executor.join()
+    assert executor.pending == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_uses_worker_thread_and_keeps_trace_context():
+    executor = SlackTaskExecutor(max_workers=1)
+    loop_thread = threading.current_thread().name
+
+    def blocking():
+        return threading.current_thread().name, current_trace_id()
+
+    with start_trace("slack.test") as span:
+        thread_name, trace_id = await executor.run_blocking(blocking)
+    assert thread_name != loop_thread and thread_name.startswith("slack-worker")
+    assert trace_id == span.trace_id
+    executor.shutdown()
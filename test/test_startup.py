@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "../src")
+
+
+def test_main_import_defers_heavy_modules(tmp_path):
+    """main import 시 LangGraph/pandas/Slack Bolt는 로드되지 않아야 함 (warm-up 또는 첫 요청 시 로드)"""
+    script = (
+        "import sys, main\n"
+        "print(','.join(m for m in ('langgraph', 'pandas', 'slack_bolt') if m in sys.modules))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=tmp_path, capture_output=True, text=True,
+        env={**os.environ, "PYTHONPATH": os.path.abspath(SRC_DIR), "LLM_BACKEND": "fake", "TRACE_FILE": ""},
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == ""
+
+
+def test_reference_data_loaded_on_first_access(tmp_path):
+    from story_point.services import StoryPointEstimationAgent
+
+    csv_path = tmp_path / "reference.csv"
+    agent = StoryPointEstimationAgent(openai_api_key="fake", csv_file_path=str(csv_path))
+    assert not csv_path.exists()
+    assert agent.reference_data is not None
+    assert csv_path.exists()
+
+
+def test_reference_data_waits_for_concurrent_warm_up(tmp_path, monkeypatch):
+    import threading
+    import time
+
+    import pandas as pd
+
+    from story_point import services
+    from story_point.services import StoryPointEstimationAgent
+
+    csv_path = tmp_path / "reference.csv"
+    pd.DataFrame([{"story_title": "로그인", "domain": "backend", "estimated_point": 3}]).to_csv(csv_path, index=False)
+    agent = StoryPointEstimationAgent(openai_api_key="fake", csv_file_path=str(csv_path))
+
+    read_csv = pd.read_csv
+    loading = threading.Event()
+
+    def slow_read_csv(*args, **kwargs):
+        loading.set()
+        time.sleep(0.2)
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(services.pd, "read_csv", slow_read_csv)
+    warm_up = threading.Thread(target=lambda: agent.reference_data)
+    warm_up.start()
+    assert loading.wait(5)
+
+    # warm-up 스레드가 로드 중이어도 요청 스레드는 로드 완료된 데이터를 받음
+    assert agent.reference_data is not None and len(agent.reference_data) == 1
+    warm_up.join()
@@ -0,0 +1,58 @@
+import pytest
+
+from utils.tracing import (
+    configure_tracing, current_trace_id, load_spans, parse_traceparent, start_span, start_trace, to_chrome_trace
+)
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    configure_tracing(str(path))
+    yield str(path)
+    configure_tracing(None)
+
+
+def test_nested_spans_share_trace_and_link_parent(trace_file):
+    with start_trace("request") as root:
+        with start_span("child", step=1) as child:
+            assert current_trace_id() == root.trace_id
+    assert current_trace_id() is None
+
+    spans = {span["name"]: span for span in load_spans(trace_file)}
+    assert spans["child"]["trace_id"] == spans["request"]["trace_id"]
+    assert spans["child"]["parent_id"] == root.span_id
+    assert spans["child"]["attributes"] == {"step": 1}
+    assert child.end_ns >= child.start_ns
+
+
+def test_error_is_recorded_on_span(trace_file):
+    with pytest.raises(ValueError):
+        with start_span("failing"):
+            raise ValueError("boom")
+    span = load_spans(trace_file)[0]
+    assert span["status"] == "error"
+    assert span["error"] == "boom"
+
+
+def test_traceparent_is_continued():
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert parse_traceparent(f"00-{trace_id}-00f067aa0ba902b7-01") == trace_id
+    assert parse_traceparent("invalid") is None
+    with start_trace("request", trace_id=trace_id) as span:
+        assert span.trace_id == trace_id
+
+
+def test_workflow_spans_exported_and_convertible(orchestrator, trace_file):
+    result = orchestrator.execute("쇼핑몰 만들어줘", "웹")
+
+    spans = load_spans(trace_file, trace_id=result["trace_id"])
+    names = [span["name"] for span in spans]
+    for name in ["workflow.execute", "node.analyze", "node.epic", "node.story", "node.point", "node.finalize"]:
+        assert name in names
+    assert names.count("llm.call") == 8
+    assert "reference.lookup" in names
+
+    chrome = to_chrome_trace(spans)
+    assert sum(1 for event in chrome["traceEvents"] if event["ph"] == "X") == len(spans)
+